@@ -4,14 +4,132 @@ Deploy: Render.com
 Autor: Diogo Dias
 """
 
+import asyncio
+import hashlib
+import hmac
+import math
 import os
+import sys
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-import pandas as pd
-from fastapi import FastAPI, HTTPException, Query
+import orjson
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Tuple, Union
 import json
+import logging
+
+# Leve: pandas/numpy só são importados quando o catálogo é carregado
+import motor
+
+# config.py está na raiz do repositório
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from config import Config
+
+# ==================== CARREGAR DADOS ====================
+print("=" * 50)
+print("🚀 Iniciando Carros Portugal API v2.0")
+print("=" * 50)
+
+current_dir = Path(__file__).parent
+DATA_DIR = Path(os.getenv("DATA_DIR", current_dir))
+SNAPSHOT_DIR = Path(os.getenv("SNAPSHOT_DIR", current_dir / "snapshot"))
+
+# Tempo máximo que um pedido espera pelo catálogo antes de responder 503
+TEMPO_ESPERA_CATALOGO = float(os.getenv("TEMPO_ESPERA_CATALOGO", "60"))
+
+# O catálogo é carregado numa thread: /health responde logo, os restantes
+# endpoints esperam por ele em catalogo_atual(). Com gunicorn (ver
+# gunicorn.conf.py) é carregado no processo pai e herdado pelos workers.
+# Uma versão nova (POST /admin/reload ou vigia de ficheiros) substitui a
+# atual sem interromper pedidos e esvazia a cache de respostas.
+estado = motor.EstadoCatalogo(
+    lambda: motor.carregar_catalogo(DATA_DIR, SNAPSHOT_DIR),
+    ao_publicar=lambda catalogo: limpar_caches()
+)
+
+# Recarga: POST /admin/reload exige o cabeçalho X-Admin-Token = ADMIN_TOKEN
+# (sem ADMIN_TOKEN fica desligada); RECARREGAR_INTERVALO > 0 vigia os
+# ficheiros de dados a cada N segundos. Com vários workers, cada um
+# recarrega o seu catálogo: o POST não recarrega só o worker que o recebe,
+# escreve a marca RECARGA_MARCA, que o vigia de cada worker verifica a
+# cada RECARGA_MARCA_INTERVALO segundos.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+RECARREGAR_INTERVALO = float(os.getenv("RECARREGAR_INTERVALO", "0"))
+RECARGA_MARCA = Path(os.getenv("RECARGA_MARCA", DATA_DIR / ".recarregar"))
+RECARGA_MARCA_INTERVALO = float(os.getenv("RECARGA_MARCA_INTERVALO", "1"))
+
+def assinatura_dados():
+    """Nome, tamanho e data de modificação dos ficheiros de dados e do snapshot"""
+    ficheiros = motor.procurar_ficheiros_dados(DATA_DIR) + [SNAPSHOT_DIR / motor.MANIFEST]
+    return tuple(
+        (str(f), f.stat().st_size, f.stat().st_mtime_ns) for f in ficheiros if f.exists()
+    )
+
+vigia = None
+if RECARREGAR_INTERVALO > 0:
+    vigia = motor.VigiaFicheiros(assinatura_dados, estado.recarregar, RECARREGAR_INTERVALO)
+
+def assinatura_marca():
+    """Conteúdo da marca de recarga ("" sem marca)"""
+    try:
+        return RECARGA_MARCA.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return ""
+
+vigia_marca = None
+if ADMIN_TOKEN:
+    vigia_marca = motor.VigiaFicheiros(
+        assinatura_marca, estado.recarregar, RECARGA_MARCA_INTERVALO,
+        mensagem="👀 Recarga pedida (POST /admin/reload), a recarregar o catálogo"
+    )
+
+# Amostrador de perfil opcional: com PERFIL_LENTOS_MS=200, cada pedido mais
+# lento do que 200 ms grava em PERFIL_DIR as pilhas amostradas (formato
+# collapsed, para flamegraph.pl ou speedscope), mantendo os PERFIL_MAXIMO mais recentes
+PERFIL_LENTOS_MS = float(os.getenv("PERFIL_LENTOS_MS", "0"))
+PERFIL_DIR = Path(os.getenv("PERFIL_DIR", current_dir / "perfis"))
+PERFIL_MAXIMO = int(os.getenv("PERFIL_MAXIMO", "100"))
+# Avisos dos pedidos pelo log do uvicorn (formato e --log-level do servidor)
+registo = logging.getLogger("uvicorn.error")
+amostrador = None
+if PERFIL_LENTOS_MS > 0:
+    amostrador = motor.AmostradorPerfil(intervalo=float(os.getenv("PERFIL_INTERVALO_MS", "2")) / 1000)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    estado.iniciar()
+    # As threads de amostragem e de vigia arrancam em cada worker (não sobrevivem ao fork)
+    if amostrador is not None:
+        amostrador.iniciar()
+    if vigia is not None:
+        vigia.iniciar()
+    if vigia_marca is not None:
+        vigia_marca.iniciar()
+    yield
+
+def catalogo_atual():
+    """Catálogo carregado (ou 503 se ainda não estiver disponível)."""
+    try:
+        catalogo = estado.obter(timeout=TEMPO_ESPERA_CATALOGO)
+    except motor.CatalogoIndisponivel as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    
+    # O pedido acaba com esta versão, mesmo que entretanto seja publicada outra
+    cronometro = motor.cronometro_atual()
+    if cronometro is not None:
+        cronometro.versao_dados = catalogo.versao
+    return catalogo
+
+async def catalogo_pronto():
+    """catalogo_atual() sem bloquear o event loop enquanto o catálogo carrega"""
+    if estado.pronto:
+        return catalogo_atual()
+    return await run_in_threadpool(catalogo_atual)
 
 # ==================== CONFIGURAÇÃO ====================
 app = FastAPI(
@@ -19,7 +137,10 @@ app = FastAPI(
     description="API para comparação e recomendação de carros em Portugal",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    # Dicts devolvidos pelos endpoints saem por orjson (mais rápido do que o json da biblioteca padrão)
+    default_response_class=ORJSONResponse
 )
 
 # Configurar CORS para GitHub Pages e localhost
@@ -39,106 +160,185 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ==================== CARREGAR DADOS ====================
-print("=" * 50)
-print("🚀 Iniciando Carros Portugal API v2.0")
-print("=" * 50)
+# ==================== MÉTRICAS ====================
+# Histogramas por endpoint/etapa e contagens por filtro, expostos em /metrics
+metricas = motor.RegistoMetricas()
 
-# Listar diretório atual
-current_dir = Path(__file__).parent
-print(f"📂 Diretório atual: {current_dir}")
-print(f"📁 Conteúdo do diretório: {os.listdir(current_dir)}")
-
-# Procurar por arquivos de dados
-data_files = []
-possible_names = [
-    "carros_pt_50.csv", "carros_pt_50.xlsx", "Carros pt 50.xlsx",
-    "carros.csv", "dados.csv", "data.csv", "carros.xlsx"
-]
-
-for name in possible_names:
-    # Verificar no diretório atual
-    file_path = current_dir / name
-    if file_path.exists():
-        data_files.append(file_path)
-    
-    # Verificar no diretório pai
-    parent_file = current_dir.parent / name
-    if parent_file.exists():
-        data_files.append(parent_file)
-
-# Também procurar por extensão
-for ext in ['.csv', '.xlsx', '.xls']:
-    for file in current_dir.glob(f'*{ext}'):
-        if file not in data_files:
-            data_files.append(file)
-
-print(f"🔍 {len(data_files)} arquivo(s) de dados encontrado(s):")
-for f in data_files:
-    print(f"   - {f}")
-
-# Tentar carregar os dados
-df = None
-loaded_from = None
-
-for data_file in data_files:
+@app.middleware("http")
+async def medir_pedido(pedido: Request, call_next):
+    """Cronometra o pedido: cabeçalho Server-Timing, /metrics e perfil de pedidos lentos"""
+    cronometro = motor.Cronometro()
+    token = motor.ativar_cronometro(cronometro)
     try:
-        print(f"\n📖 Tentando carregar: {data_file}")
-        
-        if str(data_file).endswith('.csv'):
-            df = pd.read_csv(data_file, encoding='utf-8', delimiter=',')
-        elif str(data_file).endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(data_file)
-        else:
-            continue
-        
-        # Verificar se tem dados
-        if len(df) > 0:
-            loaded_from = data_file
-            print(f"✅ SUCESSO! Carregados {len(df)} registros")
-            print(f"📊 Colunas disponíveis: {df.columns.tolist()}")
-            break
-        else:
-            print(f"⚠️ Arquivo vazio: {data_file}")
-            
+        resposta = await call_next(pedido)
+    finally:
+        motor.desativar_cronometro(token)
+    total = cronometro.terminar()
+    
+    # Rota (ex. /carro/{carro_id}) em vez do caminho, para limitar as séries
+    endpoint = getattr(pedido.scope.get("route"), "path", "desconhecido")
+    resposta.headers["Server-Timing"] = cronometro.server_timing()
+    versao = cronometro.versao_dados or (estado.catalogo.versao if estado.pronto else None)
+    if versao:
+        resposta.headers["X-Dataset-Version"] = versao
+    metricas.observar(pedido.method, endpoint, resposta.status_code, cronometro)
+    
+    if amostrador is not None and total * 1000 >= PERFIL_LENTOS_MS:
+        # Fora do event loop e sem atrasar a resposta
+        tarefa = asyncio.create_task(asyncio.to_thread(
+            gravar_perfil, endpoint, set(cronometro.threads), cronometro.inicio, total, time.time()
+        ))
+        perfis_pendentes.add(tarefa)
+        tarefa.add_done_callback(perfis_pendentes.discard)
+    
+    return resposta
+
+# Tarefas de gravação de perfis em curso (referências até terminarem)
+perfis_pendentes = set()
+
+def gravar_perfil(endpoint: str, threads, inicio: float, total: float, instante: float):
+    """Grava o perfil de um pedido lento em PERFIL_DIR (numa thread)"""
+    try:
+        pilhas = amostrador.pilhas(threads, inicio, inicio + total)
+        if not pilhas:
+            return
+        nome = endpoint.strip("/").replace("/", "_").replace("{", "").replace("}", "") or "raiz"
+        caminho = amostrador.gravar(
+            pilhas, PERFIL_DIR / f"{int(instante * 1000)}-{nome}-{total * 1000:.0f}ms.folded", PERFIL_MAXIMO
+        )
+        registo.warning("🐢 Pedido lento (%.0f ms) em %s: perfil em %s", total * 1000, endpoint, caminho)
     except Exception as e:
-        print(f"❌ Erro ao carregar {data_file}: {str(e)[:100]}...")
-        continue
-
-# Se não carregou, criar dados de exemplo
-if df is None or len(df) == 0:
-    print("⚠️ Nenhum arquivo de dados válido encontrado. Criando dados de exemplo...")
-    
-    # Criar DataFrame de exemplo
-    data = {
-        'Marca': ['Volkswagen', 'Renault', 'Peugeot', 'BMW', 'Mercedes'],
-        'Modelo': ['Golf', 'Clio', '208', 'Serie 3', 'Classe A'],
-        'Ano': [2023, 2023, 2023, 2023, 2023],
-        'Tipo': ['Hatchback', 'Hatchback', 'Hatchback', 'Sedan', 'Hatchback'],
-        'Motor': ['1.0 TSI', '1.0 TCe', '1.2 PureTech', '2.0 Diesel', '1.3'],
-        'Potencia': [110, 100, 100, 190, 136],
-        'Consumo': [5.2, 5.0, 4.8, 4.5, 5.5],
-        '0-100': [9.9, 11.0, 10.5, 7.5, 9.0],
-        'Velocidade': [210, 195, 190, 240, 220],
-        'Bagageira': [380, 300, 311, 480, 370],
-        'Combustivel': ['Gasolina', 'Gasolina', 'Gasolina', 'Diesel', 'Gasolina'],
-        'Preco': [28500, 19500, 21200, 45000, 35500],
-        'Airbag': [True, True, True, True, True],
-        'AC': [True, True, True, True, True],
-        'Camera': [True, False, False, True, True],
-        'GPS': [True, False, True, True, True],
-        'ABS': [True, True, True, True, True],
-        'ESP': [True, True, True, True, True],
-        'Sensor': [True, False, False, True, True]
-    }
+        registo.error("❌ Erro ao gravar perfil de %s: %s", endpoint, str(e)[:200])
+
+# ==================== EXECUTOR ====================
+# Trabalho de CPU dos endpoints async: threads limitadas, fila limitada
+# (429 quando cheia) e pedidos iguais em simultâneo calculados uma vez
+executor = motor.ExecutorLimitado(
+    trabalhadores=int(os.getenv("EXECUTOR_TRABALHADORES", str(min(os.cpu_count() or 1, 4)))),
+    fila_maxima=int(os.getenv("EXECUTOR_FILA", "32"))
+)
+
+@app.exception_handler(motor.Sobrecarregado)
+async def servidor_ocupado(pedido: Request, erro: motor.Sobrecarregado):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(erro)},
+        headers={"Retry-After": str(erro.retry_after)}
+    )
+
+async def transmitir_no_executor(linhas) -> StreamingResponse:
+    """
+    NDJSON de um gerador síncrono com cada bloco calculado no executor.
     
-    df = pd.DataFrame(data)
-    loaded_from = "DADOS DE EXEMPLO"
-    print("✅ Dados de exemplo criados com sucesso!")
+    O primeiro bloco é calculado antes da resposta começar (429 ou erro
+    do pedido com o código certo); os seguintes já não são recusados.
+    """
+    fim = object()
+    primeiro = await executor.executar(lambda: next(linhas, fim))
+    
+    async def blocos():
+        bloco = primeiro
+        while bloco is not fim:
+            yield bloco
+            bloco = await executor.executar(lambda: next(linhas, fim), admitida=True)
+    
+    return StreamingResponse(blocos(), media_type="application/x-ndjson")
 
-print(f"\n🎉 API pronta! Dados carregados de: {loaded_from}")
-print(f"📊 Total de carros: {len(df)}")
-print("=" * 50)
+# ==================== CACHE HTTP ====================
+# Respostas memorizadas por (versão do catálogo, endpoint, parâmetros canónicos)
+cache_respostas = motor.CacheRespostas(
+    maximo=int(os.getenv("CACHE_MAXIMO", "1024")),
+    ttl=Config.CACHE_TIMEOUT
+)
+
+# Ordem completa (posições e scores) de cada consulta paginada de /recomendar
+cache_ordens = motor.CacheRespostas(
+    maximo=int(os.getenv("CACHE_ORDENS_MAXIMO", "32")),
+    ttl=Config.CACHE_TIMEOUT
+)
+
+def limpar_caches():
+    """Descarta as respostas e ordens memorizadas (novo catálogo publicado)"""
+    cache_respostas.limpar()
+    cache_ordens.limpar()
+
+def _etag_corresponde(pedido: Request, etag: str) -> bool:
+    """If-None-Match do pedido inclui a ETag (ou *)?"""
+    valores = pedido.headers.get("if-none-match", "")
+    return any(v.strip() in (etag, "*") for v in valores.split(",") if v.strip())
+
+def corpo_codificado(pedido: Request, corpo: bytes, chave_cache=None) -> Tuple[bytes, Optional[str]]:
+    """
+    `corpo` comprimido (br/gzip) se o cliente aceitar e tiver pelo menos
+    COMPRESSAO_MINIMO bytes, e a codificação usada (None = sem compressão).
+    Com `chave_cache` a versão comprimida fica memorizada ao lado da original.
+    """
+    codificacao = motor.escolher_codificacao(pedido.headers.get("accept-encoding", ""), len(corpo))
+    if codificacao is None:
+        return corpo, None
+    comprimido = cache_respostas.obter(chave_cache + (codificacao,)) if chave_cache else None
+    if comprimido is None:
+        with motor.etapa("compressao"):
+            comprimido = motor.comprimir(corpo, codificacao)
+        if chave_cache:
+            cache_respostas.guardar(chave_cache + (codificacao,), comprimido)
+    motor.descrever_etapa("compressao", f"{codificacao} {len(corpo)}->{len(comprimido)}")
+    return comprimido, codificacao
+
+def resposta_json(pedido: Request, corpo: bytes, cabecalhos: Optional[Dict[str, str]] = None, chave_cache=None) -> Response:
+    """Resposta JSON já serializada, comprimida conforme o Accept-Encoding"""
+    corpo, codificacao = corpo_codificado(pedido, corpo, chave_cache)
+    cabecalhos = {**(cabecalhos or {}), "Vary": "Accept-Encoding"}
+    if codificacao:
+        cabecalhos["Content-Encoding"] = codificacao
+    return Response(content=corpo, media_type="application/json", headers=cabecalhos)
+
+def _serializar(catalogo, corpo) -> bytes:
+    if not isinstance(corpo, bytes):
+        corpo["dataset_version"] = catalogo.versao
+        with motor.etapa("json"):
+            corpo = orjson.dumps(corpo)
+    return corpo
+
+async def responder_em_cache(
+    pedido: Request, endpoint: str, parametros: Dict[str, Any], calcular, no_executor: bool = True
+) -> Response:
+    """
+    Resposta JSON memorizada, com ETag e Cache-Control.
+
+    A ETag deriva do hash do catálogo e dos parâmetros canónicos, por isso
+    um If-None-Match válido recebe 304 sem calcular nada. O corpo é
+    comprimido uma vez por codificação aceite. `calcular(catalogo)`
+    devolve um dict (ou bytes já serializados) e só corre em cache miss,
+    no executor (pedidos iguais em simultâneo partilham o cálculo) ou,
+    com `no_executor=False`, diretamente no event loop (cálculos triviais).
+    """
+    catalogo = await catalogo_pronto()
+    chave = motor.canonicalizar(parametros)
+    assinatura = hashlib.sha1(f"{endpoint}?{chave}".encode()).hexdigest()[:12]
+    etag = f'W/"{catalogo.versao}-{assinatura}"'
+    cabecalhos = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={Config.CACHE_TIMEOUT}"
+    }
+    
+    if _etag_corresponde(pedido, etag):
+        motor.descrever_etapa("cache", "304")
+        return Response(status_code=304, headers=cabecalhos)
+    
+    chave_cache = (catalogo.versao, endpoint, chave)
+    corpo = cache_respostas.obter(chave_cache)
+    if corpo is None:
+        motor.descrever_etapa("cache", "miss")
+        if no_executor:
+            corpo = await executor.executar(lambda: _serializar(catalogo, calcular(catalogo)), chave=chave_cache)
+        else:
+            corpo = _serializar(catalogo, calcular(catalogo))
+        cache_respostas.guardar(chave_cache, corpo)
+    else:
+        motor.descrever_etapa("cache", "hit")
+    
+    return resposta_json(pedido, corpo, cabecalhos, chave_cache)
 
 # ==================== MODELOS PYDANTIC ====================
 class CompararRequest(BaseModel):
@@ -153,191 +353,320 @@ class RecomendarRequest(BaseModel):
     extras: Optional[List[str]] = None
     perfil: Optional[str] = None
 
+class FacetasRequest(BaseModel):
+    preco_max: Optional[float] = None
+    tipo: Optional[str] = None
+    combustivel: Optional[str] = None
+    bagageira_min: Optional[int] = None
+    consumo_max: Optional[float] = None
+    extras: Optional[List[str]] = None
+
+class ParetoRequest(FacetasRequest):
+    # Filtros de /facetas; objetivos de motor.OBJETIVOS (por omissão consumo, potência e bagageira)
+    objetivos: Optional[List[str]] = None
+    frentes: int = Field(1, ge=1, le=10)
+    limite: int = Field(100, ge=1, le=1000)
+
+class CustoRequest(FacetasRequest):
+    # Filtros de /facetas; preços em € por unidade de Consumo (omissos: motor.PRECOS_COMBUSTIVEL)
+    km_ano: float = Field(15000, gt=0, le=500000)
+    anos: int = Field(5, ge=1, le=30)
+    precos_combustivel: Optional[Dict[str, float]] = None
+    # Monte Carlo: [mínimo, máximo] por combustível e dos km/ano
+    intervalos_combustivel: Optional[Dict[str, List[float]]] = None
+    intervalo_km_ano: Optional[List[float]] = None
+    cenarios: int = Field(1000, ge=1, le=10000)
+    semente: int = Field(0, ge=0)
+    k: int = Field(10, ge=1, le=100)
+
+class PedidoLoteRequest(RecomendarRequest):
+    # Pedido de POST /recomendar/batch: filtros e perfil de /recomendar...
+    id: Optional[str] = None
+    # ...ou pesos min-max ao estilo de car_filter (FiltrosRequest)
+    ponderado: bool = False
+    prioridade_consumo: float = 1.0
+    prioridade_desempenho: float = 1.0
+    prioridade_espaco: float = 1.0
+
+class RecomendarLoteRequest(BaseModel):
+    pedidos: List[PedidoLoteRequest]
+    k: int = Field(10, ge=1, le=100)
+
+# ==================== PROJEÇÃO (fields=) ====================
+# Campos por omissão de /recomendar e /modelos: os que o frontend mostra
+# (fields=* devolve todos). Os outros endpoints de listas devolvem todos
+# os campos, salvo fields= explícito. Colunas que o catálogo não tem
+# (p.ex. um extra) ficam simplesmente de fora.
+CAMPOS_RECOMENDAR = (
+    "id", "score", "Marca", "Modelo", "Ano", "Tipo", "Combustivel",
+    "Preco", "Potencia", "Consumo", "0-100", "Bagageira",
+    # Extras dos cartões do frontend (app.js)
+    "Airbag", "AC", "CC", "Sensor", "Teto Solar", "GPS"
+)
+CAMPOS_MODELOS = ("id", "nome", "marca", "modelo", "ano")
+CAMPOS_RESUMO_MODELO = ("id", "nome", "marca", "modelo", "ano", "preco", "tipo", "combustivel")
+CAMPOS_CUSTO = (
+    "id", "Marca", "Modelo", "Ano", "Tipo", "Combustivel", "Preco", "Consumo",
+    "custo_medio", "custo_combustivel", "custo_percentis", "prob_mais_barato"
+)
+
+def campos_do_pedido(
+    fields: Optional[str], disponiveis, padrao: Optional[Tuple[str, ...]] = None
+) -> Optional[Tuple[str, ...]]:
+    """
+    Campos pedidos em `fields` ("Marca,Modelo,Preco"), ou `padrao` sem
+    fields=; None = todos. Nomes por extenso ("Preço") passam a canónicos
+    e campos que o endpoint não devolve dão 400.
+    """
+    if fields is None or not fields.strip():
+        return padrao
+    if fields.strip() == "*":
+        return None
+    campos = tuple(dict.fromkeys(
+        motor.nome_canonico(campo.strip()) for campo in fields.split(",") if campo.strip()
+    ))
+    desconhecidos = [campo for campo in campos if campo not in disponiveis]
+    if desconhecidos:
+        raise HTTPException(status_code=400, detail=f"Campos desconhecidos em fields: {desconhecidos}")
+    return campos
+
+def _parametro_campos(campos: Optional[Tuple[str, ...]]):
+    # Para as chaves de cache: None (todos) é descartado por canonicalizar()
+    return list(campos) if campos is not None else None
+
 # ==================== ENDPOINTS ====================
 @app.get("/")
-def read_root():
+async def read_root():
     """Endpoint raiz - Status da API"""
+    catalogo = await catalogo_pronto()
     return {
         "api": "Carros Portugal API",
         "versao": "2.0.0",
         "status": "online",
-        "carregado_de": str(loaded_from),
-        "total_carros": len(df),
+        "carregado_de": catalogo.origem,
+        "total_carros": len(catalogo),
+        "dataset_version": catalogo.versao,
         "endpoints": {
             "raiz": "GET /",
             "tipos": "GET /tipos",
             "combustiveis": "GET /combustiveis",
             "modelos": "GET /modelos?q=termo",
+            "similares": "GET /carro/{id}/similares?k=10",
             "comparar": "POST /comparar",
+            "facetas": "POST /facetas",
             "recomendar": "POST /recomendar",
+            "recomendar_lote": "POST /recomendar/batch",
+            "recomendar_pareto": "POST /recomendar/pareto",
+            "custo": "POST /custo",
             "docs": "GET /docs"
         },
         "mensagem": "API funcionando! Acesse /docs para documentação completa."
     }
 
 @app.get("/health")
-def health_check():
-    """Health check para monitoramento"""
-    return {"status": "healthy", "carros": len(df)}
+async def health_check():
+    """Health check para monitoramento (responde durante o carregamento)"""
+    estado.iniciar()
+    if estado.pronto:
+        catalogo = estado.catalogo
+        return {
+            "status": "healthy",
+            "carros": len(catalogo),
+            "dataset_version": catalogo.versao,
+            "recarga_em_curso": estado.recarga_em_curso
+        }
+    return {"status": "erro" if estado.erro else "a carregar", "carros": 0}
+
+def calcular_tipos(catalogo) -> Dict[str, Any]:
+    # Valores (sem NaN) já agrupados nos bitsets do índice de filtros
+    tipos = sorted(catalogo.indice_filtros.categorias.get('Tipo', {}))
+    return {"tipos": tipos}
 
 @app.get("/tipos")
-def get_tipos():
+async def get_tipos(pedido: Request):
     """Lista todos os tipos de carro disponíveis"""
-    if 'Tipo' not in df.columns:
-        return {"tipos": []}
-    tipos = sorted(df['Tipo'].dropna().unique().tolist())
-    return {"tipos": tipos}
+    return await responder_em_cache(pedido, "tipos", {}, calcular_tipos)
+
+def calcular_combustiveis(catalogo) -> Dict[str, Any]:
+    combustiveis = sorted(catalogo.indice_filtros.categorias.get('Combustivel', {}))
+    return {"combustiveis": combustiveis}
 
 @app.get("/combustiveis")
-def get_combustiveis():
+async def get_combustiveis(pedido: Request):
     """Lista todos os tipos de combustível disponíveis"""
-    if 'Combustivel' not in df.columns:
-        return {"combustiveis": []}
-    combustiveis = sorted(df['Combustivel'].dropna().unique().tolist())
-    return {"combustiveis": combustiveis}
+    return await responder_em_cache(pedido, "combustiveis", {}, calcular_combustiveis)
 
-@app.get("/modelos")
-def get_modelos(q: str = Query("", description="Termo para busca (marca ou modelo)")):
-    """Busca modelos por termo (autocomplete)"""
-    if df.empty:
+def calcular_modelos(catalogo, q: str, campos: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+    if len(catalogo) == 0:
         return {"modelos": []}
     
-    resultados = df.copy()
-    
-    if q and q.strip():
-        search_term = q.strip().lower()
-        mask = (
-            df['Marca'].astype(str).str.lower().str.contains(search_term) |
-            df['Modelo'].astype(str).str.lower().str.contains(search_term) |
-            (df['Marca'] + ' ' + df['Modelo']).str.lower().str.contains(search_term)
-        )
-        resultados = df[mask]
-    
-    # Limitar a 15 resultados
-    resultados = resultados.head(15)
-    
-    modelos = []
-    for idx, row in resultados.iterrows():
-        # Garantir que todos os campos existem
-        marca = row.get('Marca', '')
-        modelo = row.get('Modelo', '')
-        ano = row.get('Ano', '')
-        preco = row.get('Preco', 0)
-        
-        modelos.append({
-            "id": str(idx),
-            "nome": f"{marca} {modelo} {ano}",
-            "marca": marca,
-            "modelo": modelo,
-            "ano": int(ano) if pd.notna(ano) else 0,
-            "preco": float(preco) if pd.notna(preco) else 0,
-            "tipo": row.get('Tipo', ''),
-            "combustivel": row.get('Combustivel', '')
-        })
+    # Pesquisa no índice de n-gramas (sem acentos), limitada a 15 resultados
+    with motor.etapa("pesquisa"):
+        posicoes = catalogo.indice_pesquisa.pesquisar(q.strip(), limite=15)
+    with motor.etapa("serializacao"):
+        modelos = [catalogo.resumo_modelo(pos) for pos in posicoes]
+        if campos is not None:
+            modelos = [motor.projetar(modelo, campos) for modelo in modelos]
     
     return {"modelos": modelos, "total": len(modelos)}
 
+@app.get("/modelos")
+async def get_modelos(
+    pedido: Request,
+    q: str = Query("", description="Termo para busca (marca, modelo ou ano)"),
+    fields: Optional[str] = Query(None, description="Campos de cada modelo, separados por vírgulas (* = todos)")
+):
+    """Busca modelos por termo (autocomplete)"""
+    campos = campos_do_pedido(fields, CAMPOS_RESUMO_MODELO, CAMPOS_MODELOS)
+    return await responder_em_cache(
+        pedido, "modelos", {"q": q.strip(), "fields": _parametro_campos(campos)},
+        lambda catalogo: calcular_modelos(catalogo, q, campos)
+    )
+
+def calcular_carro(catalogo, carro_id: str) -> bytes:
+    try:
+        idx = int(carro_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ID inválido")
+    if not 0 <= idx < len(catalogo):
+        raise HTTPException(status_code=404, detail="Carro não encontrado")
+    return catalogo.json.carro(idx)
+
 @app.get("/carro/{carro_id}")
-def get_carro(carro_id: str):
-    """Obtém detalhes de um carro específico"""
+async def get_carro(carro_id: str, pedido: Request):
+    """Obtém detalhes de um carro específico (JSON pré-serializado)"""
+    return await responder_em_cache(
+        pedido, "carro", {"id": carro_id}, lambda catalogo: calcular_carro(catalogo, carro_id),
+        no_executor=False
+    )
+
+def calcular_similares(catalogo, carro_id: str, k: int, campos: Optional[Tuple[str, ...]] = None) -> bytes:
     try:
         idx = int(carro_id)
-        if 0 <= idx < len(df):
-            carro = df.iloc[idx].to_dict()
-            
-            # Converter valores numpy/pandas para Python nativo
-            for key, value in carro.items():
-                if pd.isna(value):
-                    carro[key] = None
-                elif isinstance(value, (np.integer, np.floating)):
-                    carro[key] = value.item()
-            
-            return carro
-        else:
-            raise HTTPException(status_code=404, detail="Carro não encontrado")
-    except:
+    except ValueError:
         raise HTTPException(status_code=400, detail="ID inválido")
+    if not 0 <= idx < len(catalogo):
+        raise HTTPException(status_code=404, detail="Carro não encontrado")
+    
+    # Distâncias a todos os carros num produto matriz-vetor + argpartition
+    with motor.etapa("similares"):
+        vizinhos, distancias = catalogo.indice_similares.vizinhos(idx, k)
+    with motor.etapa("serializacao"):
+        extras = [
+            {"id": str(catalogo.df.index[pos]), "distancia": round(float(d), 4)}
+            for pos, d in zip(vizinhos, distancias)
+        ]
+        if campos is not None:
+            carros = catalogo.json.projetados(vizinhos, campos, extras)
+        else:
+            carros = [catalogo.json.carro_com_extras(pos, extra) for pos, extra in zip(vizinhos, extras)]
+        return b"".join((
+            b'{"carro_id":', orjson.dumps(carro_id),
+            b',"similares":[', b",".join(carros),
+            b'],"total":', str(len(carros)).encode(), b"}",
+        ))
 
-@app.post("/comparar")
-def comparar_carros(request: CompararRequest):
-    """Compara 2-3 carros lado a lado"""
-    if df.empty:
+@app.get("/carro/{carro_id}/similares")
+async def get_similares(
+    carro_id: str,
+    pedido: Request,
+    k: int = Query(10, ge=1, le=50, description="Número de carros semelhantes"),
+    fields: Optional[str] = Query(None, description="Campos de cada carro, separados por vírgulas (por omissão todos)")
+):
+    """Carros mais parecidos (características e extras normalizados), do mais próximo ao menos"""
+    catalogo = await catalogo_pronto()
+    campos = campos_do_pedido(fields, {*map(str, catalogo.df.columns), "id", "distancia"})
+    return await responder_em_cache(
+        pedido, "similares", {"id": carro_id, "k": k, "fields": _parametro_campos(campos)},
+        lambda catalogo: calcular_similares(catalogo, carro_id, k, campos)
+    )
+
+def calcular_comparacao(catalogo, request: CompararRequest, campos: Optional[Tuple[str, ...]] = None) -> bytes:
+    if len(catalogo) == 0:
         raise HTTPException(status_code=500, detail="Base de dados não carregada")
     
-    resultados = []
+    # Pares (posição, id pedido) dos carros válidos
+    itens = []
     
     for carro_id in request.modelos_ids[:3]:  # Máximo 3 carros
         try:
             idx = int(carro_id)
-            if 0 <= idx < len(df):
-                carro = df.iloc[idx].to_dict()
-                
-                # Converter para tipos nativos do Python
-                carro_convertido = {}
-                for key, value in carro.items():
-                    if pd.isna(value):
-                        carro_convertido[key] = None
-                    elif hasattr(value, 'item'):  # numpy types
-                        carro_convertido[key] = value.item()
-                    else:
-                        carro_convertido[key] = value
-                
-                # Adicionar ID
-                carro_convertido['id'] = carro_id
-                resultados.append(carro_convertido)
-        except:
+        except ValueError:
             continue
+        if 0 <= idx < len(catalogo):
+            itens.append((idx, carro_id))
     
-    if not resultados:
+    if not itens:
         raise HTTPException(status_code=404, detail="Nenhum carro válido encontrado")
     
-    return {
-        "comparacao": resultados,
-        "total": len(resultados),
-        "campos_comparados": list(resultados[0].keys()) if resultados else []
-    }
+    # Junta os fragmentos JSON em cache, sem construir dicts
+    with motor.etapa("serializacao"):
+        return catalogo.json.comparacao(itens, campos)
 
-@app.post("/recomendar")
-def recomendar_carros(request: RecomendarRequest):
-    """Recomenda carros baseado em filtros e perfil"""
-    if df.empty:
-        raise HTTPException(status_code=500, detail="Base de dados não carregada")
-    
-    # Começar com todos os carros
-    filtered_df = df.copy()
-    
-    # Aplicar filtros
+@app.post("/comparar")
+async def comparar_carros(
+    request: CompararRequest,
+    pedido: Request,
+    fields: Optional[str] = Query(None, description="Campos de cada carro, separados por vírgulas (por omissão todos)")
+):
+    """Compara 2-3 carros lado a lado"""
+    catalogo = await catalogo_pronto()
+    campos = campos_do_pedido(fields, {*map(str, catalogo.df.columns), "id"})
+    # Até 3 fragmentos já serializados: mais barato do que passar ao executor
+    return resposta_json(pedido, calcular_comparacao(catalogo, request, campos))
+
+def filtros_do_pedido(request: Union[RecomendarRequest, FacetasRequest], colunas) -> Tuple[motor.Filtros, List[str]]:
+    """Converte o pedido em motor.Filtros, com a descrição de cada filtro aplicado"""
     filters_applied = []
+    criterios: Dict[str, Any] = {}
     
     if request.preco_max and request.preco_max > 0:
-        filtered_df = filtered_df[filtered_df['Preco'] <= request.preco_max]
+        criterios["preco_max"] = request.preco_max
         filters_applied.append(f"Preço ≤ €{request.preco_max}")
     
     if request.tipo and request.tipo.strip():
-        filtered_df = filtered_df[filtered_df['Tipo'] == request.tipo.strip()]
+        criterios["tipos"] = (request.tipo.strip(),)
         filters_applied.append(f"Tipo = {request.tipo}")
     
     if request.combustivel and request.combustivel.strip():
-        filtered_df = filtered_df[filtered_df['Combustivel'] == request.combustivel.strip()]
+        criterios["combustiveis"] = (request.combustivel.strip(),)
         filters_applied.append(f"Combustível = {request.combustivel}")
     
     if request.bagageira_min and request.bagageira_min > 0:
-        filtered_df = filtered_df[filtered_df['Bagageira'] >= request.bagageira_min]
+        criterios["bagageira_min"] = request.bagageira_min
         filters_applied.append(f"Bagageira ≥ {request.bagageira_min}L")
     
     if request.consumo_max and request.consumo_max > 0:
-        filtered_df = filtered_df[filtered_df['Consumo'] <= request.consumo_max]
+        criterios["consumo_max"] = request.consumo_max
         filters_applied.append(f"Consumo ≤ {request.consumo_max}L/100km")
     
-    # Filtros de extras
+    # Filtros de extras (só os que existem no catálogo)
     if request.extras:
-        for extra in request.extras:
-            if extra in df.columns:
-                filtered_df = filtered_df[filtered_df[extra] == True]
-                filters_applied.append(f"Extra: {extra}")
+        extras = [extra for extra in request.extras if extra in colunas]
+        criterios["extras"] = tuple(extras)
+        filters_applied.extend(f"Extra: {extra}" for extra in extras)
+    
+    return motor.Filtros(**criterios), filters_applied
+
+def calcular_recomendacao(
+    catalogo, request: RecomendarRequest, campos: Optional[Tuple[str, ...]] = CAMPOS_RECOMENDAR
+) -> Dict[str, Any]:
+    """Filtra, pontua e devolve os 10 melhores carros para `request`"""
+    df = catalogo.df
+    if df.empty:
+        raise HTTPException(status_code=500, detail="Base de dados não carregada")
+    
+    filtros, filters_applied = filtros_do_pedido(request, df.columns)
+    
+    # Filtros em bitsets e scoring vetorizado (só os 10 melhores viram dicts);
+    # um slider apertado só volta a testar os candidatos do estado anterior.
+    # Se foi assim depende dos pedidos anteriores (de qualquer cliente): só
+    # vai no Server-Timing, nunca no corpo guardado em cache
+    total, resultados_finais, incremental = catalogo.refinar(filtros, request.perfil, k=10, campos=campos)
+    motor.descrever_etapa("refinamento", "incremental" if incremental else "completo")
     
     # Se não há carros após filtros
-    if len(filtered_df) == 0:
+    if total == 0:
         return {
             "recomendacoes": [],
             "filtros_aplicados": filters_applied,
@@ -345,93 +674,466 @@ def recomendar_carros(request: RecomendarRequest):
             "mensagem": "Nenhum carro encontrado com os filtros aplicados"
         }
     
-    # Sistema de scoring
-    carros_com_score = []
-    
-    for idx, row in filtered_df.iterrows():
-        score = 100.0  # Score base
-        
-        # Ajustar score baseado no perfil
-        if request.perfil:
-            if request.perfil == "economico":
-                # Prioridade: baixo consumo, preço baixo
-                consumo_norm = 1 - (row.get('Consumo', 10) / 20)  # Normalizar 0-20
-                preco_norm = 1 - (row.get('Preco', 50000) / 100000)
-                score *= (0.6 * consumo_norm + 0.4 * preco_norm) * 2
-                
-            elif request.perfil == "desportivo":
-                # Prioridade: potência, aceleração
-                potencia_norm = min(row.get('Potencia', 0) / 300, 1)
-                aceleracao_norm = 1 - (row.get('0-100', 20) / 30)  # Menor tempo = melhor
-                score *= (0.5 * potencia_norm + 0.5 * aceleracao_norm) * 2
-                
-            elif request.perfil == "familia":
-                # Prioridade: espaço, segurança
-                bagageira_norm = min(row.get('Bagageira', 0) / 1000, 1)
-                extras_score = sum([
-                    1 if row.get('Airbag', False) else 0,
-                    1 if row.get('ABS', False) else 0,
-                    1 if row.get('ESP', False) else 0
-                ]) / 3
-                score *= (0.6 * bagageira_norm + 0.4 * extras_score) * 2
-                
-            elif request.perfil == "cidade":
-                # Prioridade: consumo, tamanho compacto
-                consumo_norm = 1 - (row.get('Consumo', 10) / 15)
-                tamanho_score = 1 if row.get('Tipo', '') in ['Hatchback', 'Compacto'] else 0.5
-                score *= (0.7 * consumo_norm + 0.3 * tamanho_score) * 2
-                
-            elif request.perfil == "estrada":
-                # Prioridade: conforto, autonomia
-                velocidade_norm = min(row.get('Velocidade', 0) / 250, 1)
-                extras_score = sum([
-                    1 if row.get('AC', False) else 0,
-                    1 if row.get('GPS', False) else 0
-                ]) / 2
-                score *= (0.5 * velocidade_norm + 0.5 * extras_score) * 2
-        
-        # Garantir que score está entre 0-100
-        score = max(0, min(100, score))
-        
-        # Converter linha para dict
-        carro_dict = row.to_dict()
-        for key, value in carro_dict.items():
-            if pd.isna(value):
-                carro_dict[key] = None
-            elif hasattr(value, 'item'):
-                carro_dict[key] = value.item()
-        
-        carro_dict['id'] = str(idx)
-        carro_dict['score'] = round(score, 2)
-        
-        carros_com_score.append(carro_dict)
-    
-    # Ordenar por score
-    carros_com_score.sort(key=lambda x: x['score'], reverse=True)
-    
-    # Limitar a 10 resultados
-    resultados_finais = carros_com_score[:10]
-    
     return {
         "recomendacoes": resultados_finais,
         "filtros_aplicados": filters_applied,
-        "total_encontrados": len(filtered_df),
+        "total_encontrados": total,
         "total_recomendados": len(resultados_finais)
     }
 
-@app.get("/debug/dados")
-def debug_dados():
-    """Endpoint de debug para verificar dados carregados"""
+def pagina_recomendacao(
+    catalogo, request: RecomendarRequest, limit: int, cursor: Optional[str],
+    campos: Optional[Tuple[str, ...]] = CAMPOS_RECOMENDAR
+) -> bytes:
+    """Página de `limit` carros a partir do cursor, sobre a ordem completa memorizada"""
+    filtros, filters_applied = filtros_do_pedido(request, catalogo.df.columns)
+    consulta = hashlib.sha1(motor.canonicalizar(request.model_dump()).encode()).hexdigest()[:12]
+    
+    deslocamento = 0
+    if cursor:
+        try:
+            versao, consulta_cursor, deslocamento = motor.ler_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if consulta_cursor != consulta:
+            raise HTTPException(status_code=400, detail="Cursor de outra consulta")
+        if versao != catalogo.versao:
+            raise HTTPException(status_code=410, detail="Catálogo atualizado; repita a consulta sem cursor")
+    
+    ordem = cache_ordens.obter((catalogo.versao, consulta))
+    if ordem is None:
+        motor.descrever_etapa("cache", "miss")
+        ordem = catalogo.ordem_recomendacao(filtros, request.perfil)
+        cache_ordens.guardar((catalogo.versao, consulta), ordem)
+    else:
+        motor.descrever_etapa("cache", "hit")
+    posicoes, scores = ordem
+    
+    if len(posicoes) == 0:
+        return orjson.dumps({
+            "recomendacoes": [],
+            "filtros_aplicados": filters_applied,
+            "total": 0,
+            "mensagem": "Nenhum carro encontrado com os filtros aplicados",
+            "proximo_cursor": None,
+            "dataset_version": catalogo.versao
+        })
+    
+    fim = deslocamento + limit
+    with motor.etapa("serializacao"):
+        carros = catalogo.carros_com_score(posicoes[deslocamento:fim], scores[deslocamento:fim], campos)
+    with motor.etapa("json"):
+        return b"".join((
+            b'{"recomendacoes":[', b",".join(carros), b"],",
+            orjson.dumps({
+                "filtros_aplicados": filters_applied,
+                "total_encontrados": len(posicoes),
+                "total_recomendados": len(carros),
+                "proximo_cursor": motor.codificar_cursor(catalogo.versao, consulta, fim) if fim < len(posicoes) else None,
+                "dataset_version": catalogo.versao
+            })[1:]
+        ))
+
+def linhas_recomendacao(
+    catalogo, request: RecomendarRequest, limit: Optional[int],
+    campos: Optional[Tuple[str, ...]] = CAMPOS_RECOMENDAR
+):
+    """
+    NDJSON: uma linha com os totais e depois um carro por linha, por score.
+    
+    Os carros saem em blocos de seleção parcial, sem esperar pela ordem completa.
+    """
+    filtros, filters_applied = filtros_do_pedido(request, catalogo.df.columns)
+    total, blocos = catalogo.recomendacoes_em_ordem(filtros, request.perfil)
+    yield orjson.dumps({
+        "filtros_aplicados": filters_applied,
+        "total_encontrados": total,
+        "dataset_version": catalogo.versao
+    }) + b"\n"
+    
+    restantes = total if limit is None else min(limit, total)
+    for posicoes, scores in blocos:
+        if restantes <= 0:
+            break
+        carros = catalogo.carros_com_score(posicoes[:restantes], scores[:restantes], campos)
+        restantes -= len(carros)
+        yield b"\n".join(carros) + b"\n"
+
+@app.post("/recomendar")
+async def recomendar_carros(
+    request: RecomendarRequest,
+    pedido: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Carros por página (paginação por cursor)"),
+    cursor: Optional[str] = Query(None, description="proximo_cursor da página anterior"),
+    stream: bool = Query(False, description="NDJSON com todos os carros (ou os primeiros `limit`) por score"),
+    fields: Optional[str] = Query(None, description="Campos de cada carro, separados por vírgulas (* = todos)")
+):
+    """
+    Recomenda carros baseado em filtros e perfil.
+    
+    Sem parâmetros devolve os 10 melhores. Com `limit`/`cursor` pagina por
+    todos os carros filtrados; com `stream=true` envia-os em NDJSON. Cada
+    carro traz os campos de CAMPOS_RECOMENDAR, salvo `fields`.
+    """
+    catalogo = await catalogo_pronto()
+    campos = campos_do_pedido(fields, {*map(str, catalogo.df.columns), "id", "score"}, CAMPOS_RECOMENDAR)
+    
+    if stream:
+        if cursor:
+            raise HTTPException(status_code=400, detail="cursor não é suportado com stream=true")
+        if catalogo.df.empty:
+            raise HTTPException(status_code=500, detail="Base de dados não carregada")
+        return await transmitir_no_executor(linhas_recomendacao(catalogo, request, limit, campos))
+    
+    if limit is not None or cursor:
+        if catalogo.df.empty:
+            raise HTTPException(status_code=500, detail="Base de dados não carregada")
+        chave = (catalogo.versao, "pagina", motor.canonicalizar(request.model_dump()), limit, cursor, campos)
+        corpo = await executor.executar(
+            lambda: pagina_recomendacao(catalogo, request, limit or 10, cursor, campos), chave=chave
+        )
+        return resposta_json(pedido, corpo)
+    
+    return await responder_em_cache(
+        pedido, "recomendar", {**request.model_dump(), "fields": _parametro_campos(campos)},
+        lambda catalogo: calcular_recomendacao(catalogo, request, campos)
+    )
+
+def calcular_facetas(catalogo, request: FacetasRequest) -> Dict[str, Any]:
+    filtros, filters_applied = filtros_do_pedido(request, catalogo.df.columns)
+    with motor.etapa("facetas"):
+        facetas = catalogo.indice_facetas.contar(filtros)
+    facetas["filtros_aplicados"] = filters_applied
+    return facetas
+
+@app.post("/facetas")
+async def get_facetas(request: FacetasRequest, pedido: Request):
+    """
+    Quantos carros ficam por tipo, combustível, extra e intervalo de
+    preço/consumo/bagageira. Cada dimensão ignora o próprio filtro, para
+    mostrar quantos carros haveria ao escolher outra opção.
+    """
+    return await responder_em_cache(
+        pedido, "facetas", request.model_dump(),
+        lambda catalogo: calcular_facetas(catalogo, request)
+    )
+
+def calcular_pareto(catalogo, request: ParetoRequest, campos: Optional[Tuple[str, ...]] = None) -> bytes:
+    filtros, filters_applied = filtros_do_pedido(request, catalogo.df.columns)
+    try:
+        objetivos = motor.objetivos_canonicos(request.objetivos or motor.OBJETIVOS_PADRAO)
+        total, frentes = catalogo.pareto(filtros, objetivos, request.frentes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Até `limite` carros por frente, por ordem dos objetivos
+    with motor.etapa("serializacao"):
+        blocos = []
+        for numero, posicoes in enumerate(frentes, 1):
+            posicoes_frente = posicoes[:request.limite]
+            extras = [{"id": str(catalogo.df.index[pos]), "frente": numero} for pos in posicoes_frente]
+            if campos is not None:
+                carros = catalogo.json.projetados(posicoes_frente, campos, extras)
+            else:
+                carros = [catalogo.json.carro_com_extras(pos, extra) for pos, extra in zip(posicoes_frente, extras)]
+            blocos.append(b"".join((
+                b'{"frente":', str(numero).encode(), b',"total":', str(len(posicoes)).encode(),
+                b',"carros":[', b",".join(carros), b"]}",
+            )))
+    with motor.etapa("json"):
+        return b"".join((
+            b'{"frentes":[', b",".join(blocos), b"],",
+            orjson.dumps({
+                "objetivos": [
+                    {"nome": nome, "coluna": motor.OBJETIVOS[nome][0], "sentido": motor.OBJETIVOS[nome][1]}
+                    for nome in objetivos
+                ],
+                "filtros_aplicados": filters_applied,
+                "total_encontrados": total,
+                "dataset_version": catalogo.versao
+            })[1:]
+        ))
+
+@app.post("/recomendar/pareto")
+async def recomendar_pareto(
+    request: ParetoRequest,
+    pedido: Request,
+    fields: Optional[str] = Query(None, description="Campos de cada carro, separados por vírgulas (por omissão todos)")
+):
+    """
+    Carros não dominados nos objetivos escolhidos (nenhum outro é pelo
+    menos tão bom em todos e melhor num), e opcionalmente as frentes
+    seguintes, entre os carros que passam os filtros.
+    
+    Objetivos: consumo, aceleracao e preco (menor é melhor); potencia,
+    velocidade e bagageira (maior é melhor).
+    """
+    catalogo = await catalogo_pronto()
+    campos = campos_do_pedido(fields, {*map(str, catalogo.df.columns), "id", "frente"})
+    return await responder_em_cache(
+        pedido, "pareto", {**request.model_dump(), "fields": _parametro_campos(campos)},
+        lambda catalogo: calcular_pareto(catalogo, request, campos)
+    )
+
+def _euros(valores) -> List[Optional[float]]:
+    return [round(float(v), 2) if math.isfinite(v) else None for v in valores]
+
+def calcular_custo(catalogo, request: CustoRequest, campos: Optional[Tuple[str, ...]] = CAMPOS_CUSTO) -> bytes:
+    filtros, filters_applied = filtros_do_pedido(request, catalogo.df.columns)
+    try:
+        cenarios = catalogo.indice_custo.cenarios(
+            request.km_ano, request.anos, request.precos_combustivel, request.intervalos_combustivel,
+            request.intervalo_km_ano, request.cenarios, request.semente
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total, resultado = catalogo.custo(filtros, cenarios, request.k)
+    
+    rotulos = [f"p{p}" for p in motor.PERCENTIS]
+    resumo = {
+        "filtros_aplicados": filters_applied,
+        "total_encontrados": total,
+        "total_considerados": resultado.considerados if resultado else 0,
+        "cenarios": cenarios.n,
+        "dataset_version": catalogo.versao
+    }
+    if resultado is None or resultado.considerados == 0:
+        return orjson.dumps({"ranking": [], "mais_baratos": [], **resumo,
+                             "mensagem": "Nenhum carro com preço, consumo e combustível com preço"})
+    
+    # Os k de menor custo médio e os carros mais baratos em algum cenário
+    with motor.etapa("serializacao"):
+        ranking = resultado.ranking
+        extras = [
+            {
+                "id": str(catalogo.df.index[pos]),
+                "custo_medio": round(float(medio), 2),
+                "custo_combustivel": round(float(combustivel), 2),
+                "custo_percentis": dict(zip(rotulos, _euros(percentis))),
+                "prob_mais_barato": round(float(prob), 4),
+            }
+            for pos, medio, combustivel, percentis, prob in zip(
+                ranking, resultado.custo_medio, resultado.custo_combustivel,
+                resultado.percentis, resultado.prob_mais_barato(ranking)
+            )
+        ]
+        if campos is not None:
+            carros = catalogo.json.projetados(ranking, campos, extras)
+        else:
+            carros = [catalogo.json.carro_com_extras(pos, extra) for pos, extra in zip(ranking, extras)]
+        mais_baratos = [
+            {"id": str(catalogo.df.index[pos]), "prob_mais_barato": round(float(freq), 4)}
+            for pos, freq in zip(*resultado.mais_baratos(request.k))
+        ]
+    with motor.etapa("json"):
+        return b"".join((
+            b'{"ranking":[', b",".join(carros), b"],",
+            orjson.dumps({
+                "mais_baratos": mais_baratos,
+                "custo_medio_percentis": dict(zip(rotulos, _euros(resultado.distribuicao))),
+                "custo_minimo_percentis": dict(zip(rotulos, _euros(resultado.minimo_cenarios))),
+                **resumo
+            })[1:]
+        ))
+
+@app.post("/custo")
+async def custo_total(
+    request: CustoRequest,
+    pedido: Request,
+    fields: Optional[str] = Query(None, description="Campos de cada carro, separados por vírgulas (* = todos)")
+):
+    """
+    Custo total de posse (compra + combustível em `anos` a `km_ano`) dos
+    carros filtrados, em cenários de Monte Carlo de preços dos combustíveis
+    e km/ano (`intervalos_combustivel`, `intervalo_km_ano`).
+    
+    Devolve os `k` de menor custo médio com os percentis de cada um, os
+    carros mais baratos em mais cenários e os percentis do conjunto.
+    """
+    catalogo = await catalogo_pronto()
+    campos = campos_do_pedido(
+        fields, {*map(str, catalogo.df.columns), "id", *CAMPOS_CUSTO[-4:]}, CAMPOS_CUSTO
+    )
+    return await responder_em_cache(
+        pedido, "custo", {**request.model_dump(), "fields": _parametro_campos(campos)},
+        lambda catalogo: calcular_custo(catalogo, request, campos)
+    )
+
+# Pedidos por lote em POST /recomendar/batch
+MAXIMO_LOTE = int(os.getenv("MAXIMO_LOTE", "10000"))
+
+def linhas_lote(
+    catalogo, request: RecomendarLoteRequest,
+    campos: Optional[Tuple[str, ...]] = CAMPOS_RECOMENDAR
+):
+    """Uma linha NDJSON por pedido, pela ordem do lote, calculadas bloco a bloco"""
+    colunas = catalogo.df.columns
+    descricoes = []
+    pedidos = []
+    for item in request.pedidos:
+        filtros, filters_applied = filtros_do_pedido(item, colunas)
+        descricoes.append(filters_applied)
+        pesos = None
+        if item.ponderado:
+            pesos = motor.pesos_perfil(
+                item.perfil or "equilibrado",
+                item.prioridade_consumo, item.prioridade_desempenho, item.prioridade_espaco
+            )
+        pedidos.append(motor.PedidoLote(filtros, item.perfil, pesos))
+    
+    for resultado in motor.recomendar_lote(catalogo, pedidos, k=request.k):
+        item = request.pedidos[resultado.indice]
+        cabeca = orjson.dumps({"indice": resultado.indice, "id": item.id})[:-1]
+        if resultado.total == 0:
+            yield cabeca + b"," + orjson.dumps({
+                "recomendacoes": [],
+                "filtros_aplicados": descricoes[resultado.indice],
+                "total": 0,
+                "mensagem": "Nenhum carro encontrado com os filtros aplicados"
+            })[1:] + b"\n"
+        else:
+            # Carros já serializados (catalogo.json), só juntar bytes
+            yield b"".join((
+                cabeca, b',"recomendacoes":', motor.recomendacoes_json(catalogo, resultado, campos), b",",
+                orjson.dumps({
+                    "filtros_aplicados": descricoes[resultado.indice],
+                    "total_encontrados": resultado.total,
+                    "total_recomendados": len(resultado.posicoes)
+                })[1:], b"\n"
+            ))
+
+@app.post("/recomendar/batch")
+async def recomendar_lote(
+    request: RecomendarLoteRequest,
+    fields: Optional[str] = Query(None, description="Campos de cada carro, separados por vírgulas (* = todos)")
+):
+    """
+    Vários pedidos de /recomendar numa só passagem, em NDJSON.
+    
+    Cada linha tem o "indice" (e o "id", se enviado) do pedido e o mesmo
+    corpo de /recomendar, com os mesmos campos (CAMPOS_RECOMENDAR, salvo
+    `fields`). Com "ponderado": true o pedido usa os pesos de car_filter
+    (perfil ou "personalizado" com as prioridades).
+    """
+    if len(request.pedidos) > MAXIMO_LOTE:
+        raise HTTPException(status_code=413, detail=f"Máximo de {MAXIMO_LOTE} pedidos por lote")
+    catalogo = await catalogo_pronto()
+    if catalogo.df.empty:
+        raise HTTPException(status_code=500, detail="Base de dados não carregada")
+    campos = campos_do_pedido(fields, {*map(str, catalogo.df.columns), "id", "score"}, CAMPOS_RECOMENDAR)
+    return await transmitir_no_executor(linhas_lote(catalogo, request, campos))
+
+@app.get("/metrics")
+async def get_metrics():
+    """Métricas no formato de exposição do Prometheus (por processo/worker)"""
+    extra = {
+        "carros_cache_acertos": cache_respostas.acertos,
+        "carros_cache_falhas": cache_respostas.falhas,
+        "carros_cache_entradas": len(cache_respostas),
+        "carros_cache_ordens_entradas": len(cache_ordens),
+        "carros_catalogo_linhas": len(estado.catalogo) if estado.pronto else 0,
+        "carros_executor_pendentes": executor.pendentes,
+        "carros_executor_executadas": executor.executadas,
+        "carros_executor_coalescidas": executor.coalescidas,
+        "carros_executor_rejeitadas": executor.rejeitadas,
+    }
+    return Response(content=metricas.exportar(extra), media_type="text/plain; version=0.0.4")
+
+def calcular_debug(catalogo) -> Dict[str, Any]:
+    df = catalogo.df
     sample = df.head(3).to_dict(orient='records') if not df.empty else []
     
     return {
-        "carregado_de": str(loaded_from),
+        "carregado_de": catalogo.origem,
         "total_registros": len(df),
+        "tempos_s": {
+            "carregamento": round(estado.duracao, 4),
+            "indices": round(catalogo.tempo_indices, 4),
+            "construcao": {nome: round(t, 4) for nome, t in catalogo.tempos_construcao.items()},
+        },
+        "dataset_version": catalogo.versao,
+        "recargas": {
+            "total": estado.recargas,
+            "em_curso": estado.recarga_em_curso,
+            "ultima_duracao_s": round(estado.duracao_recarga, 4) if estado.duracao_recarga else None,
+            "ultimo_erro": str(estado.erro_recarga) if estado.erro_recarga else None
+        },
+        "memoria": catalogo.memoria(),
         "colunas": df.columns.tolist() if not df.empty else [],
         "tipos_colunas": {col: str(dtype) for col, dtype in df.dtypes.items()} if not df.empty else {},
         "amostra": sample
     }
 
+@app.get("/debug/dados")
+async def debug_dados(pedido: Request):
+    """Endpoint de debug para verificar dados carregados"""
+    catalogo = await catalogo_pronto()
+    corpo = await executor.executar(
+        lambda: orjson.dumps(calcular_debug(catalogo), option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    )
+    return resposta_json(pedido, corpo)
+
+# ==================== ADMINISTRAÇÃO ====================
+def escrever_marca_recarga() -> str:
+    """Escreve (de forma atómica) uma marca de recarga nova e devolve-a"""
+    marca = f"{time.time_ns()}-{os.getpid()}"
+    RECARGA_MARCA.parent.mkdir(parents=True, exist_ok=True)
+    temporario = RECARGA_MARCA.with_name(f"{RECARGA_MARCA.name}.{os.getpid()}.tmp")
+    temporario.write_text(marca, encoding="utf-8")
+    temporario.replace(RECARGA_MARCA)
+    return marca
+
+@app.post("/admin/reload", status_code=202)
+async def admin_reload(x_admin_token: str = Header("", description="Igual à variável ADMIN_TOKEN")):
+    """
+    Pede a todos os workers que construam a nova versão do catálogo em
+    segundo plano e a troquem sem interromper pedidos (via RECARGA_MARCA).
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Recarga remota desativada (defina ADMIN_TOKEN)")
+    if not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Token inválido")
+    
+    marca = await asyncio.to_thread(escrever_marca_recarga)
+    return {
+        "recarga_pedida": marca,
+        "recarga_em_curso": estado.recarga_em_curso,
+        "dataset_version": estado.catalogo.versao if estado.pronto else None,
+        "mensagem": f"Recarga pedida a todos os workers (em até {2 * RECARGA_MARCA_INTERVALO:g} s)"
+    }
+
+# ==================== EXPORTAÇÃO ESTÁTICA ====================
+def prefixos_modelos(catalogo, tamanho: int = 3) -> List[str]:
+    """Termos de /modelos a exportar: "" e, de cada palavra pesquisável, os prefixos até `tamanho` e a palavra inteira"""
+    termos = {""}
+    for texto in catalogo.indice_pesquisa.textos:
+        for palavra in texto.split():
+            termos.update(palavra[:i] for i in range(1, min(tamanho, len(palavra)) + 1))
+            termos.add(palavra)
+    return sorted(termos)
+
+def paginas_estaticas(catalogo, tamanho_prefixos: int = 3):
+    """
+    (rota, corpo) das respostas que não dependem de filtros, com os bytes
+    que o endpoint devolveria (mesmas funções calcular_* e _serializar).
+    As rotas POST levam o corpo do pedido na forma de motor.canonicalizar.
+    """
+    yield "GET /tipos", _serializar(catalogo, calcular_tipos(catalogo))
+    yield "GET /combustiveis", _serializar(catalogo, calcular_combustiveis(catalogo))
+    
+    for perfil in (None, *motor.PERFIS):
+        request = RecomendarRequest(perfil=perfil)
+        yield (
+            f"POST /recomendar {motor.canonicalizar(request.model_dump())}",
+            _serializar(catalogo, calcular_recomendacao(catalogo, request))
+        )
+    
+    for termo in prefixos_modelos(catalogo, tamanho_prefixos):
+        yield f"GET /modelos?q={termo}", _serializar(catalogo, calcular_modelos(catalogo, termo, CAMPOS_MODELOS))
+    
+    for idx in range(len(catalogo)):
+        yield f"GET /carro/{idx}", calcular_carro(catalogo, str(idx))
+
 # ==================== INICIALIZAÇÃO ====================
 if __name__ == "__main__":
     import uvicorn
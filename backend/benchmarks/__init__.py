@@ -0,0 +1,8 @@
+"""
+Scripts de benchmark do backend (as verificações de equivalência estão
+em backend/tests, com pytest).
+
+Executar a partir de backend/, por exemplo:
+    python -m benchmarks.micro
+    python -m benchmarks.suite --saida resultados.json --referencia anterior.json
+"""
@@ -0,0 +1,72 @@
+"""
+Tempo de carregamento do catálogo: folha de cálculo vs snapshot binário.
+
+    python -m benchmarks.arranque [--linhas 50 10000 100000] [--repeticoes 5]
+
+Para cada tamanho gera um catálogo sintético, grava-o em .xlsx e .csv
+e em snapshot, e mede o caminho antigo (read_excel/read_csv) contra o
+snapshot com mmap. Imprime os resultados em JSON.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import motor
+from benchmarks.sintetico import gerar_catalogo
+
+
+def _medir(funcao, repeticoes: int) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - t0)
+    return {
+        "mediana_ms": round(statistics.median(tempos) * 1000, 3),
+        "min_ms": round(min(tempos) * 1000, 3),
+    }
+
+
+def medir_tamanho(n: int, repeticoes: int, pasta: Path) -> dict:
+    df = gerar_catalogo(n, seed=n)
+    resultado = {"linhas": n}
+
+    for extensao in (".xlsx", ".csv"):
+        origem = pasta / f"carros_{n}{extensao}"
+        if extensao == ".xlsx":
+            df.to_excel(origem, index=False)
+        else:
+            df.to_csv(origem, index=False)
+
+        destino = pasta / f"snapshot_{n}{extensao.replace('.', '_')}"
+        motor.guardar_snapshot(motor.ler_ficheiro_dados(origem), destino, origem)
+        manifest = motor.ler_manifest(destino)
+
+        resultado[extensao.lstrip(".")] = {
+            "ficheiro": _medir(lambda: motor.ler_ficheiro_dados(origem), repeticoes),
+            "snapshot": _medir(lambda: motor.carregar_snapshot(destino, manifest), repeticoes),
+        }
+    return resultado
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[50, 10_000])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resultados = [medir_tamanho(n, args.repeticoes, Path(tmp)) for n in args.linhas]
+
+    json.dump({"benchmark": "arranque", "resultados": resultados}, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
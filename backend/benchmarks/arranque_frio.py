@@ -0,0 +1,135 @@
+"""
+Orçamento de cold start da API.
+
+    python -m benchmarks.arranque_frio [--porta 8765] [--repeticoes 3]
+
+Mede, em processos novos:
+  - `python -X importtime -c "import api"`: tempo total de import e os
+    módulos mais pesados;
+  - uvicorn api:app: tempo até ao primeiro 200 em /health e até /health
+    reportar "healthy" (catálogo pronto).
+
+Imprime JSON e termina com código 1 se algum valor passar o orçamento.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Orçamentos em milissegundos (medianas)
+ORCAMENTO_IMPORT_MS = 1500
+ORCAMENTO_PRIMEIRO_HEALTH_MS = 3000
+ORCAMENTO_CATALOGO_PRONTO_MS = 10000
+
+
+def medir_import() -> dict:
+    """Tempo cumulativo de `import api` e os 10 imports mais pesados."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import api"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    modulos = []
+    for linha in proc.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        proprio, cumulativo, nome = linha[len("import time:"):].split("|")
+        modulos.append((nome.strip(), int(proprio), int(cumulativo)))
+
+    total_us = next(c for nome, _, c in modulos if nome == "api")
+    pesados = sorted(modulos, key=lambda m: m[1], reverse=True)[:10]
+    return {
+        "import_api_ms": round(total_us / 1000, 1),
+        "pandas_importado": any(nome == "pandas" for nome, _, _ in modulos),
+        "mais_pesados": [{"modulo": n, "proprio_ms": round(p / 1000, 1)} for n, p, _ in pesados],
+    }
+
+
+def _get_health(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=1) as resposta:
+            return json.loads(resposta.read())
+    except OSError:
+        return None
+
+
+def medir_servidor(porta: int) -> dict:
+    """Tempo até ao primeiro /health e até ao catálogo estar pronto."""
+    url = f"http://127.0.0.1:{porta}/health"
+    inicio = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(porta), "--log-level", "warning"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
+    primeiro = pronto = None
+    try:
+        while time.perf_counter() - inicio < 60:
+            corpo = _get_health(url)
+            agora = time.perf_counter() - inicio
+            if corpo is not None and primeiro is None:
+                primeiro = agora
+            if corpo is not None and corpo.get("status") == "healthy":
+                pronto = agora
+                break
+            time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    return {
+        "primeiro_health_ms": round(primeiro * 1000, 1) if primeiro else None,
+        "catalogo_pronto_ms": round(pronto * 1000, 1) if pronto else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    imports = [medir_import() for _ in range(args.repeticoes)]
+    servidores = [medir_servidor(args.porta) for _ in range(args.repeticoes)]
+
+    def mediana(valores):
+        valores = [v for v in valores if v is not None]
+        return round(statistics.median(valores), 1) if valores else None
+
+    resultado = {
+        "benchmark": "arranque_frio",
+        "import_api_ms": mediana(i["import_api_ms"] for i in imports),
+        "pandas_importado": imports[0]["pandas_importado"],
+        "mais_pesados": imports[0]["mais_pesados"],
+        "primeiro_health_ms": mediana(s["primeiro_health_ms"] for s in servidores),
+        "catalogo_pronto_ms": mediana(s["catalogo_pronto_ms"] for s in servidores),
+        "orcamento_ms": {
+            "import_api": ORCAMENTO_IMPORT_MS,
+            "primeiro_health": ORCAMENTO_PRIMEIRO_HEALTH_MS,
+            "catalogo_pronto": ORCAMENTO_CATALOGO_PRONTO_MS,
+        },
+    }
+    excedidos = [
+        nome for nome, valor, limite in (
+            ("import_api", resultado["import_api_ms"], ORCAMENTO_IMPORT_MS),
+            ("primeiro_health", resultado["primeiro_health_ms"], ORCAMENTO_PRIMEIRO_HEALTH_MS),
+            ("catalogo_pronto", resultado["catalogo_pronto_ms"], ORCAMENTO_CATALOGO_PRONTO_MS),
+        )
+        if valor is None or valor > limite
+    ]
+    resultado["excedidos"] = excedidos
+
+    json.dump(resultado, sys.stdout, indent=2)
+    print()
+    return 1 if excedidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
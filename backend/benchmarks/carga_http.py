@@ -0,0 +1,237 @@
+"""
+Teste de carga HTTP contra um uvicorn local (um processo).
+
+    python -m benchmarks.carga_http [--linhas 10000] [--clientes 8] [--duracao 10]
+
+Gera um catálogo sintético e o respetivo snapshot numa pasta temporária,
+arranca `uvicorn api:app` sobre ela (DATA_DIR/SNAPSHOT_DIR) e dispara,
+de vários processos cliente com ligações keep-alive, uma mistura de
+pedidos parecida com a do frontend (ver MISTURA). Os parâmetros variam,
+pelo que a maior parte dos pedidos não é servida pela cache de respostas.
+
+Imprime JSON com pedidos/s e latências, no total e por tipo de pedido.
+As funções daqui são reutilizadas por benchmarks.carga_workers.
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+from pathlib import Path
+
+import motor
+from benchmarks.sintetico import COMBUSTIVEIS, EXTRAS, MARCAS, TIPOS, gerar_catalogo
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Tipo de pedido -> fração do total
+MISTURA = {
+    "recomendar": 0.40,
+    "modelos": 0.30,
+    "carro": 0.15,
+    "comparar": 0.10,
+    "listas": 0.05,
+}
+
+
+def pedido_aleatorio(rng: random.Random, n: int):
+    """(tipo, método, caminho, corpo) de um pedido sorteado segundo MISTURA."""
+    tipo = rng.choices(list(MISTURA), weights=list(MISTURA.values()))[0]
+    if tipo == "recomendar":
+        corpo = {
+            "preco_max": rng.randrange(15000, 90000, 250),
+            "perfil": rng.choice(list(motor.PERFIS)),
+        }
+        if rng.random() < 0.5:
+            corpo["tipo"] = rng.choice(TIPOS)
+        if rng.random() < 0.3:
+            corpo["combustivel"] = rng.choice(COMBUSTIVEIS)
+        if rng.random() < 0.3:
+            corpo["extras"] = rng.sample(EXTRAS, 2)
+        return tipo, "POST", "/recomendar", json.dumps(corpo)
+    if tipo == "modelos":
+        marca = rng.choice(list(MARCAS))
+        termo = marca[:rng.randint(2, len(marca))]
+        if rng.random() < 0.5:
+            termo += f" {rng.randint(2015, 2024)}"
+        return tipo, "GET", f"/modelos?q={urllib.parse.quote(termo)}", None
+    if tipo == "carro":
+        return tipo, "GET", f"/carro/{rng.randrange(n)}", None
+    if tipo == "comparar":
+        ids = [str(rng.randrange(n)) for _ in range(rng.randint(2, 3))]
+        return tipo, "POST", "/comparar", json.dumps({"modelos_ids": ids})
+    return tipo, "GET", rng.choice(["/tipos", "/combustiveis"]), None
+
+
+def _cliente(porta: int, duracao: float, semente: int, n: int, fila) -> None:
+    """Processo cliente: pedidos sequenciais numa ligação keep-alive."""
+    rng = random.Random(semente)
+    ligacao = http.client.HTTPConnection("127.0.0.1", porta, timeout=30)
+    latencias = {tipo: [] for tipo in MISTURA}
+    erros = 0
+    fim = time.perf_counter() + duracao
+    while time.perf_counter() < fim:
+        tipo, metodo, caminho, corpo = pedido_aleatorio(rng, n)
+        t0 = time.perf_counter()
+        try:
+            ligacao.request(metodo, caminho, body=corpo,
+                            headers={"Content-Type": "application/json"})
+            resposta = ligacao.getresponse()
+            resposta.read()
+            if resposta.status != 200:
+                erros += 1
+        except (OSError, http.client.HTTPException):
+            erros += 1
+            ligacao.close()
+            ligacao = http.client.HTTPConnection("127.0.0.1", porta, timeout=30)
+            continue
+        latencias[tipo].append(time.perf_counter() - t0)
+    fila.put((latencias, erros))
+
+
+def resumo_latencias(latencias) -> dict:
+    if not latencias:
+        return {}
+    latencias = sorted(latencias)
+
+    def percentil(p):
+        return round(latencias[min(len(latencias) - 1, int(p * len(latencias)))] * 1000, 2)
+
+    return {
+        "pedidos": len(latencias),
+        "p50_ms": percentil(0.50),
+        "p95_ms": percentil(0.95),
+        "p99_ms": percentil(0.99),
+        "media_ms": round(statistics.mean(latencias) * 1000, 2),
+    }
+
+
+def executar_carga(porta: int, clientes: int, duracao: float, n: int) -> dict:
+    """Corre `clientes` processos durante `duracao` s e agrega as latências."""
+    fila = multiprocessing.Queue()
+    processos = [
+        multiprocessing.Process(target=_cliente, args=(porta, duracao, i, n, fila))
+        for i in range(clientes)
+    ]
+    for p in processos:
+        p.start()
+    resultados = [fila.get(timeout=duracao + 60) for _ in processos]
+    for p in processos:
+        p.join()
+
+    por_tipo = {tipo: [l for lat, _ in resultados for l in lat[tipo]] for tipo in MISTURA}
+    todas = [l for lat in por_tipo.values() for l in lat]
+    return {
+        "pedidos": len(todas),
+        "erros": sum(e for _, e in resultados),
+        "pedidos_por_s": round(len(todas) / duracao, 1),
+        "latencia": resumo_latencias(todas),
+        "por_tipo": {tipo: resumo_latencias(lat) for tipo, lat in por_tipo.items()},
+    }
+
+
+def memoria_kb(pid: int) -> dict:
+    """RSS e PSS (kB) de um processo, a partir de /proc/<pid>/smaps_rollup."""
+    valores = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for linha in f:
+                campo, _, resto = linha.partition(":")
+                if campo in ("Rss", "Pss"):
+                    valores[campo.lower() + "_kb"] = int(resto.split()[0])
+    except OSError:
+        pass
+    return valores
+
+
+def filhos(pid: int):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def esperar_pronto(porta: int, limite: float = 300) -> bool:
+    """Espera até /health reportar o catálogo pronto."""
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < limite:
+        try:
+            ligacao = http.client.HTTPConnection("127.0.0.1", porta, timeout=2)
+            ligacao.request("GET", "/health")
+            if json.loads(ligacao.getresponse().read()).get("status") == "healthy":
+                return True
+        except (OSError, http.client.HTTPException, ValueError):
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def preparar_catalogo(pasta: Path, linhas: int) -> None:
+    """CSV sintético e respetivo snapshot em `pasta`."""
+    origem = pasta / "carros.csv"
+    gerar_catalogo(linhas, seed=linhas).to_csv(origem, index=False)
+    motor.guardar_snapshot(motor.ler_ficheiro_dados(origem), pasta / "snapshot", origem)
+
+
+def ambiente_servidor(pasta: Path, **extra) -> dict:
+    return {
+        **os.environ,
+        "DATA_DIR": str(pasta),
+        "SNAPSHOT_DIR": str(pasta / "snapshot"),
+        **extra,
+    }
+
+
+def parar(servidor: subprocess.Popen) -> None:
+    servidor.send_signal(signal.SIGTERM)
+    try:
+        servidor.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        servidor.kill()
+
+
+def medir_uvicorn(linhas: int, clientes: int, duracao: float, porta: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        pasta = Path(tmp)
+        preparar_catalogo(pasta, linhas)
+        servidor = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "api:app", "--port", str(porta),
+             "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=ambiente_servidor(pasta),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            if not esperar_pronto(porta):
+                return {"linhas": linhas, "erro": "servidor não ficou pronto"}
+            resultado = executar_carga(porta, clientes, duracao, linhas)
+            resultado["memoria"] = memoria_kb(servidor.pid)
+        finally:
+            parar(servidor)
+    return {"linhas": linhas, "clientes": clientes, "duracao_s": duracao, **resultado}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--clientes", type=int, default=8)
+    parser.add_argument("--duracao", type=float, default=10)
+    parser.add_argument("--porta", type=int, default=8767)
+    args = parser.parse_args()
+
+    resultados = [medir_uvicorn(n, args.clientes, args.duracao, args.porta) for n in args.linhas]
+    print(json.dumps(resultados, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
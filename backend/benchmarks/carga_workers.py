@@ -0,0 +1,82 @@
+"""
+Teste de carga multi-worker: débito e memória com 1..N workers gunicorn.
+
+    python -m benchmarks.carga_workers [--linhas 100000] [--workers 1 2 4]
+                                       [--clientes 8] [--duracao 10]
+
+Usa o catálogo sintético e a mistura de pedidos de benchmarks.carga_http,
+mas arranca `gunicorn api:app -c gunicorn.conf.py` para cada número de
+workers.
+
+Mede pedidos/s, latências e a memória (RSS e PSS, via /proc) do pai e
+de cada worker. A PSS divide as páginas partilhadas entre processos: se
+o catálogo está de facto partilhado, a PSS total quase não cresce com o
+número de workers. Imprime JSON.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.carga_http import (
+    BACKEND_DIR, ambiente_servidor, esperar_pronto, executar_carga, filhos,
+    memoria_kb, parar, preparar_catalogo,
+)
+
+
+def medir_workers(workers: int, args, pasta: Path) -> dict:
+    servidor = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "api:app", "-c", "gunicorn.conf.py",
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=ambiente_servidor(pasta, WEB_CONCURRENCY=str(workers), PORT=str(args.porta)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not esperar_pronto(args.porta):
+            return {"workers": workers, "erro": "servidor não ficou pronto"}
+
+        resultado = executar_carga(args.porta, args.clientes, args.duracao, args.linhas)
+        memoria_workers = [memoria_kb(pid) for pid in filhos(servidor.pid)]
+        memoria_pai = memoria_kb(servidor.pid)
+        resultado["memoria"] = {
+            "pai": memoria_pai,
+            "workers": memoria_workers,
+            "pss_total_kb": memoria_pai.get("pss_kb", 0)
+            + sum(m.get("pss_kb", 0) for m in memoria_workers),
+        }
+        return {"workers": workers, **resultado}
+    finally:
+        parar(servidor)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=100000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clientes", type=int, default=8)
+    parser.add_argument("--duracao", type=float, default=10)
+    parser.add_argument("--porta", type=int, default=8766)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pasta = Path(tmp)
+        preparar_catalogo(pasta, args.linhas)
+        resultados = [medir_workers(w, args, pasta) for w in args.workers]
+
+    print(json.dumps({
+        "linhas": args.linhas,
+        "cpus": os.cpu_count(),
+        "clientes": args.clientes,
+        "duracao_s": args.duracao,
+        "resultados": resultados,
+    }, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Custo total de posse (POST /custo): IndiceCusto.simular contra a matriz
+carros × cenários completa.
+
+    python -m benchmarks.custo [--linhas 100000 1000000] [--cenarios 1000]
+
+A verificação compara, em catálogos pequenos com filtros e intervalos
+aleatórios, o ranking, as médias, os percentis e o mais barato de cada
+cenário com a força bruta (todos os carros filtrados × todos os
+cenários, np.percentile por carro). Mede-se o tempo e o pico de memória
+(tracemalloc) de simular() no catálogo sintético e num catálogo em que
+Preco sobe e Consumo desce (a escada de cada combustível é o catálogo
+inteiro, pior caso da matriz), e o da força bruta.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import motor
+from benchmarks.sintetico import COMBUSTIVEIS, TIPOS, gerar_catalogo
+from motor.custo import PERCENTIS
+
+# Linhas da força bruta calculadas de cada vez
+BLOCO_FORCA_BRUTA = 256
+
+
+def forca_bruta(indice: motor.IndiceCusto, mascara: np.ndarray, cenarios: motor.CenariosCusto, k: int) -> dict:
+    """Todos os carros × todos os cenários, sem escadas nem percentis de u."""
+    unitario = cenarios.unitario
+    com_preco = np.append(np.isfinite(unitario[:, 0]), False)
+    validos = np.isfinite(indice.preco) & np.isfinite(indice.consumo) & (indice.consumo >= 0)
+    posicoes = np.flatnonzero(mascara & validos & com_preco[indice.codigos])
+    medias, percentis = [], []
+    minimo = np.full(cenarios.n, np.inf)
+    vencedor = np.full(cenarios.n, -1)
+    for inicio in range(0, len(posicoes), BLOCO_FORCA_BRUTA):
+        bloco = posicoes[inicio:inicio + BLOCO_FORCA_BRUTA]
+        custos = indice.consumo[bloco, None] * unitario[indice.codigos[bloco]]
+        custos += indice.preco[bloco, None]
+        medias.append(custos.mean(axis=1))
+        percentis.append(np.percentile(custos, PERCENTIS, axis=1).T)
+        linhas = custos.argmin(axis=0)
+        valores = custos[linhas, np.arange(cenarios.n)]
+        melhora = valores < minimo
+        minimo[melhora] = valores[melhora]
+        vencedor[melhora] = bloco[linhas[melhora]]
+    medias = np.concatenate(medias) if medias else np.empty(0)
+    percentis = np.concatenate(percentis) if percentis else np.empty((0, len(PERCENTIS)))
+    melhores = motor.top_k(-medias, k)
+    vencedores, contagens = np.unique(vencedor[vencedor >= 0], return_counts=True)
+    return {
+        "ranking": posicoes[melhores],
+        "custo_medio": medias[melhores],
+        "percentis": percentis[melhores],
+        "vencedores": vencedores,
+        "frequencia": contagens / cenarios.n,
+    }
+
+
+def cenarios_aleatorios(indice: motor.IndiceCusto, rng, n: int) -> motor.CenariosCusto:
+    intervalos = {}
+    for combustivel in rng.choice(COMBUSTIVEIS, int(rng.integers(0, 4)), replace=False):
+        minimo = float(rng.uniform(0.1, 2.0))
+        intervalos[str(combustivel)] = [minimo, minimo * float(rng.uniform(1.0, 1.6))]
+    precos = {"Elétrico": 0.3} if rng.random() < 0.3 else None
+    intervalo_km = [5000, 30000] if rng.random() < 0.5 else None
+    return indice.cenarios(
+        float(rng.integers(5000, 40000)), int(rng.integers(1, 15)), precos, intervalos, intervalo_km,
+        n=n, semente=int(rng.integers(0, 1000)),
+    )
+
+
+def catalogo_escada(n: int):
+    """Preco crescente e Consumo decrescente: nenhum carro domina outro do mesmo combustível."""
+    df = gerar_catalogo(n, seed=n)
+    df["Preco"] = np.arange(n) * 3.0 + 10000
+    df["Consumo"] = 12.0 - np.arange(n) * (9.0 / n)
+    return motor.Catalogo(df, "custo-escada")
+
+
+def verificar(casos: int = 200) -> bool:
+    rng = np.random.default_rng(0)
+    for caso in range(casos):
+        catalogo = (
+            catalogo_escada(int(rng.integers(50, 500))) if caso % 10 == 0
+            else motor.Catalogo(gerar_catalogo(int(rng.integers(50, 3000)), seed=caso, fracao_nan=0.05), "custo")
+        )
+        indice = catalogo.indice_custo
+        cenarios = cenarios_aleatorios(indice, rng, int(rng.integers(1, 400)))
+        criterios = {}
+        if rng.random() < 0.5:
+            criterios["preco_max"] = float(rng.integers(15, 60) * 1000)
+        if rng.random() < 0.3:
+            criterios["tipos"] = (str(rng.choice(TIPOS)),)
+        filtros = motor.Filtros(**criterios)
+        k = int(rng.integers(1, 20))
+
+        total, resultado = catalogo.custo(filtros, cenarios, k)
+        if total == 0:
+            continue
+        esperado = forca_bruta(indice, catalogo.filtrar(filtros).mascara(), cenarios, k)
+        iguais = (
+            np.array_equal(resultado.ranking, esperado["ranking"])
+            and np.allclose(resultado.custo_medio, esperado["custo_medio"], rtol=1e-9)
+            and np.allclose(resultado.percentis, esperado["percentis"], rtol=1e-9)
+            and np.array_equal(resultado.vencedores, esperado["vencedores"])
+            and np.array_equal(resultado.frequencia, esperado["frequencia"])
+        )
+        if not iguais:
+            print(f"❌ Caso {caso} ({filtros}, {cenarios.n} cenários) difere da força bruta", file=sys.stderr)
+            return False
+    print(f"✅ {casos} casos iguais à força bruta", file=sys.stderr)
+    return True
+
+
+def _medir(funcao, repeticoes: int) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"mediana_ms": round(statistics.median(tempos) * 1000, 1), "pico_mb": round(pico / 2**20, 1)}
+
+
+def medir(n: int, cenarios: int, repeticoes: int) -> dict:
+    resultado = {"linhas": n, "cenarios": cenarios}
+    for nome, catalogo in (
+        ("sintetico", motor.Catalogo(gerar_catalogo(n, seed=n), "custo")),
+        ("escada", catalogo_escada(n)),
+    ):
+        indice = catalogo.indice_custo
+        simulacao = indice.cenarios(
+            15000, 8, intervalos={c: [1.0, 2.2] for c in COMBUSTIVEIS if c != "Elétrico"},
+            intervalo_km=[8000, 25000], n=cenarios,
+        )
+        _, saida = catalogo.custo(motor.Filtros(), simulacao, 10)
+        resultado[nome] = {
+            "simular": _medir(lambda: catalogo.custo(motor.Filtros(), simulacao, 10), repeticoes),
+            "candidatos_matriz": saida.candidatos,
+        }
+        if n <= 100_000:
+            mascara = np.ones(n, dtype=bool)
+            resultado[nome]["forca_bruta"] = _medir(lambda: forca_bruta(indice, mascara, simulacao, 10), 1)
+    return resultado
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--cenarios", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    ok = verificar()
+    resultados = [medir(n, args.cenarios, args.repeticoes) for n in args.linhas]
+    json.dump({"benchmark": "custo", "resultados": resultados}, sys.stdout, indent=2)
+    print()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
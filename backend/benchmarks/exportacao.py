@@ -0,0 +1,127 @@
+"""
+Exportação estática contra a API em execução: os mesmos bytes, rota a rota.
+
+    python -m benchmarks.exportacao [--linhas 20000] [--porta 8768]
+
+Gera um catálogo sintético, corre `python -m motor exportar` sobre ele e
+arranca o uvicorn com os mesmos dados. Cada rota do manifest é pedida à
+API (Accept-Encoding: identity) e comparada com o ficheiro exportado; as
+cópias .br/.gz têm de descomprimir para os mesmos bytes. Mede o tempo da
+exportação e os bytes escritos.
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+import motor
+from benchmarks.carga_http import BACKEND_DIR, ambiente_servidor, esperar_pronto, parar, preparar_catalogo
+from motor.exportacao import EXTENSOES, MANIFEST
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def pedido_da_rota(rota: str):
+    """(método, caminho, corpo) de uma rota do manifest ("POST /recomendar {...}", "GET /modelos?q=go")."""
+    metodo, _, resto = rota.partition(" ")
+    caminho, _, corpo = resto.partition(" ")
+    base, separador, termo = caminho.partition("?q=")
+    if separador:
+        caminho = f"{base}?q={quote(termo, safe='')}"
+    return metodo, caminho, corpo.encode() if corpo else None
+
+
+def descomprimir(dados: bytes, codificacao: str) -> bytes:
+    return brotli.decompress(dados) if codificacao == "br" else gzip.decompress(dados)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=20_000)
+    parser.add_argument("--porta", type=int, default=8768)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pasta = Path(tmp)
+        preparar_catalogo(pasta, args.linhas)
+        ambiente = ambiente_servidor(pasta)
+        destino = pasta / "estatico"
+
+        inicio = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "motor", "exportar", "--destino", str(destino)],
+            cwd=BACKEND_DIR, env=ambiente, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        duracao = time.perf_counter() - inicio
+        manifest = json.loads((destino / MANIFEST).read_text(encoding="utf-8"))
+
+        servidor = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "api:app", "--port", str(args.porta), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=ambiente, stdout=subprocess.DEVNULL,
+        )
+        try:
+            if not esperar_pronto(args.porta):
+                print("❌ A API não ficou pronta", file=sys.stderr)
+                return 1
+            ligacao = http.client.HTTPConnection("127.0.0.1", args.porta, timeout=30)
+            diferentes = []
+            for rota, ficheiro in manifest["rotas"].items():
+                metodo, caminho, corpo = pedido_da_rota(rota)
+                cabecalhos = {"Accept-Encoding": "identity"}
+                if corpo is not None:
+                    cabecalhos["Content-Type"] = "application/json"
+                ligacao.request(metodo, caminho, body=corpo, headers=cabecalhos)
+                resposta = ligacao.getresponse()
+                vivo = resposta.read()
+                if resposta.status != 200 or vivo != (destino / ficheiro).read_bytes():
+                    diferentes.append(rota)
+            ligacao.close()
+        finally:
+            parar(servidor)
+
+        comprimidos = {}
+        for ficheiro, info in manifest["ficheiros"].items():
+            original = (destino / ficheiro).read_bytes()
+            for codificacao in info.get("codificacoes", ()):
+                dados = (destino / (ficheiro + EXTENSOES[codificacao])).read_bytes()
+                if descomprimir(dados, codificacao) != original:
+                    diferentes.append(f"{ficheiro} ({codificacao})")
+                comprimidos.setdefault(codificacao, [0, 0])
+                comprimidos[codificacao][0] += len(original)
+                comprimidos[codificacao][1] += len(dados)
+
+    if diferentes:
+        print(f"❌ {len(diferentes)} rotas diferentes da API, p.ex. {diferentes[:5]}", file=sys.stderr)
+        return 1
+    print(f"✅ {len(manifest['rotas'])} rotas iguais à API em execução", file=sys.stderr)
+
+    json.dump({
+        "benchmark": "exportacao",
+        "linhas": args.linhas,
+        "dataset_version": manifest["dataset_version"],
+        "exportacao_s": round(duracao, 2),
+        "rotas": len(manifest["rotas"]),
+        "ficheiros": len(manifest["ficheiros"]),
+        "bytes": sum(info["bytes"] for info in manifest["ficheiros"].values()),
+        "comprimidos": {
+            codificacao: {"bytes_originais": antes, "bytes": depois}
+            for codificacao, (antes, depois) in comprimidos.items()
+        },
+        "codificacoes_disponiveis": list(motor.codificacoes_disponiveis()),
+    }, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+POST /facetas: compara as contagens por bitsets com groupby/cut do pandas
+sobre cópias filtradas e mede as duas.
+
+    python -m benchmarks.facetas [--linhas 200000]
+
+Termina com código 1 à primeira contagem diferente.
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import motor
+from benchmarks.sintetico import gerar_catalogo
+
+with contextlib.redirect_stdout(sys.stderr):
+    import api  # noqa: E402
+
+PEDIDOS = [
+    api.FacetasRequest(),
+    api.FacetasRequest(preco_max=30000),
+    api.FacetasRequest(tipo="SUV", combustivel="Diesel", extras=["GPS"]),
+    api.FacetasRequest(preco_max=40000, bagageira_min=400, consumo_max=7.5, tipo="Sedan", extras=["AC", "Camera"]),
+    api.FacetasRequest(preco_max=1),
+]
+
+
+def filtrar(df: pd.DataFrame, pedido, exceto: str = "") -> pd.DataFrame:
+    """Filtragem pandas (como o /recomendar antigo), sem o critério `exceto`."""
+    if pedido.preco_max and exceto != "preco":
+        df = df[df["Preco"] <= pedido.preco_max]
+    if pedido.tipo and exceto != "tipo":
+        df = df[df["Tipo"] == pedido.tipo]
+    if pedido.combustivel and exceto != "combustivel":
+        df = df[df["Combustivel"] == pedido.combustivel]
+    if pedido.bagageira_min and exceto != "bagageira":
+        df = df[df["Bagageira"] >= pedido.bagageira_min]
+    if pedido.consumo_max and exceto != "consumo":
+        df = df[df["Consumo"] <= pedido.consumo_max]
+    for extra in pedido.extras or []:
+        df = df[df[extra] == True]  # noqa: E712
+    return df
+
+
+def facetas_pandas(df: pd.DataFrame, pedido, limites) -> dict:
+    contagens = {
+        "total": len(filtrar(df, pedido)),
+        "tipos": filtrar(df, pedido, "tipo").groupby("Tipo").size().to_dict(),
+        "combustiveis": filtrar(df, pedido, "combustivel").groupby("Combustivel").size().to_dict(),
+        "extras": {e: int(filtrar(df, pedido)[e].sum()) for e in motor.indices.EXTRAS},
+        "histogramas": {},
+    }
+    for coluna, exceto in (("Preco", "preco"), ("Consumo", "consumo"), ("Bagageira", "bagageira")):
+        valores = filtrar(df, pedido, exceto)[coluna].dropna()
+        bordas = limites[coluna]
+        idx = np.clip(np.searchsorted(bordas, valores, side="right") - 1, 0, len(bordas) - 2)
+        contagens["histogramas"][coluna] = np.bincount(idx, minlength=len(bordas) - 1).tolist()
+    return contagens
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=200_000)
+    args = parser.parse_args()
+
+    df = gerar_catalogo(args.linhas, seed=5, fracao_nan=0.02)
+    catalogo = motor.Catalogo(df, "sintetico")
+    limites = {c: h[0] for c, h in catalogo.indice_facetas.histogramas.items()}
+
+    tempo_pandas = tempo_bitsets = 0.0
+    for pedido in PEDIDOS:
+        t0 = time.perf_counter()
+        esperado = facetas_pandas(df, pedido, limites)
+        t1 = time.perf_counter()
+        obtido = api.calcular_facetas(catalogo, pedido)
+        t2 = time.perf_counter()
+        tempo_pandas += t1 - t0
+        tempo_bitsets += t2 - t1
+
+        coincide = (
+            obtido["total"] == esperado["total"]
+            and {f["valor"]: f["total"] for f in obtido["tipos"] if f["total"]} == esperado["tipos"]
+            and {f["valor"]: f["total"] for f in obtido["combustiveis"] if f["total"]} == esperado["combustiveis"]
+            and {f["valor"]: f["total"] for f in obtido["extras"]} == esperado["extras"]
+            and all(
+                [f["total"] for f in obtido["histogramas"][c]] == esperado["histogramas"][c]
+                for c in esperado["histogramas"]
+            )
+        )
+        if not coincide:
+            print(f"❌ Contagens diferentes para {pedido}")
+            return 1
+
+    print(f"✅ {len(PEDIDOS)} estados de filtros com contagens iguais")
+    print(f"⏱️ {args.linhas} linhas: pandas {tempo_pandas * 1000 / len(PEDIDOS):.1f} ms | "
+          f"bitsets {tempo_bitsets * 1000 / len(PEDIDOS):.2f} ms por pedido")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Ingestão aos blocos (motor.ingerir_snapshot) contra a leitura completa.
+
+    python -m benchmarks.ingestao [--linhas 100000 1000000] [--bloco 50000]
+
+Para cada tamanho grava um CSV sintético com os cabeçalhos por extenso e
+algumas linhas inválidas e mede, num processo à parte, o pico de memória
+(ru_maxrss) e o tempo de gerar o snapshot pelo caminho antigo
+(read_csv completo + guardar_snapshot) e pela ingestão aos blocos. O pico
+da ingestão não deve crescer com o número de linhas.
+
+Verifica também que, em dados limpos (CSV e .xlsx), o snapshot ingerido
+dá o mesmo catálogo (mesma versão) que o read_csv/read_excel antigo.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import motor
+from motor.ingestao import TAMANHO_BLOCO
+from benchmarks.sintetico import gerar_catalogo
+
+PARA_EXTENSO = {canonico: alternativos[0] for canonico, alternativos in motor.SINONIMOS.items()}
+
+
+def gravar_csv(caminho: Path, n: int, bloco: int = 200_000) -> int:
+    """CSV de `n` linhas com cabeçalhos por extenso; devolve as linhas inválidas."""
+    invalidas = 0
+    for i, inicio in enumerate(range(0, n, bloco)):
+        df = gerar_catalogo(min(bloco, n - inicio), seed=i, fracao_nan=0.02).rename(columns=PARA_EXTENSO)
+        df = df.astype({"Consumo (l/100km)": object, "Preço Indicativo (€)": object})
+        # Uma linha sem marca, um consumo não numérico e um preço negativo a cada 1000
+        df.loc[df.index[::1000], "Marca"] = np.nan
+        df.loc[df.index[1::1000], "Consumo (l/100km)"] = "n.d."
+        df.loc[df.index[2::1000], "Preço Indicativo (€)"] = -1
+        invalidas += len(df.index[::1000])
+        df.to_csv(caminho, index=False, mode="w" if i == 0 else "a", header=(i == 0))
+    return invalidas
+
+
+def pico_memoria_mb() -> float:
+    """Pico de memória residente deste processo (VmHWM; não herda o do pai)."""
+    try:
+        for linha in Path("/proc/self/status").read_text().splitlines():
+            if linha.startswith("VmHWM:"):
+                return round(int(linha.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _filho(modo: str, origem: Path, destino: Path, bloco: int) -> int:
+    t0 = time.perf_counter()
+    if modo == "completo":
+        df = motor.para_canonico(pd.read_csv(origem, encoding="utf-8", delimiter=","))
+        motor.guardar_snapshot(df, destino, origem)
+        linhas = len(df)
+    else:
+        linhas = motor.ingerir_snapshot(origem, destino, bloco).linhas_aceites
+    json.dump({
+        "linhas": linhas,
+        "segundos": round(time.perf_counter() - t0, 3),
+        "pico_mb": pico_memoria_mb(),
+    }, sys.stdout)
+    return 0
+
+
+def medir(modo: str, origem: Path, destino: Path, bloco: int) -> dict:
+    saida = subprocess.run(
+        [sys.executable, "-m", "benchmarks.ingestao", "--filho", modo, str(origem), str(destino),
+         "--bloco", str(bloco)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def versao_snapshot(pasta: Path) -> str:
+    return motor.Catalogo(motor.carregar_snapshot(pasta, motor.ler_manifest(pasta)), "snapshot").versao
+
+
+def verificar_equivalencia(pasta: Path, bloco: int) -> bool:
+    """Em dados limpos, ingestão aos blocos == leitura completa antiga."""
+    df = gerar_catalogo(20_000, seed=7, fracao_nan=0.05).rename(columns=PARA_EXTENSO)
+    ok = True
+    for extensao, ler in ((".csv", pd.read_csv), (".xlsx", pd.read_excel)):
+        origem = pasta / f"limpo{extensao}"
+        if extensao == ".csv":
+            df.to_csv(origem, index=False)
+        else:
+            df.head(3000).to_excel(origem, index=False)
+
+        antiga = motor.Catalogo(motor.para_canonico(ler(origem)), "antigo").versao
+        relatorio = motor.ingerir_snapshot(origem, pasta / f"snap{extensao}", bloco)
+        ingerida = versao_snapshot(pasta / f"snap{extensao}")
+        memoria = motor.Catalogo(motor.ler_validado(origem, bloco)[0], "memoria").versao
+        igual = antiga == ingerida == memoria and relatorio.valores_corrigidos == 0
+        print(f"{'✅' if igual else '❌'} {extensao}: versão antiga {antiga}, "
+              f"snapshot {ingerida}, memória {memoria}", file=sys.stderr)
+        ok &= igual
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO)
+    parser.add_argument("--filho", nargs=3, metavar=("MODO", "ORIGEM", "DESTINO"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho:
+        modo, origem, destino = args.filho
+        return _filho(modo, Path(origem), Path(destino), args.bloco)
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp:
+        pasta = Path(tmp)
+        ok = verificar_equivalencia(pasta, args.bloco)
+
+        for n in args.linhas:
+            origem = pasta / f"feed_{n}.csv"
+            invalidas = gravar_csv(origem, n)
+            resultado = {"linhas": n, "linhas_sem_marca": invalidas,
+                         "mb_csv": round(origem.stat().st_size / 2**20, 1)}
+            for modo in ("completo", "blocos"):
+                resultado[modo] = medir(modo, origem, pasta / f"snap_{modo}_{n}", args.bloco)
+            manifest = motor.ler_manifest(pasta / f"snap_blocos_{n}")
+            resultado["problemas"] = manifest["ingestao"]["problemas"]
+            ok &= resultado["blocos"]["linhas"] == n - invalidas
+            resultados.append(resultado)
+            print(f"📊 {n} linhas: pico {resultado['completo']['pico_mb']} MB (completo) vs "
+                  f"{resultado['blocos']['pico_mb']} MB (blocos)", file=sys.stderr)
+
+    json.dump({"benchmark": "ingestao", "resultados": resultados}, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
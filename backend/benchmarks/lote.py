@@ -0,0 +1,119 @@
+"""
+POST /recomendar/batch: compara cada linha do lote com o pedido isolado
+e mede o lote contra o mesmo número de pedidos um a um.
+
+    python -m benchmarks.lote [--linhas 20000] [--pedidos 2000]
+
+Pedidos de perfil têm de ser idênticos a /recomendar (calcular_recomendacao);
+os ponderados, ao ranking de car_filter (Catalogo.ranking_ponderado), com
+scores iguais a menos do arredondamento do produto de matrizes.
+Termina com código 1 à primeira diferença.
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import orjson
+
+import motor
+from benchmarks.sintetico import COMBUSTIVEIS, EXTRAS, TIPOS, gerar_catalogo
+
+with contextlib.redirect_stdout(sys.stderr):
+    import api  # noqa: E402
+
+PERFIS_TESTE = list(motor.PERFIS) + [None, "desconhecido"]
+
+
+def pedidos_aleatorios(n: int, rng) -> list:
+    """Lote com filtros repetidos (como num lote real) e ~1/3 ponderados."""
+    filtros = [
+        {
+            "preco_max": float(rng.choice([0, 20000, 35000, 60000])),
+            "tipo": rng.choice([None] + TIPOS),
+            "combustivel": rng.choice([None] + COMBUSTIVEIS),
+            "bagageira_min": int(rng.choice([0, 300, 600])),
+            "extras": list(rng.choice(EXTRAS, int(rng.integers(0, 3)), replace=False)),
+        }
+        for _ in range(max(1, n // 20))
+    ]
+    pedidos = []
+    for i in range(n):
+        base = dict(filtros[rng.integers(len(filtros))], id=f"p{i}")
+        if rng.random() < 1 / 3:
+            pedidos.append(api.PedidoLoteRequest(
+                **base, ponderado=True,
+                perfil=rng.choice(list(motor.PESOS_PERFIS) + ["personalizado"]),
+                prioridade_consumo=float(rng.uniform(0, 3)),
+                prioridade_desempenho=float(rng.uniform(0, 3)),
+                prioridade_espaco=float(rng.uniform(0, 3)),
+            ))
+        else:
+            pedidos.append(api.PedidoLoteRequest(**base, perfil=rng.choice(PERFIS_TESTE)))
+    return pedidos
+
+
+def esperado_ponderado(catalogo, pedido, k: int) -> dict:
+    filtros, _ = api.filtros_do_pedido(pedido, catalogo.df.columns)
+    pesos = motor.pesos_perfil(
+        pedido.perfil, pedido.prioridade_consumo, pedido.prioridade_desempenho, pedido.prioridade_espaco
+    )
+    posicoes, scores, total = catalogo.ranking_ponderado(filtros, pesos, k=k)
+    return {
+        "total": total,
+        "ids": [str(catalogo.df.index[p]) for p in posicoes],
+        "scores": scores.get("score_total", np.empty(0)),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=20000)
+    parser.add_argument("--pedidos", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    catalogo = motor.Catalogo(gerar_catalogo(args.linhas, seed=7, fracao_nan=0.02), "sintetico")
+    lote = api.RecomendarLoteRequest(pedidos=pedidos_aleatorios(args.pedidos, rng), k=10)
+
+    t0 = time.perf_counter()
+    linhas = list(api.linhas_lote(catalogo, lote))
+    tempo_lote = time.perf_counter() - t0
+
+    tempo_isolados = 0.0
+    desempates = 0
+    for linha, pedido in zip(linhas, lote.pedidos):
+        obtido = orjson.loads(linha)
+        assert obtido["id"] == pedido.id
+        if pedido.ponderado:
+            t0 = time.perf_counter()
+            esperado = esperado_ponderado(catalogo, pedido, lote.k)
+            tempo_isolados += time.perf_counter() - t0
+            ids = [c["id"] for c in obtido["recomendacoes"]]
+            scores = np.array([c["score"] for c in obtido["recomendacoes"]])
+            total = obtido.get("total_encontrados", obtido.get("total"))
+            if total != esperado["total"] or not np.allclose(scores, np.round(esperado["scores"], 2), atol=0.011):
+                print(f"❌ Diferença no pedido ponderado {pedido.id}")
+                return 1
+            desempates += ids != esperado["ids"]
+        else:
+            t0 = time.perf_counter()
+            esperado = api.calcular_recomendacao(catalogo, pedido)
+            tempo_isolados += time.perf_counter() - t0
+            del obtido["indice"], obtido["id"]
+            if orjson.dumps(obtido) != orjson.dumps(esperado):
+                print(f"❌ Diferença no pedido {pedido.id} (perfil={pedido.perfil})")
+                return 1
+
+    print(f"✅ {len(linhas)} linhas iguais aos pedidos isolados "
+          f"({desempates} ponderados com empates ordenados de outra forma)")
+    print(f"⏱️ {args.pedidos} pedidos em {args.linhas} carros: "
+          f"lote {tempo_lote:.3f}s | um a um {tempo_isolados:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
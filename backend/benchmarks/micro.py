@@ -0,0 +1,120 @@
+"""
+Micro-benchmarks em processo dos caminhos quentes do backend.
+
+    python -m benchmarks.micro [--linhas 50 10000 100000 1000000] [--repeticoes 20]
+
+Para cada tamanho gera um catálogo sintético e mede, sem HTTP:
+  - api.py: recomendar (calcular_recomendacao), modelos e comparar;
+  - car_filter.py: CarroFilterAPI.recomendar_carros e _calcular_scores
+    (sobre o mesmo catálogo, com os cabeçalhos por extenso).
+Imprime os resultados em JSON.
+"""
+
+import argparse
+import contextlib
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+import motor
+from benchmarks.sintetico import gerar_catalogo
+
+# api.py e car_filter.py (este na raiz do repositório); o banner de
+# arranque de api.py vai para stderr para não misturar com o JSON
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+with contextlib.redirect_stdout(sys.stderr):
+    import api  # noqa: E402
+from car_filter import CarroFilterAPI, FiltrosRequest  # noqa: E402
+
+PARA_EXTENSO = {canonico: alternativos[0] for canonico, alternativos in motor.SINONIMOS.items()}
+
+PEDIDOS_RECOMENDAR = {
+    "sem_filtros": api.RecomendarRequest(),
+    "economico_preco": api.RecomendarRequest(preco_max=30000, perfil="economico"),
+    "familia_filtros": api.RecomendarRequest(
+        tipo="SUV", combustivel="Diesel", bagageira_min=400,
+        extras=["GPS", "Camera"], perfil="familia",
+    ),
+}
+TERMOS_MODELOS = {"vazio": "", "marca": "volks", "marca_ano": "peugeot 2020", "sem_resultados": "xyzzy"}
+PEDIDOS_CAR_FILTER = {
+    "sem_filtros": FiltrosRequest(),
+    "filtros": FiltrosRequest(preco_max=40000, tipos=["SUV", "Hatchback"],
+                              extras_obrigatorios=["Navegador"], perfil="familia"),
+    "personalizado": FiltrosRequest(perfil="personalizado", prioridade_consumo=3.0),
+}
+
+
+def medir(funcao, repeticoes: int) -> dict:
+    """Mediana, p95 e mínimo de `repeticoes` chamadas (após um aquecimento)."""
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - t0)
+    tempos.sort()
+    return {
+        "mediana_ms": round(statistics.median(tempos) * 1000, 3),
+        "p95_ms": round(tempos[min(len(tempos) - 1, int(0.95 * len(tempos)))] * 1000, 3),
+        "min_ms": round(tempos[0] * 1000, 3),
+    }
+
+
+def medir_tamanho(n: int, repeticoes: int, pasta: Path) -> dict:
+    df = gerar_catalogo(n, seed=n)
+    resultado = {"linhas": n, "casos": {}}
+    casos = resultado["casos"]
+
+    t0 = time.perf_counter()
+    catalogo = motor.Catalogo(df, "sintetico")
+    resultado["construcao_catalogo_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+    for nome, pedido in PEDIDOS_RECOMENDAR.items():
+        casos[f"recomendar/{nome}"] = medir(
+            lambda: api.calcular_recomendacao(catalogo, pedido), repeticoes)
+
+    for nome, termo in TERMOS_MODELOS.items():
+        casos[f"modelos/{nome}"] = medir(lambda: api.calcular_modelos(catalogo, termo), repeticoes)
+
+    ids = [str(i) for i in np.random.default_rng(n).integers(0, n, 3)]
+    comparar = api.CompararRequest(modelos_ids=ids)
+    casos["comparar/3_carros"] = medir(lambda: api.calcular_comparacao(catalogo, comparar), repeticoes)
+
+    csv = pasta / f"carros_{n}.csv"
+    df.rename(columns=PARA_EXTENSO).to_csv(csv, index=False)
+    t0 = time.perf_counter()
+    car_filter = CarroFilterAPI(str(csv))
+    resultado["construcao_car_filter_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+    for nome, filtros in PEDIDOS_CAR_FILTER.items():
+        casos[f"car_filter.recomendar_carros/{nome}"] = medir(
+            lambda: car_filter.recomendar_carros(filtros), repeticoes)
+    casos["car_filter._calcular_scores/catalogo"] = medir(
+        lambda: car_filter._calcular_scores(car_filter.df, FiltrosRequest()), repeticoes)
+
+    return resultado
+
+
+def executar(linhas, repeticoes: int) -> list:
+    with tempfile.TemporaryDirectory() as pasta:
+        return [medir_tamanho(n, repeticoes, Path(pasta)) for n in linhas]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[50, 10000, 100000, 1000000])
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    print(json.dumps(executar(args.linhas, args.repeticoes), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Frentes de Pareto do motor contra a definição direta (O(n²)).
+
+    python -m benchmarks.pareto [--linhas 100000 1000000] [--repeticoes 5]
+
+Primeiro compara motor.IndicePareto com uma ordenação não dominada por
+força bruta em catálogos pequenos (1 a 6 objetivos, com filtros, valores
+repetidos e em falta). Depois mede, em catálogos sintéticos grandes, a
+primeira consulta de cada conjunto de objetivos (ordena e guarda), as
+seguintes sem filtros (frentes já calculadas) e com um filtro de preço;
+acima de MAXIMO_LINHAS_MUITOS_OBJETIVOS verifica que 4+ objetivos são recusados.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+import numpy as np
+
+import motor
+from benchmarks.sintetico import gerar_catalogo
+from motor.pareto import (
+    MAXIMO_LINHAS_MUITOS_OBJETIVOS, OBJETIVOS, OBJETIVOS_PADRAO, matriz_objetivos, objetivos_canonicos,
+)
+
+
+def frentes_forca_bruta(matriz: np.ndarray, k: int):
+    """Frentes pela definição: retirar repetidamente os pontos que ninguém domina."""
+    restantes = np.arange(len(matriz))
+    frentes = []
+    while len(restantes) and len(frentes) < k:
+        pontos = matriz[restantes]
+        menor_igual = np.all(pontos[:, None, :] <= pontos[None, :, :], axis=2)
+        menor = np.any(pontos[:, None, :] < pontos[None, :, :], axis=2)
+        dominado = (menor_igual & menor).any(axis=0)
+        frentes.append(set(restantes[~dominado].tolist()))
+        restantes = restantes[dominado]
+    return frentes
+
+
+def verificar(casos: int = 300) -> bool:
+    rng = np.random.default_rng(0)
+    nomes = list(OBJETIVOS)
+    for caso in range(casos):
+        n = int(rng.integers(1, 400))
+        df = gerar_catalogo(n, seed=caso, fracao_nan=0.1 if caso % 3 == 0 else 0.0)
+        if caso % 2:
+            # Poucos valores distintos: muitos pontos repetidos e empates
+            for coluna in ("Consumo", "Potencia", "Bagageira", "Preco"):
+                df[coluna] = df[coluna] // 50 if coluna != "Consumo" else df[coluna].round(0)
+        catalogo = motor.Catalogo(df, "pareto")
+        objetivos = list(rng.choice(nomes, size=int(rng.integers(1, len(nomes) + 1)), replace=False))
+        filtros = motor.Filtros(preco_max=float(rng.integers(10, 60)) * 1000) if caso % 4 == 0 else motor.Filtros()
+        k = int(rng.integers(1, 5))
+
+        selecionados = catalogo.filtrar(filtros)
+        posicoes = selecionados.posicoes()
+        matriz = matriz_objetivos(catalogo.df, objetivos_canonicos(objetivos))[posicoes]
+        esperadas = [{int(posicoes[i]) for i in frente} for frente in frentes_forca_bruta(matriz, k)]
+
+        if caso % 5 == 0:
+            # Frentes do catálogo guardadas só até 1 e depois continuadas até k
+            catalogo.pareto(motor.Filtros(), objetivos, 1)
+        total, frentes = catalogo.pareto(filtros, objetivos, k)
+        obtidas = [set(frente.tolist()) for frente in frentes]
+        if total != len(posicoes) or obtidas != esperadas:
+            print(f"❌ caso {caso}: n={n} objetivos={objetivos} k={k}", file=sys.stderr)
+            return False
+    print(f"✅ {casos} casos iguais à força bruta", file=sys.stderr)
+    return True
+
+
+def _medir(funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - t0)
+    return round(statistics.median(tempos) * 1000, 2)
+
+
+def medir(n: int, repeticoes: int) -> dict:
+    catalogo = motor.Catalogo(gerar_catalogo(n, seed=n), "pareto")
+    resultado = {"linhas": n, "objetivos": {}}
+    conjuntos = [
+        ("consumo", "potencia"),
+        OBJETIVOS_PADRAO,
+        ("consumo", "potencia", "bagageira", "preco"),
+        tuple(OBJETIVOS),
+    ]
+    filtro = motor.Filtros(preco_max=20000)
+    for objetivos in conjuntos:
+        if len(objetivos) > 3 and n > MAXIMO_LINHAS_MUITOS_OBJETIVOS:
+            # A API recusa (400); sem filtros nenhuma frente é calculada
+            try:
+                catalogo.pareto(motor.Filtros(), objetivos, 3)
+                recusado = False
+            except ValueError:
+                recusado = True
+            resultado["objetivos"]["+".join(objetivos)] = {"recusado": recusado}
+            continue
+        t0 = time.perf_counter()
+        _, frentes = catalogo.pareto(motor.Filtros(), objetivos, 3)
+        primeira = round((time.perf_counter() - t0) * 1000, 2)
+        resultado["objetivos"]["+".join(objetivos)] = {
+            "primeira_ms": primeira,
+            "sem_filtros_ms": _medir(lambda: catalogo.pareto(motor.Filtros(), objetivos, 3), repeticoes),
+            "preco_max_20000_ms": _medir(lambda: catalogo.pareto(filtro, objetivos, 3), repeticoes),
+            "tamanho_frentes": [len(f) for f in frentes],
+        }
+    return resultado
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    ok = verificar()
+    resultados = [medir(n, args.repeticoes) for n in args.linhas]
+    json.dump({"benchmark": "pareto", "resultados": resultados}, sys.stdout, indent=2)
+    print()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
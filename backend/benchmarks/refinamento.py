@@ -0,0 +1,100 @@
+"""
+Sessões de sliders: Catalogo.refinar (candidatos do estado anterior)
+contra Catalogo.recomendar (bitsets do catálogo inteiro a cada pedido).
+
+    python -m benchmarks.refinamento [--linhas 100000 1000000] [--sessoes 20]
+
+Cada sessão parte de um tipo ou combustível e vai apertando os filtros
+um passo de cada vez (preço máximo, bagageira mínima, consumo, mais um
+extra), com um alargamento pelo meio, como o frontend ao arrastar os
+sliders. Em cada passo os dois caminhos têm de dar o mesmo total e os
+mesmos carros; mede-se a mediana por passo e quantos foram incrementais.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+import numpy as np
+
+import motor
+from benchmarks.sintetico import COMBUSTIVEIS, EXTRAS, TIPOS, gerar_catalogo
+
+PERFIS_SESSAO = ("economico", "familia", "desportivo", None)
+
+
+def sessao(rng):
+    """Estados de filtros sucessivos de uma sessão."""
+    criterios = {"preco_max": 80000.0}
+    if rng.random() < 0.5:
+        criterios["tipos"] = (str(rng.choice(TIPOS)),)
+    else:
+        criterios["combustiveis"] = (str(rng.choice(COMBUSTIVEIS)),)
+    yield motor.Filtros(**criterios)
+    for passo in range(8):
+        escolha = rng.integers(0, 4)
+        if passo == 5:
+            # O utilizador volta atrás num slider: não é refinamento
+            criterios["preco_max"] = criterios["preco_max"] + 15000
+        elif escolha == 0:
+            criterios["preco_max"] = criterios["preco_max"] - 5000
+        elif escolha == 1:
+            criterios["bagageira_min"] = criterios.get("bagageira_min", 200) + 100
+        elif escolha == 2:
+            criterios["consumo_max"] = criterios.get("consumo_max", 12.0) - 1.0
+        else:
+            criterios["extras"] = tuple(sorted(set(criterios.get("extras", ())) | {str(rng.choice(EXTRAS))}))
+        yield motor.Filtros(**criterios)
+
+
+def medir(n: int, sessoes: int) -> dict:
+    catalogo = motor.Catalogo(gerar_catalogo(n, seed=n), "refinamento")
+    rng = np.random.default_rng(0)
+    tempos = {"recomendar": [], "refinar": [], "refinar_incremental": []}
+    incrementais = passos = 0
+    for _ in range(sessoes):
+        perfil = PERFIS_SESSAO[int(rng.integers(0, len(PERFIS_SESSAO)))]
+        for filtros in sessao(rng):
+            t0 = time.perf_counter()
+            esperado = catalogo.recomendar(filtros, perfil, k=10)
+            t1 = time.perf_counter()
+            total, carros, incremental = catalogo.refinar(filtros, perfil, k=10)
+            t2 = time.perf_counter()
+            if (total, carros) != esperado:
+                print(f"❌ {n} linhas: {filtros} ({perfil}) difere de recomendar()", file=sys.stderr)
+                raise SystemExit(1)
+            tempos["recomendar"].append(t1 - t0)
+            tempos["refinar"].append(t2 - t1)
+            if incremental:
+                tempos["refinar_incremental"].append(t2 - t1)
+            incrementais += incremental
+            passos += 1
+    return {
+        "linhas": n,
+        "passos": passos,
+        "incrementais": incrementais,
+        "mediana_ms": {
+            nome: round(statistics.median(valores) * 1000, 3) for nome, valores in tempos.items() if valores
+        },
+        "estados_guardados": len(catalogo.refinamento),
+        "bytes_guardados": catalogo.refinamento.tamanho_bytes,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--sessoes", type=int, default=20)
+    args = parser.parse_args()
+
+    resultados = [medir(n, args.sessoes) for n in args.linhas]
+    print(f"✅ refinar() igual a recomendar() em {sum(r['passos'] for r in resultados)} passos", file=sys.stderr)
+    json.dump({"benchmark": "refinamento", "resultados": resultados}, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
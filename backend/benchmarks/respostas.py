@@ -0,0 +1,133 @@
+"""
+Bytes e tempo de codificação das respostas, antes e depois de fields=,
+orjson e compressão.
+
+    python -m benchmarks.respostas [--linhas 20000] [--repeticoes 50]
+
+Para cada endpoint compara:
+
+- antes: todos os campos, jsonable_encoder + json da biblioteca padrão
+  (o caminho do JSONResponse do FastAPI), sem compressão;
+- depois: os campos por omissão (fields=), orjson e, acima de
+  COMPRESSAO_MINIMO bytes, gzip ou brotli.
+
+As funções calcular_* de api.py correm sobre um catálogo sintético, sem
+HTTP; os tempos são medianas só da codificação (e da compressão).
+"""
+
+import argparse
+import contextlib
+import gzip
+import json
+import statistics
+import sys
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+import motor
+from benchmarks.sintetico import gerar_catalogo
+
+
+def _mediana_ms(funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - t0)
+    return round(statistics.median(tempos) * 1000, 3)
+
+
+def codificar_antes(conteudo) -> bytes:
+    """O que JSONResponse.render fazia ao dict devolvido pelo endpoint."""
+    return json.dumps(
+        jsonable_encoder(conteudo), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def casos(api, catalogo):
+    """(endpoint, conteúdo com todos os campos, conteúdo com os campos por omissão)."""
+    def objeto(corpo):
+        return orjson.loads(api._serializar(catalogo, corpo))
+
+    recomendar = api.RecomendarRequest(preco_max=40000, perfil="familia")
+    yield ("POST /recomendar",
+           objeto(api.calcular_recomendacao(catalogo, recomendar, None)),
+           objeto(api.calcular_recomendacao(catalogo, recomendar)))
+    yield ("POST /recomendar?limit=100",
+           objeto(api.pagina_recomendacao(catalogo, recomendar, 100, None, None)),
+           objeto(api.pagina_recomendacao(catalogo, recomendar, 100, None)))
+    yield ("GET /modelos?q=golf",
+           objeto(api.calcular_modelos(catalogo, "golf", None)),
+           objeto(api.calcular_modelos(catalogo, "golf", api.CAMPOS_MODELOS)))
+    comparar = api.CompararRequest(modelos_ids=["1", "2", "3"])
+    yield ("POST /comparar",
+           objeto(api.calcular_comparacao(catalogo, comparar)),
+           objeto(api.calcular_comparacao(catalogo, comparar)))
+    yield ("GET /carro/1/similares",
+           objeto(api.calcular_similares(catalogo, "1", 10)),
+           objeto(api.calcular_similares(catalogo, "1", 10)))
+    pareto = api.ParetoRequest()
+    yield ("POST /recomendar/pareto",
+           objeto(api.calcular_pareto(catalogo, pareto)),
+           objeto(api.calcular_pareto(catalogo, pareto)))
+    debug = api.calcular_debug(catalogo)
+    yield ("GET /debug/dados", debug, debug)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=20_000)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    # api.py imprime o arranque; o stdout fica só para o JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        import api
+    catalogo = motor.Catalogo(gerar_catalogo(args.linhas, seed=1), "respostas")
+    # /debug/dados mostra a duração do carregamento, aqui sem estado carregado
+    api.estado.duracao = catalogo.tempo_indices
+
+    resultados = []
+    for endpoint, completo, omissao in casos(api, catalogo):
+        antes = codificar_antes(completo)
+        depois = orjson.dumps(omissao, option=orjson.OPT_SERIALIZE_NUMPY)
+        resultado = {
+            "endpoint": endpoint,
+            "antes": {
+                "bytes": len(antes),
+                "codificacao_ms": _mediana_ms(lambda: codificar_antes(completo), args.repeticoes),
+            },
+            "depois": {
+                "bytes": len(depois),
+                "codificacao_ms": _mediana_ms(
+                    lambda: orjson.dumps(omissao, option=orjson.OPT_SERIALIZE_NUMPY), args.repeticoes
+                ),
+            },
+        }
+        for codificacao in motor.codificacoes_disponiveis():
+            if motor.escolher_codificacao(codificacao, len(depois)) is None:
+                continue
+            comprimido = motor.comprimir(depois, codificacao)
+            if codificacao == "gzip":
+                assert gzip.decompress(comprimido) == depois
+            resultado["depois"][codificacao] = {
+                "bytes": len(comprimido),
+                "compressao_ms": _mediana_ms(lambda: motor.comprimir(depois, codificacao), args.repeticoes),
+            }
+        resultados.append(resultado)
+
+        melhor = min([resultado["depois"]["bytes"]] + [
+            v["bytes"] for v in resultado["depois"].values() if isinstance(v, dict)
+        ])
+        print(f"📦 {endpoint}: {len(antes)} -> {melhor} bytes", file=sys.stderr)
+
+    json.dump({"benchmark": "respostas", "linhas": args.linhas, "resultados": resultados},
+              sys.stdout, indent=2, ensure_ascii=False)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
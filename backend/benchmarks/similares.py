@@ -0,0 +1,65 @@
+"""
+GET /carro/{id}/similares: compara com uma pesquisa exaustiva em float64
+e mede a latência de calcular_similares (sem cache).
+
+    python -m benchmarks.similares [--linhas 100000] [--consultas 1000] [--k 10]
+
+Termina com código 1 se algum vizinho estiver mais longe do que o
+k-ésimo da pesquisa exaustiva (a menos do arredondamento float32).
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+
+import numpy as np
+
+import motor
+from benchmarks.sintetico import gerar_catalogo
+
+with contextlib.redirect_stdout(sys.stderr):
+    import api  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=100_000)
+    parser.add_argument("--consultas", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    catalogo = motor.Catalogo(gerar_catalogo(args.linhas, seed=11, fracao_nan=0.02), "sintetico")
+    indice = catalogo.indice_similares
+    matriz = indice.matriz.astype(np.float64)
+    rng = np.random.default_rng(0)
+    consultas = rng.integers(0, len(catalogo), args.consultas)
+
+    for pos in consultas[:100]:
+        exatas = np.sqrt(((matriz - matriz[pos]) ** 2).sum(axis=1))
+        exatas[pos] = np.inf
+        limite = np.sort(exatas)[args.k - 1]
+        vizinhos, distancias = indice.vizinhos(int(pos), args.k)
+        if pos in vizinhos or (exatas[vizinhos] > limite + 1e-4).any():
+            print(f"❌ Vizinhos errados para a linha {pos}")
+            return 1
+
+    tempos = []
+    for pos in consultas:
+        t0 = time.perf_counter()
+        api.calcular_similares(catalogo, str(pos), args.k)
+        tempos.append(time.perf_counter() - t0)
+    tempos.sort()
+
+    t0 = time.perf_counter()
+    indice.vizinhos_lote(consultas[:100], args.k)
+    lote = (time.perf_counter() - t0) / 100
+
+    print(f"✅ Vizinhos iguais à pesquisa exaustiva ({indice.matriz.shape[1]} dimensões)")
+    print(f"⏱️ {args.linhas} linhas, k={args.k}: p50 {tempos[len(tempos) // 2] * 1000:.2f} ms | "
+          f"p99 {tempos[int(len(tempos) * 0.99)] * 1000:.2f} ms | em lote {lote * 1000:.2f} ms/consulta")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
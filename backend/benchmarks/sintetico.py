@@ -0,0 +1,55 @@
+"""
+Catálogos sintéticos com as mesmas colunas dos dados de exemplo de api.py.
+"""
+
+import numpy as np
+import pandas as pd
+
+MARCAS = {
+    "Volkswagen": ["Golf", "Polo", "T-Roc", "Passat", "Tiguan"],
+    "Renault": ["Clio", "Captur", "Megane", "Arkana"],
+    "Peugeot": ["208", "2008", "308", "3008", "508"],
+    "BMW": ["Serie 1", "Serie 3", "X1", "X3"],
+    "Mercedes": ["Classe A", "Classe C", "GLA", "GLC"],
+    "Toyota": ["Yaris", "Corolla", "C-HR", "RAV4"],
+    "Škoda": ["Fabia", "Octavia", "Kamiq", "Kodiaq"],
+    "Citroën": ["C3", "C4", "C5 Aircross"],
+}
+TIPOS = ["Hatchback", "Sedan", "SUV", "Carrinha", "Compacto", "Monovolume"]
+COMBUSTIVEIS = ["Gasolina", "Diesel", "Híbrido", "Elétrico", "GPL"]
+EXTRAS = ["Airbag", "AC", "Camera", "GPS", "ABS", "ESP", "Sensor"]
+
+
+def gerar_catalogo(n: int, seed: int = 0, fracao_nan: float = 0.0) -> pd.DataFrame:
+    """Gera `n` carros aleatórios (reprodutíveis por `seed`)."""
+    rng = np.random.default_rng(seed)
+    marcas = np.array(list(MARCAS))
+    marca = marcas[rng.integers(0, len(marcas), n)]
+    modelo = np.array([
+        MARCAS[m][i % len(MARCAS[m])]
+        for m, i in zip(marca, rng.integers(0, 5, n))
+    ])
+
+    data = {
+        "Marca": marca,
+        "Modelo": modelo,
+        "Ano": rng.integers(2015, 2025, n),
+        "Tipo": np.array(TIPOS)[rng.integers(0, len(TIPOS), n)],
+        "Motor": np.array(["1.0 TSI", "1.5 dCi", "2.0 Diesel", "1.2 PureTech", "Elétrico"])[rng.integers(0, 5, n)],
+        "Potencia": rng.integers(60, 400, n),
+        "Consumo": np.round(rng.uniform(3.0, 12.0, n), 1),
+        "0-100": np.round(rng.uniform(4.0, 16.0, n), 1),
+        "Velocidade": rng.integers(150, 300, n),
+        "Bagageira": rng.integers(200, 1200, n),
+        "Combustivel": np.array(COMBUSTIVEIS)[rng.integers(0, len(COMBUSTIVEIS), n)],
+        "Preco": rng.integers(12, 120, n) * 500,
+    }
+    for extra in EXTRAS:
+        data[extra] = rng.random(n) < 0.7
+
+    df = pd.DataFrame(data)
+    if fracao_nan > 0:
+        for col in ["Potencia", "Consumo", "0-100", "Velocidade", "Bagageira", "Preco"]:
+            df[col] = df[col].astype(float)
+            df.loc[rng.random(n) < fracao_nan, col] = np.nan
+    return df
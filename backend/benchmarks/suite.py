@@ -0,0 +1,111 @@
+"""
+Suite de benchmarks com deteção de regressões.
+
+    python -m benchmarks.suite [--linhas 50 10000 100000 1000000]
+                               [--linhas-http 10000 100000] [--sem-http]
+                               [--saida resultados.json]
+                               [--referencia anterior.json] [--tolerancia 0.25]
+
+Junta os micro-benchmarks em processo (benchmarks.micro) e o teste de
+carga HTTP contra um uvicorn local (benchmarks.carga_http) num único
+JSON, com a versão do código (git) e do Python.
+
+Com --referencia, compara com um JSON anterior da suite: um caso cuja
+mediana (micro) ou p50 (HTTP) piore mais do que a tolerância, ou um
+débito HTTP que caia mais do que ela, é reportado como regressão e o
+comando termina com código 1.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks import carga_http, micro
+
+
+def _versao_git() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecida"
+
+
+def metricas(resultados: dict) -> dict:
+    """Métricas comparáveis: nome -> (valor, True se maior é melhor)."""
+    valores = {}
+    for tamanho in resultados.get("micro", []):
+        for caso, medida in tamanho["casos"].items():
+            valores[f"micro/{tamanho['linhas']}/{caso}"] = (medida["mediana_ms"], False)
+    for carga in resultados.get("http", []):
+        if "erro" in carga:
+            continue
+        prefixo = f"http/{carga['linhas']}"
+        valores[f"{prefixo}/pedidos_por_s"] = (carga["pedidos_por_s"], True)
+        for tipo, medida in carga["por_tipo"].items():
+            if medida:
+                valores[f"{prefixo}/{tipo}/p50_ms"] = (medida["p50_ms"], False)
+    return valores
+
+
+def regressoes(atual: dict, referencia: dict, tolerancia: float) -> list:
+    """Métricas presentes nos dois resultados que pioraram mais do que `tolerancia`."""
+    antes = metricas(referencia)
+    piores = []
+    for nome, (valor, maior_melhor) in metricas(atual).items():
+        if nome not in antes or antes[nome][0] <= 0:
+            continue
+        variacao = (valor - antes[nome][0]) / antes[nome][0]
+        if (-variacao if maior_melhor else variacao) > tolerancia:
+            piores.append({"metrica": nome, "antes": antes[nome][0], "agora": valor,
+                           "variacao": round(variacao, 3)})
+    return piores
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[50, 10000, 100000, 1000000])
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--linhas-http", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--clientes", type=int, default=8)
+    parser.add_argument("--duracao", type=float, default=10)
+    parser.add_argument("--porta", type=int, default=8767)
+    parser.add_argument("--sem-http", action="store_true")
+    parser.add_argument("--saida", type=Path)
+    parser.add_argument("--referencia", type=Path)
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    args = parser.parse_args()
+
+    resultados = {
+        "versao": _versao_git(),
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "micro": micro.executar(args.linhas, args.repeticoes),
+    }
+    if not args.sem_http:
+        resultados["http"] = [
+            carga_http.medir_uvicorn(n, args.clientes, args.duracao, args.porta)
+            for n in args.linhas_http
+        ]
+
+    codigo = 0
+    if args.referencia:
+        referencia = json.loads(args.referencia.read_text(encoding="utf-8"))
+        resultados["referencia"] = referencia.get("versao")
+        resultados["regressoes"] = regressoes(resultados, referencia, args.tolerancia)
+        codigo = 1 if resultados["regressoes"] else 0
+
+    texto = json.dumps(resultados, ensure_ascii=False, indent=2)
+    if args.saida:
+        args.saida.write_text(texto, encoding="utf-8")
+    print(texto)
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
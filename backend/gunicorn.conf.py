@@ -0,0 +1,45 @@
+"""
+Configuração do gunicorn para produção (executar a partir de backend/):
+
+    gunicorn api:app -c gunicorn.conf.py
+
+Arranca WEB_CONCURRENCY workers uvicorn (por omissão, um por CPU, até
+4, para caber na memória dos planos pequenos do Render). A app
+é importada e o catálogo carregado uma única vez no processo pai, antes
+do fork: as colunas abertas com mmap a partir do snapshot e os arrays
+numpy derivados ficam em páginas partilhadas (copy-on-write, nunca
+escritas), pelo que a memória quase não cresce com o número de workers.
+
+Alternativa sem gunicorn: `uvicorn api:app --workers N`. Aí cada worker
+carrega o seu catálogo; só as colunas do snapshot (mmap) são partilhadas.
+"""
+
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", min(os.cpu_count() or 1, 4)))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Importar api.py no pai, para que o catálogo seja herdado pelos workers
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = 5
+
+
+def on_starting(server):
+    """Carrega o catálogo no processo pai, antes de criar os workers."""
+    import api
+
+    try:
+        catalogo = api.estado.obter()
+        server.log.info("Catálogo partilhado pelos workers: %d registros", len(catalogo))
+    except api.motor.CatalogoIndisponivel as e:
+        # Sem isto os workers herdavam o erro (e respondiam 503 até uma
+        # recarga): cada um volta a tentar carregar o seu catálogo
+        server.log.error("Catálogo indisponível antes do fork, cada worker carrega o seu: %s", e)
+        api.estado.descartar()
+
+    # Objetos já carregados deixam de ser percorridos pelo GC dos workers,
+    # que assim não sujam (e copiam) as páginas herdadas
+    gc.freeze()
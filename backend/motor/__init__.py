@@ -0,0 +1,113 @@
+"""
+Motor de recomendação Carros Portugal.
+
+Estruturas pré-calculadas no carregamento do catálogo e usadas pelos
+endpoints de backend/api.py no caminho quente.
+
+Os nomes públicos são importados do submódulo só no primeiro acesso
+(`motor.Catalogo`, ...), para que `import motor` não carregue pandas e
+numpy enquanto a API ainda está a arrancar.
+"""
+
+import importlib
+
+_EXPORTACOES = {
+    "scoring": [
+        "PERFIS",
+        "preparar_colunas",
+        "calcular_scores",
+        "arredondar_scores",
+        "top_k",
+        "registo_nativo",
+        "recomendar_top",
+        "registos_recomendados",
+        "PESOS_PERFIS",
+        "pesos_perfil",
+        "preparar_colunas_minmax",
+        "scores_ponderados",
+        "ordenar_por_score",
+        "componentes_minmax",
+        "pesos_componentes",
+    ],
+    "colunas": ["SINONIMOS", "nome_canonico", "para_canonico"],
+    "filtros": ["Filtros"],
+    "compacto": ["compactar", "bytes_dataframe"],
+    "indices": ["Bitset", "IndiceFiltros"],
+    "facetas": ["IndiceFacetas", "limites_histograma"],
+    "pesquisa": ["IndicePesquisa", "normalizar_texto"],
+    "similares": ["IndiceSimilares", "COLUNAS_SIMILARES"],
+    "pareto": [
+        "IndicePareto",
+        "OBJETIVOS",
+        "OBJETIVOS_PADRAO",
+        "MAXIMO_FRENTES",
+        "MAXIMO_LINHAS_MUITOS_OBJETIVOS",
+        "objetivos_canonicos",
+        "nao_dominados",
+        "numerar_frentes",
+    ],
+    "custo": [
+        "IndiceCusto",
+        "CenariosCusto",
+        "ResultadoCusto",
+        "PRECOS_COMBUSTIVEL",
+        "PERCENTIS",
+        "MAXIMO_CENARIOS",
+    ],
+    "carregamento": [
+        "procurar_ficheiros_dados",
+        "ler_ficheiro_dados",
+        "carregar_primeiro",
+        "dados_exemplo",
+    ],
+    "ingestao": [
+        "ESQUEMA",
+        "Campo",
+        "ErroEsquema",
+        "RelatorioIngestao",
+        "abrir_fonte",
+        "ler_validado",
+        "ingerir_snapshot",
+    ],
+    "snapshot": [
+        "MANIFEST",
+        "guardar_snapshot",
+        "ler_manifest",
+        "origem_atualizada",
+        "carregar_snapshot",
+    ],
+    "serializacao": ["CarrosJSON", "serializar_linhas", "projetar"],
+    "compressao": ["COMPRESSAO_MINIMO", "escolher_codificacao", "comprimir", "codificacoes_disponiveis"],
+    "exportacao": ["exportar"],
+    "catalogo": ["Catalogo", "carregar_catalogo"],
+    "cache": ["CacheRespostas", "canonicalizar"],
+    "estado": ["EstadoCatalogo", "CatalogoIndisponivel", "VigiaFicheiros"],
+    "metricas": [
+        "Cronometro",
+        "RegistoMetricas",
+        "ativar_cronometro",
+        "desativar_cronometro",
+        "cronometro_atual",
+        "descrever_etapa",
+        "etapa",
+    ],
+    "perfil": ["AmostradorPerfil"],
+    "executor": ["ExecutorLimitado", "Sobrecarregado"],
+    "paginacao": ["ordem_completa", "codificar_cursor", "ler_cursor"],
+    "rankings": ["RankingPerfil", "RankingsPerfis"],
+    "refinamento": ["CacheRefinamento", "Candidatos"],
+    "lote": ["PedidoLote", "ResultadoLote", "recomendar_lote", "recomendacoes_json"],
+}
+
+_MODULO_DE = {nome: modulo for modulo, nomes in _EXPORTACOES.items() for nome in nomes}
+
+__all__ = list(_MODULO_DE)
+
+
+def __getattr__(nome):
+    modulo = _MODULO_DE.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module 'motor' has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f".{modulo}", __name__), nome)
+    globals()[nome] = valor
+    return valor
@@ -0,0 +1,88 @@
+"""
+Comandos de linha do motor (executar a partir de backend/):
+
+    python -m motor snapshot ["Carros pt 50.xlsx"] [--destino snapshot] [--bloco 50000]
+    python -m motor exportar [--destino estatico] [--prefixos 3]
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from .carregamento import procurar_ficheiros_dados
+from .catalogo import carregar_catalogo
+from .exportacao import PASTA_PADRAO as PASTA_ESTATICO, exportar
+from .ingestao import FORMATOS, PROBLEMAS, TAMANHO_BLOCO, ingerir_snapshot
+from .snapshot import PASTA_PADRAO
+
+
+def comando_snapshot(args) -> int:
+    """Gera o snapshot binário a partir do CSV/Excel, lido aos blocos."""
+    candidatos = [args.ficheiro] if args.ficheiro else procurar_ficheiros_dados(PASTA_PADRAO.parent)
+    for origem in candidatos:
+        if not str(origem).lower().endswith(FORMATOS):
+            continue
+        try:
+            print(f"\n📖 A ingerir: {origem}")
+            relatorio = ingerir_snapshot(origem, args.destino, args.bloco)
+        except Exception as e:
+            print(f"❌ Erro ao ingerir {origem}: {str(e)[:100]}...")
+            continue
+
+        relatorio.imprimir()
+        if relatorio.linhas_aceites == 0:
+            print(f"⚠️ Arquivo vazio: {origem}")
+            continue
+        print(f"💾 Snapshot de {relatorio.linhas_aceites} registros escrito em {args.destino}")
+        if relatorio.problemas:
+            print(f"📝 Problemas linha a linha em {args.destino / PROBLEMAS}")
+        return 0
+
+    print("❌ Nenhum ficheiro de dados válido para gerar o snapshot")
+    return 1
+
+
+def comando_exportar(args) -> int:
+    """Escreve as respostas sem filtros da API em ficheiros estáticos, com manifest."""
+    # api.py (em backend/) gera os corpos com as funções dos próprios endpoints
+    with contextlib.redirect_stdout(sys.stderr):
+        import api
+    catalogo = carregar_catalogo(api.DATA_DIR, api.SNAPSHOT_DIR)
+
+    inicio = time.perf_counter()
+    manifest = exportar(api.paginas_estaticas(catalogo, args.prefixos), args.destino, catalogo.versao)
+    total = sum(info["bytes"] for info in manifest["ficheiros"].values())
+    comprimidos = sum(1 for info in manifest["ficheiros"].values() if info.get("codificacoes"))
+    print(f"📦 {len(manifest['rotas'])} rotas em {len(manifest['ficheiros'])} ficheiros "
+          f"({total / 2**20:.1f} MB, {comprimidos} com .br/.gz) em {time.perf_counter() - inicio:.1f}s")
+    print(f"💾 Exportação {catalogo.versao} escrita em {args.destino}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m motor")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    snapshot = comandos.add_parser("snapshot", help="gera o snapshot binário do catálogo")
+    snapshot.add_argument("ficheiro", nargs="?", type=Path,
+                          help="CSV/Excel de origem (por omissão, o que a API carregaria)")
+    snapshot.add_argument("--destino", type=Path, default=PASTA_PADRAO)
+    snapshot.add_argument("--bloco", type=int, default=TAMANHO_BLOCO,
+                          help="linhas lidas e validadas de cada vez")
+    snapshot.set_defaults(executar=comando_snapshot)
+
+    exportacao = comandos.add_parser("exportar", help="exporta as respostas sem filtros para servir de um CDN")
+    exportacao.add_argument("--destino", type=Path, default=PASTA_ESTATICO)
+    exportacao.add_argument("--prefixos", type=int, default=3,
+                            help="comprimento máximo dos prefixos de /modelos?q= exportados")
+    exportacao.set_defaults(executar=comando_exportar)
+
+    args = parser.parse_args(argv)
+    return args.executar(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
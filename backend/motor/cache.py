@@ -0,0 +1,73 @@
+"""
+Cache de respostas em memória (LRU limitado + TTL).
+
+As chaves incluem a versão do catálogo (hash do conteúdo), pelo que um
+catálogo novo nunca reaproveita respostas do anterior.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+def canonicalizar(parametros: Dict[str, Any]) -> str:
+    """
+    Forma canónica de um pedido, para usar como chave de cache.
+
+    Parâmetros ausentes (None, texto só com espaços, listas/dicts vazios)
+    são descartados e as chaves ordenadas, pelo que `{"tipo": "SUV",
+    "extras": []}` e `{"tipo": "SUV"}` coincidem. Números e booleanos
+    ficam sempre, mesmo 0 ou negativos: `{"semente": -1}` não pode
+    partilhar a resposta de `{"semente": 0}`.
+    """
+    efetivos = {}
+    for nome, valor in parametros.items():
+        if valor is None:
+            continue
+        if isinstance(valor, str) and not valor.strip():
+            continue
+        if isinstance(valor, (list, tuple, dict)) and not valor:
+            continue
+        efetivos[nome] = valor
+    return json.dumps(efetivos, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+class CacheRespostas:
+    """LRU thread-safe com expiração por entrada."""
+
+    def __init__(self, maximo: int = 1024, ttl: float = 300):
+        self.maximo = maximo
+        self.ttl = ttl
+        self._entradas: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave: Hashable) -> Optional[Any]:
+        agora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None or entrada[0] < agora:
+                if entrada is not None:
+                    del self._entradas[chave]
+                self.falhas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return entrada[1]
+
+    def guardar(self, chave: Hashable, valor: Any) -> None:
+        with self._lock:
+            self._entradas[chave] = (time.monotonic() + self.ttl, valor)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.maximo:
+                self._entradas.popitem(last=False)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
@@ -0,0 +1,99 @@
+"""
+Localização e leitura dos ficheiros de dados do catálogo.
+"""
+
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from .ingestao import FORMATOS, ler_validado
+
+NOMES_POSSIVEIS = [
+    "carros_pt_50.csv", "carros_pt_50.xlsx", "Carros pt 50.xlsx",
+    "carros.csv", "dados.csv", "data.csv", "carros.xlsx"
+]
+
+
+def procurar_ficheiros_dados(diretorio: Path) -> List[Path]:
+    """Ficheiros de dados candidatos, por ordem de preferência."""
+    data_files = []
+
+    for name in NOMES_POSSIVEIS:
+        # Verificar no diretório atual
+        file_path = diretorio / name
+        if file_path.exists():
+            data_files.append(file_path)
+
+        # Verificar no diretório pai
+        parent_file = diretorio.parent / name
+        if parent_file.exists():
+            data_files.append(parent_file)
+
+    # Também procurar por extensão
+    for ext in ['.csv', '.xlsx', '.xls']:
+        for file in sorted(diretorio.glob(f'*{ext}')):
+            if file not in data_files:
+                data_files.append(file)
+
+    return data_files
+
+
+def ler_ficheiro_dados(data_file: Path) -> Optional[pd.DataFrame]:
+    """
+    Lê um CSV/Excel validado contra o esquema (colunas com os nomes do
+    motor); devolve None se a extensão não for suportada.
+    """
+    if not str(data_file).lower().endswith(FORMATOS):
+        return None
+    return ler_validado(Path(data_file))[0]
+
+
+def carregar_primeiro(data_files: List[Path]) -> Tuple[Optional[pd.DataFrame], Optional[Path]]:
+    """Carrega o primeiro ficheiro válido e não vazio da lista."""
+    for data_file in data_files:
+        try:
+            print(f"\n📖 Tentando carregar: {data_file}")
+            if not str(data_file).lower().endswith(FORMATOS):
+                continue
+            df, relatorio = ler_validado(Path(data_file))
+            relatorio.imprimir()
+
+            # Verificar se tem dados
+            if len(df) > 0:
+                print(f"✅ SUCESSO! Carregados {len(df)} registros")
+                print(f"📊 Colunas disponíveis: {df.columns.tolist()}")
+                return df, data_file
+            print(f"⚠️ Arquivo vazio: {data_file}")
+
+        except Exception as e:
+            print(f"❌ Erro ao carregar {data_file}: {str(e)[:100]}...")
+            continue
+
+    return None, None
+
+
+def dados_exemplo() -> pd.DataFrame:
+    """Catálogo de exemplo usado quando não há ficheiro de dados válido."""
+    data = {
+        'Marca': ['Volkswagen', 'Renault', 'Peugeot', 'BMW', 'Mercedes'],
+        'Modelo': ['Golf', 'Clio', '208', 'Serie 3', 'Classe A'],
+        'Ano': [2023, 2023, 2023, 2023, 2023],
+        'Tipo': ['Hatchback', 'Hatchback', 'Hatchback', 'Sedan', 'Hatchback'],
+        'Motor': ['1.0 TSI', '1.0 TCe', '1.2 PureTech', '2.0 Diesel', '1.3'],
+        'Potencia': [110, 100, 100, 190, 136],
+        'Consumo': [5.2, 5.0, 4.8, 4.5, 5.5],
+        '0-100': [9.9, 11.0, 10.5, 7.5, 9.0],
+        'Velocidade': [210, 195, 190, 240, 220],
+        'Bagageira': [380, 300, 311, 480, 370],
+        'Combustivel': ['Gasolina', 'Gasolina', 'Gasolina', 'Diesel', 'Gasolina'],
+        'Preco': [28500, 19500, 21200, 45000, 35500],
+        'Airbag': [True, True, True, True, True],
+        'AC': [True, True, True, True, True],
+        'Camera': [True, False, False, True, True],
+        'GPS': [True, False, True, True, True],
+        'ABS': [True, True, True, True, True],
+        'ESP': [True, True, True, True, True],
+        'Sensor': [True, False, False, True, True]
+    }
+    return pd.DataFrame(data)
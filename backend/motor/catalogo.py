@@ -0,0 +1,350 @@
+"""
+Catálogo carregado com todas as estruturas derivadas.
+
+Um Catalogo é construído uma vez (snapshot ou folha de cálculo) e não
+é alterado depois; os endpoints só o leem. É também a API Python do
+motor, usada sem HTTP por car_filter.py:
+
+    catalogo = Catalogo.de_ficheiro("carros.csv")
+    total, carros = catalogo.recomendar(Filtros(preco_max=30000), "economico")
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .carregamento import (
+    carregar_primeiro, dados_exemplo, ler_ficheiro_dados, procurar_ficheiros_dados,
+)
+from .colunas import para_canonico
+from .compacto import bytes_arrays, bytes_dataframe, compactar
+from .custo import CenariosCusto, IndiceCusto, ResultadoCusto
+from .facetas import IndiceFacetas
+from .filtros import Filtros
+from .indices import Bitset, IndiceFiltros
+from .metricas import etapa
+from .pareto import MAXIMO_LINHAS_MUITOS_OBJETIVOS, IndicePareto, objetivos_canonicos
+from .rankings import RankingsPerfis
+from .refinamento import CacheRefinamento
+from .pesquisa import IndicePesquisa
+from .scoring import (
+    _score_json, ordenar_por_score, preparar_colunas, preparar_colunas_minmax,
+    registos_recomendados, scores_ponderados,
+)
+from .serializacao import CarrosJSON
+from .similares import IndiceSimilares
+from .snapshot import carregar_snapshot, ler_manifest, origem_atualizada
+
+
+class Catalogo:
+    """DataFrame do catálogo mais os índices usados pelos endpoints."""
+
+    def __init__(self, df: pd.DataFrame, origem: str):
+        inicio = time.perf_counter()
+        # Segundos gastos a construir cada estrutura (GET /debug/dados)
+        self.tempos_construcao: Dict[str, float] = {}
+
+        def construir(nome, funcao):
+            t0 = time.perf_counter()
+            valor = funcao()
+            self.tempos_construcao[nome] = time.perf_counter() - t0
+            return valor
+
+        df = para_canonico(df)
+        # Tipos compactos (categorias, inteiros pequenos); valores iguais
+        self.bytes_df_original = bytes_dataframe(df)
+        df = construir("compactar", lambda: compactar(df))
+        self.df = df
+        self.origem = origem
+
+        # Arrays pré-calculados para o scoring vetorizado de /recomendar
+        self.colunas_scoring = construir("colunas_scoring", lambda: preparar_colunas(df))
+        self.colunas_minmax = construir("colunas_minmax", lambda: preparar_colunas_minmax(df))
+        # As mesmas colunas float64 do scoring são partilhadas, não copiadas
+        for nome, valores in self.colunas_minmax.items():
+            if np.array_equal(valores, self.colunas_scoring.get(nome), equal_nan=True):
+                self.colunas_minmax[nome] = self.colunas_scoring[nome]
+
+        # Linhas de cada perfil por score: /recomendar percorre-as até ter k
+        self.rankings = construir("rankings", lambda: RankingsPerfis(self.colunas_scoring))
+
+        # Bitsets e colunas ordenadas para os filtros de /recomendar
+        self.indice_filtros = construir("indice_filtros", lambda: IndiceFiltros(df))
+        # Candidatos dos estados de filtros recentes, para refinamentos de /recomendar
+        self.refinamento = CacheRefinamento(self.indice_filtros)
+        # Intervalos de Preco/Consumo/Bagageira para as contagens de POST /facetas
+        self.indice_facetas = construir("indice_facetas", lambda: IndiceFacetas(self.indice_filtros))
+
+        # Índice de n-gramas para o autocomplete de /modelos ("Marca Modelo Ano")
+        self.indice_pesquisa = construir("indice_pesquisa", lambda: IndicePesquisa(
+            f"{marca} {modelo} {ano}"
+            for marca, modelo, ano in zip(*(
+                df[col] if col in df.columns else [''] * len(df)
+                for col in ('Marca', 'Modelo', 'Ano')
+            ))
+        ))
+
+        # Vetores normalizados para GET /carro/{id}/similares
+        self.indice_similares = construir("indice_similares", lambda: IndiceSimilares(df))
+
+        # Objetivos ordenados por conjunto, criados no primeiro POST /recomendar/pareto
+        self.indice_pareto = IndicePareto(df)
+
+        # Preco, Consumo e combustível para as simulações de POST /custo
+        self.indice_custo = construir("indice_custo", lambda: IndiceCusto(df))
+
+        # JSON de cada carro, serializado uma vez (/carro/{id} e /comparar)
+        self.json = construir("json", lambda: CarrosJSON(df))
+
+        # Versão = hash do conteúdo (chaves de cache e ETags)
+        self.versao = construir("versao", self.json.hash_conteudo)
+        self.tempo_indices = time.perf_counter() - inicio
+
+    @classmethod
+    def de_ficheiro(cls, caminho: Union[str, Path]) -> "Catalogo":
+        """Catálogo de um CSV/Excel, sem snapshot nem dados de exemplo."""
+        df = ler_ficheiro_dados(Path(caminho))
+        if df is None:
+            raise ValueError(f"Formato de ficheiro não suportado: {caminho}")
+        return cls(df, str(caminho))
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def filtrar(self, filtros: Filtros) -> Bitset:
+        """Linhas que satisfazem `filtros`."""
+        with etapa("filtros"):
+            return filtros.aplicar(self.indice_filtros)
+
+    def _restricao(self, selecionados: Bitset, total: int) -> Optional[Bitset]:
+        """`selecionados`, ou None se forem todas as linhas (percurso sem testes)."""
+        return None if total == len(self) else selecionados
+
+    def top_perfil(
+        self, selecionados: Bitset, perfil: Optional[str], k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Posições e scores dos k melhores de `selecionados`, pelo ranking do perfil."""
+        with etapa("ordenacao"):
+            return self.rankings.de(perfil).primeiros(
+                self._restricao(selecionados, selecionados.contar()), k
+            )
+
+    def recomendar(
+        self, filtros: Filtros, perfil: Optional[str], k: int = 10,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Total filtrado e os k melhores carros pelo score do perfil (POST /recomendar)."""
+        selecionados = self.filtrar(filtros)
+        total = selecionados.contar()
+        if total == 0:
+            return 0, []
+        posicoes, scores = self.top_perfil(selecionados, perfil, k)
+        with etapa("serializacao"):
+            return total, registos_recomendados(self.df, posicoes, scores)
+
+    def refinar(
+        self, filtros: Filtros, perfil: Optional[str], k: int = 10, campos: Optional[Sequence[str]] = None,
+    ) -> Tuple[int, List[Dict[str, Any]], bool]:
+        """
+        O mesmo que recomendar(), partindo dos candidatos de um estado de
+        filtros recente de que `filtros` seja refinamento. O terceiro valor
+        diz se foi servido assim (True) ou a partir do catálogo inteiro.
+        `campos` limita as chaves de cada carro (None = todas).
+        """
+        ranking = self.rankings.de(perfil)
+        with etapa("filtros"):
+            candidatos, incremental = self.refinamento.candidatos(filtros, ranking)
+        if candidatos.total == 0:
+            return 0, [], incremental
+        with etapa("ordenacao"):
+            posicoes, scores = candidatos.primeiros(ranking, k)
+        with etapa("serializacao"):
+            return candidatos.total, registos_recomendados(self.df, posicoes, scores, campos), incremental
+
+    def ordem_recomendacao(
+        self, filtros: Filtros, perfil: Optional[str],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Todas as posições filtradas pela ordem de recomendar(), com os scores."""
+        selecionados = self.filtrar(filtros)
+        with etapa("ordenacao"):
+            return self.rankings.de(perfil).filtrado(self._restricao(selecionados, selecionados.contar()))
+
+    def recomendacoes_em_ordem(
+        self, filtros: Filtros, perfil: Optional[str],
+    ) -> Tuple[int, Iterator[Tuple[np.ndarray, np.ndarray]]]:
+        """Total filtrado e a mesma ordem de ordem_recomendacao(), em blocos crescentes."""
+        selecionados = self.filtrar(filtros)
+        total = selecionados.contar()
+        ranking = self.rankings.de(perfil)
+        blocos = (
+            (ranking.ordem[i], ranking.scores[i])
+            for i in ranking.em_blocos(self._restricao(selecionados, total)) if len(i)
+        )
+        return total, blocos
+
+    def pareto(
+        self, filtros: Filtros, objetivos: Sequence[str], k: int = 1,
+    ) -> Tuple[int, List[np.ndarray]]:
+        """
+        Total filtrado e as posições das k primeiras frentes de Pareto (POST /recomendar/pareto).
+
+        ValueError com mais de 3 objetivos e mais de MAXIMO_LINHAS_MUITOS_OBJETIVOS linhas filtradas.
+        """
+        selecionados = self.filtrar(filtros)
+        total = selecionados.contar()
+        if total == 0:
+            return 0, []
+        if len(objetivos_canonicos(objetivos)) > 3 and total > MAXIMO_LINHAS_MUITOS_OBJETIVOS:
+            raise ValueError(
+                f"Mais de 3 objetivos só com até {MAXIMO_LINHAS_MUITOS_OBJETIVOS} carros filtrados "
+                f"({total} encontrados): aplique filtros ou escolha até 3 objetivos"
+            )
+        with etapa("pareto"):
+            return total, self.indice_pareto.frentes(objetivos, self._restricao(selecionados, total), k)
+
+    def custo(
+        self, filtros: Filtros, cenarios: CenariosCusto, k: int = 10,
+    ) -> Tuple[int, Optional[ResultadoCusto]]:
+        """Total filtrado e os custos de posse nos `cenarios` (POST /custo)."""
+        selecionados = self.filtrar(filtros)
+        total = selecionados.contar()
+        if total == 0:
+            return 0, None
+        with etapa("custo"):
+            return total, self.indice_custo.simular(self._restricao(selecionados, total), cenarios, k)
+
+    def carros_com_score(
+        self, posicoes: np.ndarray, scores: np.ndarray, campos: Optional[Sequence[str]] = None,
+    ) -> List[bytes]:
+        """JSON de cada carro com "id" e "score", tal como em recomendar() (só `campos`, se dados)."""
+        extras = [
+            {"id": str(self.df.index[pos]), "score": _score_json(float(score))}
+            for pos, score in zip(posicoes, scores)
+        ]
+        if campos is not None:
+            return self.json.projetados(posicoes, campos, extras)
+        return [self.json.carro_com_extras(pos, extra) for pos, extra in zip(posicoes, extras)]
+
+    def ranking_ponderado(
+        self, filtros: Filtros, pesos: Tuple[float, float, float], k: Optional[int] = 20,
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray], int]:
+        """
+        Os k melhores pelo score min-max ponderado (car_filter.py).
+
+        Devolve as posições no catálogo por score decrescente, os scores
+        dessas linhas (vazio se nada passar os filtros) e o total filtrado.
+        """
+        posicoes = self.filtrar(filtros).posicoes()
+        if len(posicoes) == 0:
+            return posicoes, {}, 0
+        with etapa("scoring"):
+            scores = scores_ponderados(self.colunas_minmax, pesos, posicoes)
+        with etapa("ordenacao"):
+            ordem = ordenar_por_score(scores["score_total"], k)
+        return posicoes[ordem], {nome: valores[ordem] for nome, valores in scores.items()}, len(posicoes)
+
+    def memoria(self) -> Dict[str, Any]:
+        """Bytes de cada estrutura e por linha, antes e depois de compactar o DataFrame."""
+        estruturas = {
+            "df": bytes_dataframe(self.df),
+            "colunas_scoring": bytes_arrays(self.colunas_scoring),
+            "colunas_minmax": bytes_arrays({
+                nome: valores for nome, valores in self.colunas_minmax.items()
+                if valores is not self.colunas_scoring.get(nome)
+            }),
+            "rankings": self.rankings.tamanho_bytes,
+            "indice_filtros": self.indice_filtros.tamanho_bytes,
+            "refinamento": self.refinamento.tamanho_bytes,
+            "indice_facetas": self.indice_facetas.tamanho_bytes,
+            "indice_pesquisa": self.indice_pesquisa.tamanho_bytes,
+            "indice_similares": self.indice_similares.tamanho_bytes,
+            "indice_pareto": self.indice_pareto.tamanho_bytes,
+            "indice_custo": self.indice_custo.tamanho_bytes,
+            "json": self.json.tamanho_bytes,
+        }
+        total = sum(estruturas.values())
+        total_antes = total - estruturas["df"] + self.bytes_df_original
+        n = max(1, len(self))
+        return {
+            "estruturas_bytes": estruturas,
+            "df_bytes": {"antes": self.bytes_df_original, "depois": estruturas["df"]},
+            "total_bytes": {"antes": total_antes, "depois": total},
+            "bytes_por_linha": {
+                "df_antes": round(self.bytes_df_original / n, 1),
+                "df_depois": round(estruturas["df"] / n, 1),
+                "total_antes": round(total_antes / n, 1),
+                "total_depois": round(total / n, 1),
+            },
+        }
+
+    def resumo_modelo(self, pos: int) -> Dict[str, Any]:
+        """Entrada de autocomplete (GET /modelos) da linha `pos`."""
+        row = self.df.iloc[pos]
+
+        # Garantir que todos os campos existem
+        marca = row.get('Marca', '')
+        modelo = row.get('Modelo', '')
+        ano = row.get('Ano', '')
+        preco = row.get('Preco', 0)
+
+        return {
+            "id": str(self.df.index[pos]),
+            "nome": f"{marca} {modelo} {ano}",
+            "marca": marca,
+            "modelo": modelo,
+            "ano": int(ano) if pd.notna(ano) else 0,
+            "preco": float(preco) if pd.notna(preco) else 0,
+            "tipo": row.get('Tipo', ''),
+            "combustivel": row.get('Combustivel', '')
+        }
+
+
+def carregar_catalogo(diretorio: Path, pasta_snapshot: Path) -> Catalogo:
+    """Carrega o catálogo: snapshot, depois CSV/Excel, depois dados de exemplo."""
+    print(f"📂 Diretório atual: {diretorio}")
+    print(f"📁 Conteúdo do diretório: {os.listdir(diretorio)}")
+
+    # Procurar por arquivos de dados
+    data_files = procurar_ficheiros_dados(diretorio)
+
+    print(f"🔍 {len(data_files)} arquivo(s) de dados encontrado(s):")
+    for f in data_files:
+        print(f"   - {f}")
+
+    # Tentar carregar os dados: primeiro o snapshot binário (gerado no build
+    # com `python -m motor snapshot`), depois as folhas de cálculo/CSV
+    df = None
+    loaded_from = None
+
+    manifest = ler_manifest(pasta_snapshot)
+    origem_snapshot = origem_atualizada(manifest, data_files) if manifest else None
+    if origem_snapshot is not None:
+        try:
+            df = carregar_snapshot(pasta_snapshot, manifest)
+            loaded_from = f"{origem_snapshot} (snapshot)"
+            print(f"⚡ Snapshot carregado: {len(df)} registros")
+        except Exception as e:
+            print(f"❌ Erro ao carregar snapshot: {str(e)[:100]}...")
+            df = None
+    elif manifest:
+        print("⚠️ Snapshot desatualizado, a ler o ficheiro de origem")
+
+    if df is None:
+        df, loaded_from = carregar_primeiro(data_files)
+
+    # Se não carregou, criar dados de exemplo
+    if df is None or len(df) == 0:
+        print("⚠️ Nenhum arquivo de dados válido encontrado. Criando dados de exemplo...")
+        df = dados_exemplo()
+        loaded_from = "DADOS DE EXEMPLO"
+        print("✅ Dados de exemplo criados com sucesso!")
+
+    catalogo = Catalogo(df, str(loaded_from))
+
+    print(f"\n🎉 Catálogo pronto! Dados carregados de: {loaded_from}")
+    print(f"📊 Total de carros: {len(df)}")
+    print(f"🧮 Índices construídos em {catalogo.tempo_indices * 1000:.1f} ms")
+    return catalogo
@@ -0,0 +1,53 @@
+"""
+Mapeamento entre os esquemas de colunas do catálogo.
+
+O motor trabalha com os nomes curtos da API (`Preco`, `Consumo`, ...).
+Os CSV/Excel com cabeçalhos em português por extenso (`Preço Indicativo
+(€)`, `Consumo (l/100km)`, ..., como os usados por car_filter.py) são
+renomeados para esses nomes ao carregar.
+"""
+
+from typing import Dict
+
+import pandas as pd
+
+# Nome canónico -> nomes alternativos aceites nos ficheiros de dados
+SINONIMOS = {
+    "Preco": ("Preço Indicativo (€)", "Preço"),
+    "Potencia": ("Potência (cv)", "Potência"),
+    "Consumo": ("Consumo (l/100km)",),
+    "0-100": ("0-100 km/h (s)",),
+    "Velocidade": ("Velocidade Max (km/h)",),
+    "Bagageira": ("Bagageira (l)",),
+    "Combustivel": ("Combustível",),
+    "GPS": ("Navegador",),
+    "Sensor": ("Sensores",),
+}
+
+_CANONICO: Dict[str, str] = {
+    alternativo: canonico
+    for canonico, alternativos in SINONIMOS.items()
+    for alternativo in alternativos
+}
+
+
+def nome_canonico(coluna: str) -> str:
+    """Nome do motor para `coluna` (ela própria se não tiver sinónimo)."""
+    return _CANONICO.get(coluna, coluna)
+
+
+def mapa_canonico(colunas) -> Dict[str, str]:
+    """Renomeações a aplicar a `colunas` (só as que não colidem com uma existente)."""
+    existentes = set(colunas)
+    mapa = {}
+    for coluna in colunas:
+        canonico = _CANONICO.get(coluna)
+        if canonico and canonico not in existentes and canonico not in mapa.values():
+            mapa[coluna] = canonico
+    return mapa
+
+
+def para_canonico(df: pd.DataFrame) -> pd.DataFrame:
+    """DataFrame com as colunas renomeadas para o esquema do motor."""
+    mapa = mapa_canonico(df.columns)
+    return df.rename(columns=mapa) if mapa else df
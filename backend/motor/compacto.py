@@ -0,0 +1,64 @@
+"""
+Representação compacta do DataFrame do catálogo.
+
+Sem perder informação (os valores lidos e o JSON servido não mudam):
+  - textos -> Categorical (códigos int8/int16 + tabela única de strings);
+  - inteiros -> o menor tipo que os contém (int8/int16/int32);
+  - reais com valores inteiros (com NaN, ex.: Preco, Ano) -> float32,
+    só se a conversão for exata.
+Os extras booleanos ficam em bool (1 byte por linha) no DataFrame; a
+versão empacotada, 1 bit por linha, é a dos bitsets de IndiceFiltros.
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+def _textos(serie: pd.Series) -> bool:
+    """Coluna object só com strings (e NaN)?"""
+    valores = serie.dropna()
+    return len(valores) > 0 and all(isinstance(v, str) for v in valores)
+
+
+def _compactar_coluna(serie: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(serie):
+        return serie
+    if pd.api.types.is_integer_dtype(serie):
+        return pd.to_numeric(serie, downcast="integer")
+    if pd.api.types.is_float_dtype(serie):
+        valores = serie.to_numpy(dtype=np.float64)
+        validos = valores[~np.isnan(valores)]
+        # Só inteiros: o float32 escreve-se igual no JSON ("28500.0")
+        if (
+            np.array_equal(validos, np.trunc(validos))
+            and np.array_equal(validos.astype(np.float32).astype(np.float64), validos)
+        ):
+            return serie.astype(np.float32)
+        return serie
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie
+    texto = isinstance(serie.dtype, pd.StringDtype) or (serie.dtype == object and _textos(serie))
+    if texto and serie.nunique() < len(serie):
+        return serie.astype("category")
+    return serie
+
+
+def compactar(df: pd.DataFrame) -> pd.DataFrame:
+    """Cópia de `df` com os tipos compactos (o original não é alterado)."""
+    return pd.DataFrame({coluna: _compactar_coluna(df[coluna]) for coluna in df.columns}, index=df.index)
+
+
+def bytes_dataframe(df: pd.DataFrame) -> int:
+    """Memória do DataFrame, incluindo as strings e as tabelas das categorias."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def bytes_arrays(arrays: Dict[str, np.ndarray]) -> int:
+    """Memória de um dict de arrays; arrays partilhados contam uma vez."""
+    vistos = {}
+    for valores in arrays.values():
+        base = valores.base if valores.base is not None else valores
+        vistos[id(base)] = base.nbytes
+    return sum(vistos.values())
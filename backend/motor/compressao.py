@@ -0,0 +1,55 @@
+"""
+Compressão das respostas JSON, negociada pelo Accept-Encoding.
+
+Respostas com menos de COMPRESSAO_MINIMO bytes seguem sem compressão (o
+cabeçalho gzip e o tempo de CPU não compensam). Acima disso usa brotli,
+se o cliente o aceitar e o pacote `brotli` estiver instalado, ou gzip.
+Os corpos das respostas em cache são comprimidos uma vez por codificação.
+"""
+
+import gzip
+import os
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # opcional: sem ele só gzip
+    brotli = None
+
+COMPRESSAO_MINIMO = int(os.getenv("COMPRESSAO_MINIMO", "1024"))
+# Níveis rápidos: as respostas não memorizadas são comprimidas a cada pedido
+NIVEL_BROTLI = 5
+NIVEL_GZIP = 6
+
+
+def codificacoes_disponiveis() -> tuple:
+    """Codificações suportadas, por ordem de preferência."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def escolher_codificacao(accept_encoding: str, tamanho: int, minimo: int = COMPRESSAO_MINIMO) -> Optional[str]:
+    """Codificação a usar para um corpo de `tamanho` bytes (None = sem compressão)."""
+    if tamanho < minimo or not accept_encoding:
+        return None
+    aceites = {}
+    for parte in accept_encoding.lower().split(","):
+        nome, _, parametros = parte.strip().partition(";")
+        q = 1.0
+        if parametros.strip().startswith("q="):
+            try:
+                q = float(parametros.strip()[2:])
+            except ValueError:
+                q = 0.0
+        aceites[nome.strip()] = q
+    for codificacao in codificacoes_disponiveis():
+        if aceites.get(codificacao, aceites.get("*", 0.0)) > 0:
+            return codificacao
+    return None
+
+
+def comprimir(corpo: bytes, codificacao: str, nivel: Optional[int] = None) -> bytes:
+    """`corpo` comprimido em "br" ou "gzip" (`nivel` None = o nível rápido da codificação)."""
+    if codificacao == "br":
+        return brotli.compress(corpo, quality=NIVEL_BROTLI if nivel is None else nivel)
+    # mtime fixo: o mesmo corpo dá sempre os mesmos bytes
+    return gzip.compress(corpo, compresslevel=NIVEL_GZIP if nivel is None else nivel, mtime=0)
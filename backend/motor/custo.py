@@ -0,0 +1,251 @@
+"""
+Custo total de posse (POST /custo): compra mais combustível ao longo de
+`anos`, em cenários de Monte Carlo de preços e quilómetros.
+
+O custo do carro i no cenário s é
+
+    Preco_i + Consumo_i / 100 * km_s * anos * preço_s(Combustivel_i)
+
+Cada cenário sorteia, uniformemente nos intervalos pedidos, o preço de
+cada combustível e os km/ano (sem intervalos há um só cenário). Com
+u[f, s] = km_s * anos * preço_s(f) / 100 (euros por unidade de Consumo)
+o custo é Preco_i + Consumo_i * u[f_i, s], afim e crescente em u:
+
+- a média e os percentis de cada carro saem da média e dos percentis de
+  u[f] do seu combustível, sem a matriz carros × cenários;
+- o mais barato de um cenário só pode ser um carro sem outro do mesmo
+  combustível com Preco e Consumo menores ou iguais (a "escada" de cada
+  combustível, como nas frentes de Pareto). Só esses entram na matriz
+  cenários × candidatos, calculada por combustível em blocos de
+  BLOCO_ELEMENTOS, para a memória ficar limitada mesmo quando a escada
+  tem o catálogo inteiro.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .indices import Bitset
+from .pesquisa import normalizar_texto
+from .scoring import top_k
+
+# Euros por unidade de Consumo: litro (kWh nos elétricos, com Consumo em kWh/100km)
+PRECOS_COMBUSTIVEL: Dict[str, float] = {
+    "Gasolina": 1.75,
+    "Diesel": 1.65,
+    "Híbrido": 1.75,
+    "GPL": 0.95,
+    "Elétrico": 0.22,
+}
+PERCENTIS = (5, 25, 50, 75, 95)
+MAXIMO_CENARIOS = 10_000
+# Elementos (carros × cenários) de cada bloco da matriz: 2 MB em float64
+BLOCO_ELEMENTOS = 2**18
+
+
+@dataclass(frozen=True)
+class CenariosCusto:
+    """Euros por unidade de Consumo, u[combustível, cenário], de um catálogo."""
+
+    unitario: np.ndarray
+
+    @property
+    def n(self) -> int:
+        return self.unitario.shape[1]
+
+
+@dataclass
+class ResultadoCusto:
+    """Custos de um conjunto filtrado (posições no catálogo)."""
+
+    considerados: int
+    # Os k de menor custo médio, com a média, o custo do combustível e os percentis (k × PERCENTIS)
+    ranking: np.ndarray
+    custo_medio: np.ndarray
+    custo_combustivel: np.ndarray
+    percentis: np.ndarray
+    # Percentis do custo médio dos considerados e do custo do mais barato de cada cenário
+    distribuicao: np.ndarray
+    minimo_cenarios: np.ndarray
+    # Carros mais baratos em pelo menos um cenário e em que fração dos cenários
+    vencedores: np.ndarray
+    frequencia: np.ndarray
+    candidatos: int
+
+    def prob_mais_barato(self, posicoes: np.ndarray) -> np.ndarray:
+        """Fração dos cenários em que cada uma das `posicoes` é a mais barata."""
+        if len(self.vencedores) == 0:
+            return np.zeros(len(posicoes))
+        indices = np.minimum(np.searchsorted(self.vencedores, posicoes), len(self.vencedores) - 1)
+        return np.where(self.vencedores[indices] == posicoes, self.frequencia[indices], 0.0)
+
+    def mais_baratos(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Os k carros mais baratos em mais cenários (empates pela posição) e as frações."""
+        ordem = np.argsort(-self.frequencia, kind="stable")[:k]
+        return self.vencedores[ordem], self.frequencia[ordem]
+
+
+def _intervalo(nome: str, valores: Sequence[float]) -> Tuple[float, float]:
+    if len(valores) != 2 or not 0 < valores[0] <= valores[1]:
+        raise ValueError(f"Intervalo de {nome} deve ser [mínimo, máximo] com 0 < mínimo <= máximo")
+    return float(valores[0]), float(valores[1])
+
+
+class IndiceCusto:
+    """Preco, Consumo e combustível de cada carro, e a ordem usada pelas escadas."""
+
+    def __init__(self, df: pd.DataFrame):
+        n = len(df)
+
+        def numerica(coluna):
+            if coluna not in df.columns:
+                return np.full(n, np.nan)
+            return pd.to_numeric(df[coluna], errors="coerce").to_numpy(dtype=np.float64)
+
+        self.preco = numerica("Preco")
+        self.consumo = numerica("Consumo")
+        combustivel = df["Combustivel"] if "Combustivel" in df.columns else pd.Series([None] * n)
+        codigos, unicos = pd.factorize(combustivel)
+        self.codigos = codigos.astype(np.int32)
+        self.combustiveis: List[str] = [str(c) for c in unicos]
+
+        # Carros com custo calculável, por combustível, Preco, Consumo e posição
+        validos = np.flatnonzero(
+            np.isfinite(self.preco) & np.isfinite(self.consumo) & (self.consumo >= 0) & (self.codigos >= 0)
+        )
+        self._ordem = validos[np.lexsort((
+            validos, self.consumo[validos], self.preco[validos], self.codigos[validos]
+        ))]
+        self._valido = np.zeros(n, dtype=bool)
+        self._valido[validos] = True
+
+    @property
+    def tamanho_bytes(self) -> int:
+        return self.preco.nbytes + self.consumo.nbytes + self.codigos.nbytes + self._ordem.nbytes + self._valido.nbytes
+
+    def _combustivel(self, nome: str) -> int:
+        """Código de um combustível do catálogo, sem distinguir acentos/maiúsculas (ValueError se não existir)."""
+        procurado = normalizar_texto(nome).strip()
+        for codigo, combustivel in enumerate(self.combustiveis):
+            if normalizar_texto(combustivel) == procurado:
+                return codigo
+        raise ValueError(f"Combustível desconhecido: {nome!r} (disponíveis: {self.combustiveis})")
+
+    def cenarios(
+        self,
+        km_ano: float,
+        anos: int,
+        precos: Optional[Dict[str, float]] = None,
+        intervalos: Optional[Dict[str, Sequence[float]]] = None,
+        intervalo_km: Optional[Sequence[float]] = None,
+        n: int = 1000,
+        semente: int = 0,
+    ) -> CenariosCusto:
+        """
+        Cenários de preços: `precos` (por omissão PRECOS_COMBUSTIVEL) fixos
+        e, para os combustíveis em `intervalos`, sorteados uniformemente; o
+        mesmo para os km/ano com `intervalo_km`. Sem nenhum intervalo há um
+        só cenário. Combustíveis sem preço ficam com NaN (carros excluídos).
+        """
+        if not 1 <= n <= MAXIMO_CENARIOS:
+            raise ValueError(f"Número de cenários deve estar entre 1 e {MAXIMO_CENARIOS}")
+        fixos = np.full(len(self.combustiveis), np.nan)
+        for nome, preco in PRECOS_COMBUSTIVEL.items():
+            try:
+                fixos[self._combustivel(nome)] = preco
+            except ValueError:
+                pass
+        for nome, preco in (precos or {}).items():
+            if not preco > 0:
+                raise ValueError(f"Preço de {nome} deve ser positivo")
+            fixos[self._combustivel(nome)] = preco
+        sorteados = {self._combustivel(nome): _intervalo(nome, valores) for nome, valores in (intervalos or {}).items()}
+        if intervalo_km is not None:
+            intervalo_km = _intervalo("km/ano", intervalo_km)
+        if not sorteados and intervalo_km is None:
+            n = 1
+
+        rng = np.random.default_rng(semente)
+        precos_cenarios = np.repeat(fixos[:, None], n, axis=1)
+        for codigo, (minimo, maximo) in sorted(sorteados.items()):
+            precos_cenarios[codigo] = rng.uniform(minimo, maximo, n)
+        km = rng.uniform(*intervalo_km, n) if intervalo_km is not None else np.full(n, float(km_ano))
+        return CenariosCusto(precos_cenarios * (km * anos / 100))
+
+    def _escadas(self, mascara: np.ndarray) -> np.ndarray:
+        """Posições (crescentes) de `mascara` sem outro carro do mesmo combustível mais barato em tudo."""
+        ordem = self._ordem[mascara[self._ordem]]
+        if len(ordem) == 0:
+            return ordem
+        codigos = self.codigos[ordem]
+        consumo = self.consumo[ordem]
+        inicios = np.flatnonzero(np.concatenate(([True], codigos[1:] != codigos[:-1])))
+        fins = np.append(inicios[1:], len(ordem))
+        manter = np.zeros(len(ordem), dtype=bool)
+        for inicio, fim in zip(inicios, fins):
+            # Por Preco crescente: fica quem gasta menos do que todos os anteriores
+            segmento = consumo[inicio:fim]
+            anteriores = np.concatenate(([np.inf], np.minimum.accumulate(segmento[:-1])))
+            manter[inicio:fim] = segmento < anteriores
+        return np.sort(ordem[manter])
+
+    def simular(self, selecionados: Optional[Bitset], cenarios: CenariosCusto, k: int = 10) -> ResultadoCusto:
+        """Custos dos carros de `selecionados` (None = todos) nos `cenarios`."""
+        unitario = cenarios.unitario
+        com_preco = np.append(np.isfinite(unitario[:, 0]), False)  # código -1 (sem combustível) -> False
+        mascara = self._valido & com_preco[self.codigos]
+        if selecionados is not None:
+            mascara &= selecionados.mascara()
+        posicoes = np.flatnonzero(mascara)
+
+        # Média e percentis por carro a partir dos de u[f] (o custo é afim e crescente em u)
+        media_u = unitario.mean(axis=1)
+        percentis_u = np.percentile(unitario, PERCENTIS, axis=1).T if len(posicoes) else None
+        custo_medio = self.preco[posicoes] + self.consumo[posicoes] * media_u[self.codigos[posicoes]]
+        melhores = top_k(-custo_medio, k)
+        ranking = posicoes[melhores]
+        percentis = (
+            self.preco[ranking, None] + self.consumo[ranking, None] * percentis_u[self.codigos[ranking]]
+            if len(ranking) else np.empty((0, len(PERCENTIS)))
+        )
+
+        # Mais barato de cada cenário: matriz cenários × candidatos de cada
+        # combustível (u[f] partilhado, sem gather), aos blocos, num buffer reutilizado
+        candidatos = self._escadas(mascara)
+        minimo = np.full(cenarios.n, np.inf)
+        vencedor = np.full(cenarios.n, -1, dtype=np.int64)
+        cenario = np.arange(cenarios.n)
+        passo = max(1, BLOCO_ELEMENTOS // cenarios.n)
+        buffer = np.empty(cenarios.n * min(passo, max(len(candidatos), 1)))
+        codigos_candidatos = self.codigos[candidatos]
+        for codigo in np.unique(codigos_candidatos):
+            do_combustivel = candidatos[codigos_candidatos == codigo]
+            u = unitario[codigo][:, None]
+            for inicio in range(0, len(do_combustivel), passo):
+                bloco = do_combustivel[inicio:inicio + passo]
+                custos = buffer[:cenarios.n * len(bloco)].reshape(cenarios.n, len(bloco))
+                np.multiply(u, self.consumo[bloco], out=custos)
+                custos += self.preco[bloco]
+                colunas = custos.argmin(axis=1)
+                valores = custos[cenario, colunas]
+                posicoes_bloco = bloco[colunas]
+                # Nos empates fica o carro de menor posição, como num argmin pelo catálogo
+                melhora = (valores < minimo) | ((valores == minimo) & (posicoes_bloco < vencedor))
+                minimo[melhora] = valores[melhora]
+                vencedor[melhora] = posicoes_bloco[melhora]
+
+        vencedores, contagens = np.unique(vencedor[vencedor >= 0], return_counts=True)
+        return ResultadoCusto(
+            considerados=len(posicoes),
+            ranking=ranking,
+            custo_medio=custo_medio[melhores],
+            custo_combustivel=custo_medio[melhores] - self.preco[ranking],
+            percentis=percentis,
+            distribuicao=np.percentile(custo_medio, PERCENTIS) if len(posicoes) else np.full(len(PERCENTIS), np.nan),
+            minimo_cenarios=np.percentile(minimo, PERCENTIS) if len(candidatos) else np.full(len(PERCENTIS), np.nan),
+            vencedores=vencedores,
+            frequencia=contagens / cenarios.n,
+            candidatos=len(candidatos),
+        )
@@ -0,0 +1,166 @@
+"""
+Carregamento e recarga do catálogo em segundo plano.
+
+Só usa a biblioteca padrão: importar este módulo não puxa pandas/numpy,
+para que a API arranque (e responda a /health) antes de o catálogo
+estar pronto.
+
+Cada Catalogo é imutável. Uma recarga constrói a versão nova numa thread
+e só depois troca a referência (uma atribuição, atómica): os pedidos em
+curso acabam com a versão que obtiveram e os seguintes já veem a nova.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+
+class CatalogoIndisponivel(Exception):
+    """O catálogo ainda está a carregar ou o carregamento falhou."""
+
+
+class EstadoCatalogo:
+    """Dono do catálogo atual; carrega-o numa thread no primeiro pedido."""
+
+    def __init__(self, carregar: Callable[[], Any], ao_publicar: Optional[Callable[[Any], None]] = None):
+        self._carregar = carregar
+        self._ao_publicar = ao_publicar
+        self._lock = threading.Lock()
+        self._pronto = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.catalogo = None
+        self.erro: Optional[BaseException] = None
+        self.inicio: Optional[float] = None
+        self.duracao: Optional[float] = None
+        # Recargas (POST /admin/reload ou vigia de ficheiros)
+        self.recarga_em_curso = False
+        self.recargas = 0
+        self.erro_recarga: Optional[BaseException] = None
+        self.duracao_recarga: Optional[float] = None
+
+    @property
+    def pronto(self) -> bool:
+        return self._pronto.is_set() and self.catalogo is not None
+
+    def iniciar(self) -> None:
+        """Arranca o carregamento (idempotente)."""
+        with self._lock:
+            if self._thread is None:
+                self.inicio = time.perf_counter()
+                self._thread = threading.Thread(
+                    target=self._executar, name="carregar-catalogo", daemon=True
+                )
+                self._thread.start()
+
+    def descartar(self) -> None:
+        """
+        Volta ao estado inicial (sem catálogo nem erro): o próximo iniciar()
+        carrega de novo. Para um carregamento já terminado, p.ex. falhado
+        no processo pai antes do fork do gunicorn.
+        """
+        with self._lock:
+            self._thread = None
+            self._pronto.clear()
+            self.catalogo = None
+            self.erro = None
+            self.inicio = None
+            self.duracao = None
+
+    def _publicar(self, catalogo) -> None:
+        self.catalogo = catalogo
+        self.erro = None
+        if self._ao_publicar is not None:
+            self._ao_publicar(catalogo)
+
+    def _executar(self) -> None:
+        try:
+            self._publicar(self._carregar())
+        except BaseException as e:
+            self.erro = e
+            print(f"❌ Erro ao carregar catálogo: {str(e)[:200]}")
+        finally:
+            self.duracao = time.perf_counter() - self.inicio
+            self._pronto.set()
+
+    def recarregar(self) -> bool:
+        """
+        Constrói uma versão nova em segundo plano e publica-a se mudou.
+
+        Devolve False (sem fazer nada) se o carregamento inicial ou outra
+        recarga ainda estiverem a decorrer. Se a recarga falhar, a versão
+        atual continua a ser servida.
+        """
+        with self._lock:
+            if self.recarga_em_curso or not self._pronto.is_set():
+                return False
+            self.recarga_em_curso = True
+        threading.Thread(target=self._executar_recarga, name="recarregar-catalogo", daemon=True).start()
+        return True
+
+    def _executar_recarga(self) -> None:
+        inicio = time.perf_counter()
+        try:
+            novo = self._carregar()
+            atual = self.catalogo
+            if atual is None or getattr(novo, "versao", None) != getattr(atual, "versao", None):
+                self._publicar(novo)
+                self.recargas += 1
+                print(f"🔄 Catálogo recarregado: versão {getattr(novo, 'versao', '?')}")
+            else:
+                print("🔄 Recarga sem alterações: versão mantida")
+            self.erro_recarga = None
+        except BaseException as e:
+            self.erro_recarga = e
+            print(f"❌ Erro ao recarregar catálogo (mantida a versão atual): {str(e)[:200]}")
+        finally:
+            self.duracao_recarga = time.perf_counter() - inicio
+            self.recarga_em_curso = False
+
+    def obter(self, timeout: Optional[float] = None):
+        """Catálogo pronto, esperando até `timeout` segundos pelo carregamento."""
+        self.iniciar()
+        if not self._pronto.wait(timeout):
+            raise CatalogoIndisponivel("Catálogo ainda a carregar")
+        if self.catalogo is None:
+            raise CatalogoIndisponivel(f"Falha ao carregar catálogo: {self.erro}")
+        return self.catalogo
+
+
+class VigiaFicheiros:
+    """Chama `ao_mudar()` quando `assinatura()` muda e estabiliza (verificada a cada `intervalo` s)."""
+
+    def __init__(
+        self, assinatura: Callable[[], Hashable], ao_mudar: Callable[[], Any], intervalo: float,
+        mensagem: str = "👀 Ficheiros de dados alterados, a recarregar o catálogo",
+    ):
+        self._assinatura = assinatura
+        self._ao_mudar = ao_mudar
+        self.intervalo = intervalo
+        self.mensagem = mensagem
+        self._thread: Optional[threading.Thread] = None
+
+    def iniciar(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._vigiar, name="vigia-ficheiros", daemon=True)
+            self._thread.start()
+
+    def _vigiar(self) -> None:
+        publicada = None
+        candidata = None
+        while True:
+            try:
+                atual = self._assinatura()
+                if publicada is None:
+                    publicada = atual
+                elif atual != publicada:
+                    # Só recarrega quando a assinatura se mantiver durante um
+                    # intervalo (o ficheiro já não está a ser escrito); se já
+                    # houver uma recarga em curso, tenta na volta seguinte
+                    if atual == candidata:
+                        print(self.mensagem)
+                        if self._ao_mudar():
+                            publicada = atual
+                    candidata = atual
+            except Exception as e:
+                print(f"❌ Erro ao vigiar ficheiros de dados: {str(e)[:200]}")
+            time.sleep(self.intervalo)
@@ -0,0 +1,87 @@
+"""
+Executor limitado para o trabalho de CPU dos endpoints async.
+
+Os endpoints correm no event loop e entregam o cálculo (scoring,
+pesquisa, serialização) a um pool de threads com tamanho fixo. Quando
+já há `trabalhadores + fila_maxima` tarefas pendentes, novos pedidos são
+recusados com Sobrecarregado (HTTP 429 + Retry-After) em vez de ficarem
+numa fila sem fim, e o event loop continua livre para /health e para as
+respostas em cache.
+
+Tarefas com a mesma chave enquanto uma está em curso (ex.: o mesmo
+prefixo de autocomplete pedido por muitos clientes ao mesmo tempo)
+partilham o resultado da primeira (singleflight): o cálculo corre uma vez.
+
+As respostas em streaming calculam cada bloco numa tarefa: o primeiro
+passa pelo limite como qualquer outra, os seguintes (`admitida=True`)
+contam como pendentes mas não são recusados a meio da resposta.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .metricas import descrever_etapa
+
+
+class Sobrecarregado(Exception):
+    """Fila do executor cheia; o cliente deve repetir após `retry_after` s."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Servidor ocupado, tente novamente")
+        self.retry_after = retry_after
+
+
+class ExecutorLimitado:
+    """Pool de threads com limite de tarefas pendentes e coalescência por chave."""
+
+    def __init__(self, trabalhadores: int, fila_maxima: int, retry_after: int = 1):
+        self.trabalhadores = trabalhadores
+        self.fila_maxima = fila_maxima
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="motor")
+        # Só alterados no event loop (chamadas e callbacks), sem lock
+        self._em_voo: Dict[Hashable, asyncio.Future] = {}
+        self.pendentes = 0
+        self.executadas = 0
+        self.coalescidas = 0
+        self.rejeitadas = 0
+
+    def _terminar(self, chave: Optional[Hashable], futuro: asyncio.Future) -> None:
+        self.pendentes -= 1
+        if chave is not None and self._em_voo.get(chave) is futuro:
+            del self._em_voo[chave]
+        if not futuro.cancelled():
+            futuro.exception()  # marcar como lida se ninguém esperar pelo resultado
+
+    async def executar(
+        self, funcao: Callable[[], Any], chave: Optional[Hashable] = None, admitida: bool = False
+    ) -> Any:
+        """
+        Resultado de `funcao()` calculado numa thread do pool.
+
+        Com `chave`, uma tarefa igual já em curso é reaproveitada. O
+        contexto (cronómetro do pedido) passa para a thread. `admitida`
+        salta o limite (continuação de um pedido já aceite).
+        """
+        if chave is not None:
+            futuro = self._em_voo.get(chave)
+            if futuro is not None:
+                self.coalescidas += 1
+                descrever_etapa("singleflight", "coalescido")
+                return await asyncio.shield(futuro)
+
+        if not admitida and self.pendentes >= self.trabalhadores + self.fila_maxima:
+            self.rejeitadas += 1
+            raise Sobrecarregado(self.retry_after)
+
+        contexto = contextvars.copy_context()
+        futuro = asyncio.get_running_loop().run_in_executor(self._pool, contexto.run, funcao)
+        self.pendentes += 1
+        self.executadas += 1
+        futuro.add_done_callback(lambda f: self._terminar(chave, f))
+        if chave is not None:
+            self._em_voo[chave] = futuro
+        # shield: um cliente que desiste não cancela o resultado dos outros
+        return await asyncio.shield(futuro)
@@ -0,0 +1,102 @@
+"""
+Exportação estática da API para servir de um CDN ou do GitHub Pages.
+
+    python -m motor exportar [--destino estatico] [--prefixos 3]
+
+As respostas de leitura que não dependem de filtros (/tipos,
+/combustiveis, /carro/{id}, /recomendar sem filtros por perfil e
+/modelos?q= para os prefixos mais escritos) são geradas por api.py com
+as mesmas funções dos endpoints, logo com os mesmos bytes. Cada corpo é
+escrito uma vez, com o nome derivado do seu hash (`carro/<sha>.json`),
+e, acima de COMPRESSAO_MINIMO bytes, também já comprimido (`.br`,
+`.gz`) no nível máximo. Os ficheiros nunca mudam de conteúdo e podem
+ser servidos com Cache-Control imutável.
+
+O manifest.json, escrito no fim, liga cada rota ("GET /carro/12",
+'POST /recomendar {"perfil":"familia"}', com o corpo na forma de
+motor.canonicalizar) ao seu ficheiro e lista as cópias comprimidas. Os ficheiros
+do manifest anterior são mantidos (clientes que ainda o têm continuam a
+encontrá-los); os mais antigos são apagados.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Set, Tuple
+
+from .compressao import COMPRESSAO_MINIMO, codificacoes_disponiveis, comprimir
+
+MANIFEST = "manifest.json"
+PASTA_PADRAO = Path(__file__).resolve().parent.parent / "estatico"
+# Compressão feita uma vez no build: nível máximo
+NIVEIS = {"br": 11, "gzip": 9}
+EXTENSOES = {"br": ".br", "gzip": ".gz"}
+
+
+def _pasta(rota: str) -> str:
+    """Pasta dos ficheiros de uma rota: o primeiro segmento do caminho ("GET /carro/12" -> "carro")."""
+    caminho = rota.split(" ", 2)[1]
+    return caminho.lstrip("/").split("?")[0].split("/")[0] or "raiz"
+
+
+def _ficheiros_manifest(manifest: Dict[str, Any]) -> Set[str]:
+    """Ficheiros de um manifest, com as cópias comprimidas."""
+    ficheiros = set()
+    for ficheiro, info in manifest.get("ficheiros", {}).items():
+        ficheiros.add(ficheiro)
+        ficheiros.update(ficheiro + EXTENSOES[c] for c in info.get("codificacoes", ()))
+    return ficheiros
+
+
+def ler_manifest(destino: Path) -> Dict[str, Any]:
+    caminho = destino / MANIFEST
+    if not caminho.exists():
+        return {}
+    return json.loads(caminho.read_text(encoding="utf-8"))
+
+
+def exportar(paginas: Iterable[Tuple[str, bytes]], destino: Path, dataset_version: str) -> Dict[str, Any]:
+    """Escreve `paginas` ((rota, corpo)) em `destino` e devolve o manifest escrito."""
+    destino.mkdir(parents=True, exist_ok=True)
+    anterior = ler_manifest(destino)
+    rotas: Dict[str, str] = {}
+    ficheiros: Dict[str, Dict[str, Any]] = {}
+
+    for rota, corpo in paginas:
+        ficheiro = f"{_pasta(rota)}/{hashlib.sha256(corpo).hexdigest()[:20]}.json"
+        rotas[rota] = ficheiro
+        if ficheiro in ficheiros:
+            # Corpos iguais (p.ex. a mesma lista de modelos para "go" e "gol") partilham o ficheiro
+            continue
+        caminho = destino / ficheiro
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        if not caminho.exists():
+            caminho.write_bytes(corpo)
+        info = {"bytes": len(corpo)}
+        if len(corpo) >= COMPRESSAO_MINIMO:
+            info["codificacoes"] = list(codificacoes_disponiveis())
+            for codificacao in info["codificacoes"]:
+                comprimido = destino / (ficheiro + EXTENSOES[codificacao])
+                if not comprimido.exists():
+                    comprimido.write_bytes(comprimir(corpo, codificacao, NIVEIS[codificacao]))
+        ficheiros[ficheiro] = info
+
+    manifest = {
+        "dataset_version": dataset_version,
+        "gerado_em": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "rotas": rotas,
+        "ficheiros": ficheiros,
+    }
+    caminho = destino / MANIFEST
+    temporario = caminho.with_suffix(".tmp")
+    temporario.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+    temporario.replace(caminho)
+
+    # Só depois do novo manifest publicado: apagar o que nenhum dos dois usa
+    manter = _ficheiros_manifest(manifest) | _ficheiros_manifest(anterior)
+    for pasta in {ficheiro.split("/")[0] for ficheiro in manter}:
+        for antigo in (destino / pasta).glob("*.json*"):
+            if f"{pasta}/{antigo.name}" not in manter:
+                antigo.unlink()
+    return manifest
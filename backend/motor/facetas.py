@@ -0,0 +1,111 @@
+"""
+Contagens de facetas (POST /facetas) por popcount de bitsets.
+
+Para um estado de filtros devolve quantos carros ficam em cada Tipo,
+Combustivel, extra e intervalo de Preco/Consumo/Bagageira. Cada dimensão
+é contada com todos os filtros menos o seu (ex.: as contagens por Tipo
+ignoram o filtro de tipo), para que a interface mostre o que acontece ao
+mudar essa opção. Os bitsets dos intervalos são construídos uma vez, a
+partir das colunas ordenadas do IndiceFiltros; uma consulta são ANDs e
+popcounts sobre palavras de 64 bits, sem DataFrames.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .filtros import Filtros
+from .indices import Bitset, IndiceFiltros
+
+# Coluna do histograma -> critério de Filtros que a restringe
+HISTOGRAMAS = {"Preco": "preco_max", "Consumo": "consumo_max", "Bagageira": "bagageira_min"}
+INTERVALOS = 10
+
+
+def limites_histograma(ordenados: np.ndarray, intervalos: int = INTERVALOS) -> np.ndarray:
+    """
+    Limites "redondos" (passo 1, 2, 2.5 ou 5 x 10^n) que cobrem os valores
+    ordenados; o último intervalo inclui o limite superior.
+    """
+    minimo, maximo = float(ordenados[0]), float(ordenados[-1])
+    if minimo == maximo:
+        return np.array([minimo, maximo])
+    bruto = (maximo - minimo) / intervalos
+    magnitude = 10 ** math.floor(math.log10(bruto))
+    passo = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= bruto)
+    inicio = math.floor(minimo / passo) * passo
+    quantos = max(1, math.ceil((maximo - inicio) / passo))
+    casas = max(0, 2 - math.floor(math.log10(passo)))
+    return np.round(inicio + passo * np.arange(quantos + 1), casas)
+
+
+def _numero(valor: float):
+    """Limite para JSON: inteiro quando não tem parte decimal."""
+    return int(valor) if float(valor).is_integer() else float(valor)
+
+
+class IndiceFacetas:
+    """Bitsets dos intervalos dos histogramas, sobre um IndiceFiltros."""
+
+    def __init__(self, indice: IndiceFiltros, intervalos: int = INTERVALOS):
+        self._indice = indice
+        # Extras contados: fixos no catálogo, não os que os pedidos filtrarem
+        self.extras: Dict[str, Bitset] = dict(indice.extras)
+        self.histogramas: Dict[str, Tuple[np.ndarray, List[Bitset]]] = {}
+        for coluna in HISTOGRAMAS:
+            if coluna not in indice.ordenadas:
+                continue
+            ordenados, ordem, validos = indice.ordenadas[coluna]
+            if validos == 0:
+                continue
+            limites = limites_histograma(ordenados[:validos], intervalos)
+            cortes = np.searchsorted(ordenados[:validos], limites, side="left")
+            cortes[-1] = validos  # o último intervalo inclui o máximo
+            self.histogramas[coluna] = (limites, [
+                Bitset.de_posicoes(ordem[a:b], indice.n) for a, b in zip(cortes[:-1], cortes[1:])
+            ])
+
+    def _sem(self, criterios: Sequence[Tuple[str, Bitset]], excluir: Optional[str] = None) -> Bitset:
+        """AND dos critérios, exceto os de nome `excluir`."""
+        selecionados = self._indice.todos()
+        for nome, bits in criterios:
+            if nome != excluir:
+                selecionados = selecionados & bits
+        return selecionados
+
+    def contar(self, filtros: Filtros) -> Dict[str, Any]:
+        """Total filtrado e contagens por valor/intervalo de cada dimensão."""
+        criterios = filtros.criterios(self._indice)
+        todos = self._sem(criterios)
+
+        def por_valor(coluna: str, excluir: str) -> List[Dict[str, Any]]:
+            bitsets = self._indice.categorias.get(coluna, {})
+            base = self._sem(criterios, excluir)
+            return [
+                {"valor": valor, "total": (base & bits).contar()}
+                for valor, bits in sorted(bitsets.items(), key=lambda item: str(item[0]))
+            ]
+
+        histogramas = {}
+        for coluna, (limites, bitsets) in self.histogramas.items():
+            base = self._sem(criterios, HISTOGRAMAS[coluna])
+            histogramas[coluna] = [
+                {"min": _numero(a), "max": _numero(b), "total": (base & bits).contar()}
+                for a, b, bits in zip(limites[:-1], limites[1:], bitsets)
+            ]
+
+        return {
+            "total": todos.contar(),
+            "tipos": por_valor("Tipo", "tipo"),
+            "combustiveis": por_valor("Combustivel", "combustivel"),
+            "extras": [
+                {"valor": extra, "total": (todos & bits).contar()}
+                for extra, bits in self.extras.items()
+            ],
+            "histogramas": histogramas,
+        }
+
+    @property
+    def tamanho_bytes(self) -> int:
+        return sum(b.palavras.nbytes for _, bitsets in self.histogramas.values() for b in bitsets)
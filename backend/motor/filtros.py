@@ -0,0 +1,169 @@
+"""
+Filtros de pesquisa do catálogo, independentes do formato do pedido.
+
+backend/api.py (um tipo/combustível) e car_filter.py (listas) convertem
+os respetivos pedidos num Filtros; aplicá-lo é um AND de bitsets do
+IndiceFiltros. Um Filtros também sabe se é um refinamento de outro e
+testar-se só sobre as linhas que esse outro já selecionou.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from .colunas import nome_canonico
+from .indices import Bitset, IndiceFiltros
+from .metricas import cronometro_atual
+
+
+def _restringir(selecionados: Bitset, nome: str, bits: Bitset) -> Bitset:
+    """AND de um filtro; num pedido medido regista linhas analisadas/selecionadas."""
+    resultado = selecionados & bits
+    cronometro = cronometro_atual()
+    if cronometro is not None:
+        cronometro.filtro(nome, selecionados.contar(), resultado.contar())
+    return resultado
+
+
+@dataclass(frozen=True)
+class Filtros:
+    """Critérios de filtragem (None/vazio = critério não aplicado)."""
+
+    preco_max: Optional[float] = None
+    tipos: Tuple[str, ...] = ()
+    combustiveis: Tuple[str, ...] = ()
+    bagageira_min: Optional[float] = None
+    consumo_max: Optional[float] = None
+    extras: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        # Listas passam a tuplos (hashable) e os extras a nomes do motor
+        object.__setattr__(self, "tipos", tuple(self.tipos))
+        object.__setattr__(self, "combustiveis", tuple(self.combustiveis))
+        object.__setattr__(self, "extras", tuple(nome_canonico(e) for e in self.extras))
+
+    def normalizado(self) -> "Filtros":
+        """Os mesmos critérios com tipos, combustíveis e extras ordenados e sem repetições."""
+        return Filtros(
+            preco_max=self.preco_max,
+            tipos=tuple(sorted(set(self.tipos), key=str)),
+            combustiveis=tuple(sorted(set(self.combustiveis), key=str)),
+            bagageira_min=self.bagageira_min,
+            consumo_max=self.consumo_max,
+            extras=tuple(sorted(set(self.extras))),
+        )
+
+    def refina(self, outro: "Filtros") -> bool:
+        """Cada critério de `outro` está aqui, igual ou mais apertado (logo, linhas ⊆ as de `outro`)?"""
+        def ate(novo, anterior):
+            return anterior is None or (novo is not None and novo <= anterior)
+
+        def desde(novo, anterior):
+            return anterior is None or (novo is not None and novo >= anterior)
+
+        def dentro(novos, anteriores):
+            return not anteriores or (bool(novos) and set(novos) <= set(anteriores))
+
+        return (
+            ate(self.preco_max, outro.preco_max)
+            and dentro(self.tipos, outro.tipos)
+            and dentro(self.combustiveis, outro.combustiveis)
+            and desde(self.bagageira_min, outro.bagageira_min)
+            and ate(self.consumo_max, outro.consumo_max)
+            and set(outro.extras) <= set(self.extras)
+        )
+
+    def criterios(self, indice: IndiceFiltros) -> List[Tuple[str, Bitset]]:
+        """Bitset de cada critério aplicado, com o nome usado nas métricas."""
+        criterios = []
+
+        if self.preco_max is not None:
+            criterios.append(("preco_max", indice.ate("Preco", self.preco_max)))
+
+        if self.tipos:
+            criterios.append(("tipo", indice.em("Tipo", self.tipos)))
+
+        if self.combustiveis:
+            criterios.append(("combustivel", indice.em("Combustivel", self.combustiveis)))
+
+        if self.bagageira_min is not None:
+            criterios.append(("bagageira_min", indice.desde("Bagageira", self.bagageira_min)))
+
+        if self.consumo_max is not None:
+            criterios.append(("consumo_max", indice.ate("Consumo", self.consumo_max)))
+
+        # Extras sem coluna no catálogo são ignorados
+        for extra in self.extras:
+            if indice.tem_coluna(extra):
+                criterios.append((f"extra:{extra}", indice.extra(extra)))
+
+        return criterios
+
+    def testes(self, indice: IndiceFiltros) -> List[Tuple[str, Callable[[np.ndarray], np.ndarray]]]:
+        """Os critérios de criterios() como testes sobre posições (máscara), sem bitsets do catálogo."""
+        testes = []
+
+        if self.preco_max is not None:
+            testes.append(("preco_max", lambda pos: indice.valores("Preco", pos) <= self.preco_max))
+
+        if self.tipos:
+            testes.append(("tipo", lambda pos: indice.em("Tipo", self.tipos).contem(pos)))
+
+        if self.combustiveis:
+            testes.append(("combustivel", lambda pos: indice.em("Combustivel", self.combustiveis).contem(pos)))
+
+        if self.bagageira_min is not None:
+            testes.append(("bagageira_min", lambda pos: indice.valores("Bagageira", pos) >= self.bagageira_min))
+
+        if self.consumo_max is not None:
+            testes.append(("consumo_max", lambda pos: indice.valores("Consumo", pos) <= self.consumo_max))
+
+        for extra in self.extras:
+            if indice.tem_coluna(extra):
+                testes.append((f"extra:{extra}", lambda pos, extra=extra: indice.extra(extra).contem(pos)))
+
+        return testes
+
+    def aplicar(self, indice: IndiceFiltros) -> Bitset:
+        """Linhas do catálogo que satisfazem todos os critérios."""
+        selecionados = indice.todos()
+        for nome, bits in self.criterios(indice):
+            selecionados = _restringir(selecionados, nome, bits)
+        return selecionados
+
+    def _valores_criterios(self) -> dict:
+        """Nome de cada critério (como em testes()) -> valor que o define."""
+        valores = {
+            "preco_max": self.preco_max,
+            "tipo": frozenset(self.tipos),
+            "combustivel": frozenset(self.combustiveis),
+            "bagageira_min": self.bagageira_min,
+            "consumo_max": self.consumo_max,
+        }
+        valores.update((f"extra:{extra}", True) for extra in self.extras)
+        return valores
+
+    def aplicar_em(
+        self, indice: IndiceFiltros, posicoes: np.ndarray, anterior: Optional["Filtros"] = None,
+    ) -> np.ndarray:
+        """
+        Índices de `posicoes` que satisfazem todos os critérios (custo
+        O(len(posicoes))). Se as posições já satisfazem `anterior`, os
+        critérios iguais aos dele não são testados outra vez.
+        """
+        cumpridos = set()
+        if anterior is not None:
+            proprios = self._valores_criterios()
+            cumpridos = {nome for nome, valor in anterior._valores_criterios().items() if proprios.get(nome) == valor}
+
+        dentro = np.arange(len(posicoes))
+        cronometro = cronometro_atual()
+        for nome, teste in self.testes(indice):
+            if nome in cumpridos:
+                continue
+            passam = dentro[teste(posicoes[dentro])]
+            if cronometro is not None:
+                cronometro.filtro(nome, len(dentro), len(passam))
+            dentro = passam
+        return dentro
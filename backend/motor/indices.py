@@ -0,0 +1,168 @@
+"""
+Índice de filtros construído uma vez no carregamento do catálogo.
+
+Cada valor categórico (Tipo, Combustivel) e cada extra tem um bitset com
+as linhas que o satisfazem; as colunas numéricas guardam os valores
+ordenados, pelo que um filtro de intervalo é um searchsorted. Aplicar
+filtros passa a ser um AND de bitsets, sem DataFrames intermédios.
+"""
+
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAS = ("Tipo", "Combustivel")
+NUMERICAS = ("Preco", "Bagageira", "Consumo")
+EXTRAS = ("Airbag", "AC", "Camera", "GPS", "ABS", "ESP", "Sensor")
+
+
+class Bitset:
+    """Conjunto de linhas do catálogo, 1 bit por linha em palavras de 64 bits."""
+
+    __slots__ = ("palavras", "n")
+
+    def __init__(self, palavras: np.ndarray, n: int):
+        self.palavras = palavras
+        self.n = n
+
+    @classmethod
+    def de_mascara(cls, mascara: np.ndarray) -> "Bitset":
+        n = len(mascara)
+        octetos = np.packbits(mascara, bitorder="little")
+        palavras = np.zeros((len(octetos) + 7) // 8, dtype=np.uint64)
+        palavras.view(np.uint8)[:len(octetos)] = octetos
+        return cls(palavras, n)
+
+    @classmethod
+    def de_posicoes(cls, posicoes: np.ndarray, n: int) -> "Bitset":
+        mascara = np.zeros(n, dtype=bool)
+        mascara[posicoes] = True
+        return cls.de_mascara(mascara)
+
+    @classmethod
+    def vazio(cls, n: int) -> "Bitset":
+        return cls(np.zeros((n + 63) // 64, dtype=np.uint64), n)
+
+    @classmethod
+    def cheio(cls, n: int) -> "Bitset":
+        return cls.de_mascara(np.ones(n, dtype=bool))
+
+    def __and__(self, outro: "Bitset") -> "Bitset":
+        return Bitset(self.palavras & outro.palavras, self.n)
+
+    def __or__(self, outro: "Bitset") -> "Bitset":
+        return Bitset(self.palavras | outro.palavras, self.n)
+
+    def contar(self) -> int:
+        """Número de linhas no conjunto (popcount)."""
+        return int(np.bitwise_count(self.palavras).sum())
+
+    def contem(self, posicoes: np.ndarray) -> np.ndarray:
+        """Máscara com True nas `posicoes` que estão no conjunto (sem expandir os bits todos)."""
+        bits = self.palavras[posicoes >> 6] >> (posicoes & 63).astype(np.uint64)
+        return (bits & np.uint64(1)).astype(bool)
+
+    def mascara(self) -> np.ndarray:
+        return np.unpackbits(
+            self.palavras.view(np.uint8), count=self.n, bitorder="little"
+        ).view(bool)
+
+    def posicoes(self) -> np.ndarray:
+        """Posições das linhas no conjunto, por ordem crescente."""
+        return np.flatnonzero(self.mascara())
+
+
+class IndiceFiltros:
+    """Bitsets por valor/extra e colunas numéricas ordenadas de um catálogo."""
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        categoricas: Sequence[str] = CATEGORICAS,
+        numericas: Sequence[str] = NUMERICAS,
+        extras: Sequence[str] = EXTRAS,
+    ):
+        self.n = len(df)
+        self._df = df
+        self._todos = Bitset.cheio(self.n)
+
+        self.categorias: Dict[str, Dict[object, Bitset]] = {}
+        for coluna in categoricas:
+            if coluna in df.columns:
+                grupos = df.groupby(coluna, sort=False, observed=True).indices
+                self.categorias[coluna] = {
+                    valor: Bitset.de_posicoes(pos, self.n)
+                    for valor, pos in grupos.items()
+                }
+
+        self.ordenadas: Dict[str, Tuple[np.ndarray, np.ndarray, int]] = {}
+        tipo_posicao = np.int32 if self.n < 2**31 else np.int64
+        for coluna in numericas:
+            if coluna in df.columns:
+                valores = pd.to_numeric(df[coluna], errors="coerce").to_numpy(dtype=np.float64)
+                ordem = np.argsort(valores, kind="stable").astype(tipo_posicao)
+                validos = int(np.count_nonzero(~np.isnan(valores)))
+                self.ordenadas[coluna] = (valores[ordem], ordem, validos)
+
+        # Todos os extras conhecidos (EXTRAS e colunas booleanas), construídos
+        # já: o índice de um catálogo partilhado não muda com os pedidos
+        self.extras: Dict[str, Bitset] = {}
+        for coluna in df.columns:
+            if coluna in extras or pd.api.types.is_bool_dtype(df[coluna]):
+                self.extras[coluna] = self._bits_extra(coluna)
+
+    @property
+    def tamanho_bytes(self) -> int:
+        bitsets = [b for valores in self.categorias.values() for b in valores.values()]
+        bitsets += list(self.extras.values())
+        return (
+            sum(b.palavras.nbytes for b in bitsets)
+            + sum(ordenados.nbytes + ordem.nbytes for ordenados, ordem, _ in self.ordenadas.values())
+        )
+
+    def todos(self) -> Bitset:
+        return self._todos
+
+    def tem_coluna(self, coluna: str) -> bool:
+        return coluna in self._df.columns
+
+    def igual(self, coluna: str, valor) -> Bitset:
+        """Linhas com `coluna == valor`."""
+        return self.categorias[coluna].get(valor) or Bitset.vazio(self.n)
+
+    def em(self, coluna: str, valores: Iterable) -> Bitset:
+        """Linhas com `coluna` em `valores` (equivalente a isin)."""
+        resultado = Bitset.vazio(self.n)
+        for valor in valores:
+            resultado = resultado | self.igual(coluna, valor)
+        return resultado
+
+    def ate(self, coluna: str, maximo: float) -> Bitset:
+        """Linhas com `coluna <= maximo` (NaN excluído)."""
+        ordenados, ordem, validos = self.ordenadas[coluna]
+        fim = int(np.searchsorted(ordenados[:validos], maximo, side="right"))
+        return Bitset.de_posicoes(ordem[:fim], self.n)
+
+    def desde(self, coluna: str, minimo: float) -> Bitset:
+        """Linhas com `coluna >= minimo` (NaN excluído)."""
+        ordenados, ordem, validos = self.ordenadas[coluna]
+        inicio = int(np.searchsorted(ordenados[:validos], minimo, side="left"))
+        return Bitset.de_posicoes(ordem[inicio:validos], self.n)
+
+    def valores(self, coluna: str, posicoes: np.ndarray) -> np.ndarray:
+        """Valores numéricos de `coluna` só nas `posicoes` (NaN = em falta), como em ate()/desde()."""
+        serie = self._df[coluna]
+        if serie.dtype.kind in "iuf":
+            # Coluna numpy: recolhe só as posições, sem passar pelo pandas
+            return serie.to_numpy()[posicoes].astype(np.float64)
+        return pd.to_numeric(serie.iloc[posicoes], errors="coerce").to_numpy(dtype=np.float64)
+
+    def _bits_extra(self, coluna: str) -> Bitset:
+        return Bitset.de_mascara((self._df[coluna] == True).to_numpy(dtype=bool))  # noqa: E712
+
+    def extra(self, coluna: str) -> Bitset:
+        """Linhas com `coluna == True` (colunas fora de `extras` são calculadas sem guardar)."""
+        bits = self.extras.get(coluna)
+        return bits if bits is not None else self._bits_extra(coluna)
+
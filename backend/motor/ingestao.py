@@ -0,0 +1,504 @@
+"""
+Ingestão de CSV/Excel aos blocos, validada contra o esquema do catálogo.
+
+O ficheiro nunca é lido de uma vez: o CSV com read_csv(chunksize=...) e
+todas as colunas lidas como texto (dtype=str), o .xlsx com openpyxl em
+modo read_only. Cada bloco é validado e normalizado contra ESQUEMA
+(cabeçalhos por extenso como `Preço Indicativo (€)` passam a `Preco`)
+e as colunas vão sendo acrescentadas diretamente aos ficheiros do
+snapshot:
+
+    python -m motor snapshot feed.csv --bloco 50000
+
+A memória usada depende do tamanho do bloco e do número de textos
+distintos (categorias), não do número de linhas.
+
+Linhas sem Marca/Modelo são rejeitadas; números inválidos ou fora do
+intervalo do esquema ficam em falta e extras inválidos ficam False.
+Tudo é contado no RelatorioIngestao e, no snapshot, listado linha a
+linha em problemas.csv.
+
+Os tipos finais são os que o read_csv/read_excel inferia para dados
+limpos: colunas numéricas só com inteiros e sem faltas ficam int64, as
+restantes float64; colunas fora do esquema ficam booleanas/numéricas se
+todos os valores o forem, texto caso contrário.
+"""
+
+import csv
+import itertools
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .colunas import mapa_canonico
+from .snapshot import MANIFEST, descodificar, escrever_manifest
+
+TAMANHO_BLOCO = 50_000
+# Elementos copiados de cada vez dos ficheiros parciais para os .npy finais
+BLOCO_COPIA = 1 << 20
+MAXIMO_EXEMPLOS = 20
+PROBLEMAS = "problemas.csv"
+FORMATOS = (".csv", ".xlsx", ".xls")
+
+VERDADEIROS = frozenset({"true", "1", "1.0", "sim", "s", "yes", "verdadeiro"})
+FALSOS = frozenset({"false", "0", "0.0", "não", "nao", "n", "no", "falso"})
+# Textos tratados como valor em falta (o read_csv já os converte; o CSV
+# colado numa coluna de Excel não)
+EM_FALTA = frozenset({"", "na", "n/a", "nan", "null", "none"})
+
+
+class ErroEsquema(ValueError):
+    """O ficheiro não tem as colunas obrigatórias do esquema."""
+
+
+@dataclass(frozen=True)
+class Campo:
+    """Coluna declarada do catálogo."""
+
+    tipo: str  # "texto", "numero" ou "booleano"
+    obrigatorio: bool = False
+    minimo: Optional[float] = None
+    maximo: Optional[float] = None
+
+
+ESQUEMA: Dict[str, Campo] = {
+    "Marca": Campo("texto", obrigatorio=True),
+    "Modelo": Campo("texto", obrigatorio=True),
+    "Ano": Campo("numero", minimo=1900, maximo=2100),
+    "Tipo": Campo("texto"),
+    "Motor": Campo("texto"),
+    "Potencia": Campo("numero", minimo=0, maximo=2000),
+    "Consumo": Campo("numero", minimo=0, maximo=100),
+    "0-100": Campo("numero", minimo=0, maximo=100),
+    "Velocidade": Campo("numero", minimo=0, maximo=600),
+    "Bagageira": Campo("numero", minimo=0, maximo=10_000),
+    "Combustivel": Campo("texto"),
+    "Preco": Campo("numero", minimo=0, maximo=10_000_000),
+    "Airbag": Campo("booleano"),
+    "AC": Campo("booleano"),
+    "Camera": Campo("booleano"),
+    "GPS": Campo("booleano"),
+    "ABS": Campo("booleano"),
+    "ESP": Campo("booleano"),
+    "Sensor": Campo("booleano"),
+}
+
+
+# ==================== LEITURA AOS BLOCOS ====================
+
+class Fonte:
+    """Cabeçalho e blocos (DataFrames) de um ficheiro de dados."""
+
+    def __init__(self, cabecalho: List[str], blocos: Iterator[pd.DataFrame], textual: bool):
+        self.cabecalho = cabecalho
+        self.blocos = blocos
+        # True se as células chegam como texto (CSV); False se já vêm
+        # tipadas (números/booleanos do Excel)
+        self.textual = textual
+
+
+def _agrupar(linhas: Iterable[Tuple], cabecalho: List[str], tamanho: int) -> Iterator[pd.DataFrame]:
+    """DataFrames de `tamanho` linhas, sem as linhas totalmente vazias."""
+    n = len(cabecalho)
+    lote: List[Tuple] = []
+    for linha in linhas:
+        linha = tuple(linha[:n])
+        if all(v is None or v == "" for v in linha):
+            continue
+        lote.append(linha + (None,) * (n - len(linha)))
+        if len(lote) == tamanho:
+            yield pd.DataFrame.from_records(lote, columns=range(n))
+            lote = []
+    if lote:
+        yield pd.DataFrame.from_records(lote, columns=range(n))
+
+
+def _fonte_csv(origem: Path, tamanho: int) -> Fonte:
+    opcoes = dict(encoding="utf-8", delimiter=",", dtype=str)
+    cabecalho = [str(c) for c in pd.read_csv(origem, nrows=0, **opcoes).columns]
+
+    def blocos():
+        with pd.read_csv(origem, chunksize=tamanho, **opcoes) as leitor:
+            yield from leitor
+
+    return Fonte(cabecalho, blocos(), textual=True)
+
+
+def _fonte_xlsx(origem: Path, tamanho: int) -> Fonte:
+    import openpyxl
+
+    livro = openpyxl.load_workbook(origem, read_only=True, data_only=True)
+    linhas = livro.worksheets[0].iter_rows(values_only=True)
+    primeira = list(next(linhas, ()))
+    while primeira and primeira[-1] is None:
+        primeira.pop()
+
+    if len(primeira) == 1 and isinstance(primeira[0], str) and "," in primeira[0]:
+        # CSV colado numa só coluna (uma linha de texto por célula, como em
+        # "Carros pt 50.xlsx"): as células são lidas como linhas de CSV
+        leitor = csv.reader(itertools.chain(
+            [primeira[0]], (str(linha[0]) for linha in linhas if linha and linha[0] is not None),
+        ))
+        cabecalho = next(leitor)
+        textual = True
+        linhas = leitor
+    else:
+        cabecalho = ["" if c is None else str(c) for c in primeira]
+        textual = False
+
+    def blocos():
+        try:
+            yield from _agrupar(linhas, cabecalho, tamanho)
+        finally:
+            livro.close()
+
+    return Fonte(cabecalho, blocos(), textual)
+
+
+def _fonte_xls(origem: Path, tamanho: int) -> Fonte:
+    # O formato antigo não tem leitura em streaming: um único bloco
+    df = pd.read_excel(origem, dtype=object)
+    df.columns = [str(c) for c in df.columns]
+    blocos = (df.iloc[i:i + tamanho] for i in range(0, len(df), tamanho))
+    return Fonte(list(df.columns), blocos, textual=False)
+
+
+def abrir_fonte(origem: Path, tamanho: int = TAMANHO_BLOCO) -> Fonte:
+    """Fonte aos blocos de um CSV/Excel (ValueError se o formato não for suportado)."""
+    sufixo = origem.suffix.lower()
+    if sufixo == ".csv":
+        return _fonte_csv(origem, tamanho)
+    if sufixo == ".xlsx":
+        return _fonte_xlsx(origem, tamanho)
+    if sufixo == ".xls":
+        return _fonte_xls(origem, tamanho)
+    raise ValueError(f"Formato de ficheiro não suportado: {origem}")
+
+
+# ==================== RELATÓRIO ====================
+
+class RelatorioIngestao:
+    """Contagens e exemplos das linhas rejeitadas e dos valores corrigidos."""
+
+    def __init__(self, origem: Path, mapeamento: Dict[str, str],
+                 colunas_extra: List[str], colunas_em_falta: List[str]):
+        self.origem = origem
+        self.mapeamento = mapeamento
+        self.colunas_extra = colunas_extra
+        self.colunas_em_falta = colunas_em_falta
+        self.linhas_lidas = 0
+        self.linhas_rejeitadas = 0
+        self.valores_corrigidos = 0
+        self.problemas: Dict[str, int] = {}
+        self.exemplos: List[Dict[str, Any]] = []
+        # Escritor de problemas.csv (só na ingestão para snapshot)
+        self.escritor: Optional[Any] = None
+
+    @property
+    def linhas_aceites(self) -> int:
+        return self.linhas_lidas - self.linhas_rejeitadas
+
+    def registar(self, linhas: np.ndarray, coluna: str, valores: Iterable[Any], motivo: str):
+        """Regista o mesmo problema em várias linhas (números de linha do ficheiro)."""
+        if len(linhas) == 0:
+            return
+        chave = f"{coluna}: {motivo}"
+        self.problemas[chave] = self.problemas.get(chave, 0) + len(linhas)
+        pares = zip(linhas.tolist(), valores)
+        if self.escritor is not None:
+            pares = list(pares)
+            self.escritor.writerows((linha, coluna, valor, motivo) for linha, valor in pares)
+        for linha, valor in itertools.islice(pares, max(0, MAXIMO_EXEMPLOS - len(self.exemplos))):
+            self.exemplos.append({
+                "linha": linha, "coluna": coluna,
+                "valor": None if valor is None else str(valor), "motivo": motivo,
+            })
+
+    def resumo(self) -> Dict[str, Any]:
+        return {
+            "origem": self.origem.name,
+            "linhas_lidas": self.linhas_lidas,
+            "linhas_aceites": self.linhas_aceites,
+            "linhas_rejeitadas": self.linhas_rejeitadas,
+            "valores_corrigidos": self.valores_corrigidos,
+            "colunas_renomeadas": self.mapeamento,
+            "colunas_extra": self.colunas_extra,
+            "colunas_em_falta": self.colunas_em_falta,
+            "problemas": self.problemas,
+            "exemplos": self.exemplos,
+        }
+
+    def imprimir(self):
+        print(f"🧾 Ingestão de {self.origem.name}: {self.linhas_aceites}/{self.linhas_lidas} linhas aceites, "
+              f"{self.linhas_rejeitadas} rejeitadas, {self.valores_corrigidos} valores corrigidos")
+        if self.colunas_extra:
+            print(f"   ➕ Colunas fora do esquema: {self.colunas_extra}")
+        if self.colunas_em_falta:
+            print(f"   ➖ Colunas do esquema em falta: {self.colunas_em_falta}")
+        for chave, contagem in self.problemas.items():
+            print(f"   ⚠️ {chave} ({contagem})")
+
+
+# ==================== VALIDAÇÃO ====================
+
+def _normalizar(valor: Any) -> Optional[str]:
+    """Célula como str sem espaços nas pontas; None se vazia/NA."""
+    texto = str(valor).strip()
+    return None if texto.lower() in EM_FALTA else texto
+
+
+def _categorizar(serie: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Códigos (-1 = em falta) e valores distintos, já normalizados, de uma
+    coluna. A normalização corre uma vez por valor distinto, não por célula.
+    """
+    codigos, unicos = pd.factorize(serie)
+    recodigos, distintos = pd.factorize(pd.Series([_normalizar(u) for u in unicos], dtype=object))
+    return np.append(recodigos, -1)[codigos], np.asarray(distintos, dtype=object)
+
+
+def _sem_decimais(tokens: pd.Series) -> bool:
+    """Se nenhum número escrito em texto tem parte decimal ou expoente."""
+    return not tokens.str.contains(r"[.eE]", regex=True).any()
+
+
+class _Coluna:
+    """Estado acumulado de uma coluna ao longo dos blocos."""
+
+    def __init__(self, nome: str, campo: Optional[Campo]):
+        self.nome = nome
+        self.campo = campo
+        # Colunas fora do esquema são guardadas como texto e tipadas no fim
+        self.tipo = campo.tipo if campo else "livre"
+        self.dtype = {"numero": np.float64, "booleano": np.bool_}.get(self.tipo, np.int32)
+        self.categorias: Dict[Any, int] = {}
+        self.inteiros = True
+        self.faltas = 0
+
+    def codificar(self, codigos: np.ndarray, distintos: np.ndarray) -> np.ndarray:
+        """Códigos do bloco passados para as categorias acumuladas da coluna."""
+        tabela = [self.categorias.setdefault(valor, len(self.categorias)) for valor in distintos]
+        self.faltas += int((codigos < 0).sum())
+        return np.array(tabela + [-1], dtype=np.int32)[codigos]
+
+    def finalizar(self, textual: bool) -> Tuple[Dict[str, Any], Callable[[np.ndarray], np.ndarray]]:
+        """Descrição da coluna no manifest e conversão dos valores acumulados."""
+        if self.tipo == "numero":
+            dtype = np.int64 if self.inteiros and self.faltas == 0 else np.float64
+            return {"tipo": "numerica", "dtype": np.dtype(dtype).name}, lambda v: v.astype(dtype)
+        if self.tipo == "booleano":
+            return {"tipo": "numerica", "dtype": "bool"}, lambda v: v
+
+        categorias = list(self.categorias)
+        if self.tipo == "livre" and categorias:
+            minusculas = [str(c).lower() for c in categorias]
+            if set(minusculas) <= {"true", "false"}:
+                booleanos = [c == "true" for c in minusculas]
+                if self.faltas:
+                    return {"tipo": "categorica", "categorias": booleanos}, lambda v: v
+                tabela = np.array(booleanos)
+                return {"tipo": "numerica", "dtype": "bool"}, lambda v: tabela[v]
+
+            numeros = pd.to_numeric(pd.Series(categorias, dtype=object), errors="coerce").to_numpy(np.float64)
+            if not np.isnan(numeros).any():
+                inteiros = (
+                    _sem_decimais(pd.Series(categorias, dtype=str)) if textual
+                    else bool(np.all(numeros == np.floor(numeros)))
+                )
+                if inteiros and self.faltas == 0:
+                    tabela = numeros.astype(np.int64)
+                    return {"tipo": "numerica", "dtype": "int64"}, lambda v: tabela[v]
+                tabela = np.append(numeros, np.nan)
+                return {"tipo": "numerica", "dtype": "float64"}, lambda v: tabela[v]
+
+        return {"tipo": "categorica", "categorias": categorias}, lambda v: v
+
+
+class Ingestao:
+    """Validação bloco a bloco de uma Fonte contra ESQUEMA."""
+
+    def __init__(self, fonte: Fonte, origem: Path, nomes_originais: bool = False):
+        self.fonte = fonte
+        mapa = mapa_canonico(fonte.cabecalho)
+        canonicos = [mapa.get(c, c) for c in fonte.cabecalho]
+
+        em_falta = [nome for nome in ESQUEMA if nome not in canonicos]
+        obrigatorias = [nome for nome in em_falta if ESQUEMA[nome].obrigatorio]
+        if obrigatorias:
+            raise ErroEsquema(f"Colunas obrigatórias em falta em {origem.name}: {obrigatorias}")
+
+        self.colunas = [_Coluna(nome, ESQUEMA.get(nome)) for nome in canonicos]
+        self.nomes = list(fonte.cabecalho) if nomes_originais else canonicos
+        self.relatorio = RelatorioIngestao(
+            origem, mapa,
+            colunas_extra=[nome for nome in canonicos if nome not in ESQUEMA],
+            colunas_em_falta=em_falta,
+        )
+
+    def blocos(self) -> Iterator[List[np.ndarray]]:
+        """Arrays validados de cada coluna, bloco a bloco."""
+        for bloco in self.fonte.blocos:
+            yield self.validar(bloco)
+
+    def validar(self, bloco: pd.DataFrame) -> List[np.ndarray]:
+        relatorio = self.relatorio
+        textual = self.fonte.textual
+        # Linha no ficheiro, com o cabeçalho na linha 1 (linhas em branco não contam)
+        linhas = np.arange(len(bloco)) + relatorio.linhas_lidas + 2
+        relatorio.linhas_lidas += len(bloco)
+
+        # Texto, booleanos e colunas fora do esquema passam a códigos dos
+        # valores distintos; as numéricas ficam como vieram
+        colunas = [
+            bloco.iloc[:, i] if coluna.tipo == "numero" else _categorizar(bloco.iloc[:, i])
+            for i, coluna in enumerate(self.colunas)
+        ]
+
+        # Linhas sem as colunas obrigatórias não entram no catálogo
+        rejeitadas = np.zeros(len(bloco), dtype=bool)
+        for coluna, valores in zip(self.colunas, colunas):
+            if coluna.campo is not None and coluna.campo.obrigatorio:
+                falta = valores[0] < 0
+                relatorio.registar(linhas[falta & ~rejeitadas], coluna.nome,
+                                   itertools.repeat(None), "obrigatória em falta")
+                rejeitadas |= falta
+        if rejeitadas.any():
+            relatorio.linhas_rejeitadas += int(rejeitadas.sum())
+            manter = ~rejeitadas
+            linhas = linhas[manter]
+            colunas = [
+                valores[manter] if coluna.tipo == "numero" else (valores[0][manter], valores[1])
+                for coluna, valores in zip(self.colunas, colunas)
+            ]
+
+        resultado = []
+        for coluna, valores in zip(self.colunas, colunas):
+            if coluna.tipo == "numero":
+                resultado.append(self._numeros(coluna, valores, linhas, textual))
+            elif coluna.tipo == "booleano":
+                resultado.append(self._booleanos(coluna, *valores, linhas))
+            else:
+                resultado.append(coluna.codificar(*valores))
+        return resultado
+
+    def _booleanos(self, coluna: _Coluna, codigos: np.ndarray, distintos: np.ndarray,
+                   linhas: np.ndarray) -> np.ndarray:
+        minusculas = [valor.lower() for valor in distintos]
+        # Última posição = código -1 (em falta): extra ausente, sem aviso
+        verdadeiro = np.array([m in VERDADEIROS for m in minusculas] + [False])
+        valido = np.array([m in VERDADEIROS or m in FALSOS for m in minusculas] + [True])
+        invalidos = ~valido[codigos]
+        self.relatorio.registar(linhas[invalidos], coluna.nome, distintos[codigos[invalidos]], "não booleano")
+        self.relatorio.valores_corrigidos += int(invalidos.sum())
+        return verdadeiro[codigos]
+
+    def _numeros(self, coluna: _Coluna, valores: pd.Series, linhas: np.ndarray, textual: bool) -> np.ndarray:
+        relatorio = self.relatorio
+        convertidos = pd.to_numeric(valores, errors="coerce")
+        numeros = convertidos.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        # Só as células que não deram número são normalizadas ("" e "NA" são faltas)
+        invalidos = np.isnan(numeros) & valores.notna().to_numpy()
+        if invalidos.any():
+            invalidos[invalidos] = [_normalizar(v) is not None for v in valores[invalidos]]
+        relatorio.registar(linhas[invalidos], coluna.nome, valores[invalidos], "não numérico")
+
+        campo = coluna.campo
+        with np.errstate(invalid="ignore"):
+            fora = (numeros < campo.minimo) | (numeros > campo.maximo)
+        relatorio.registar(linhas[fora], coluna.nome, numeros[fora].tolist(),
+                           f"fora do intervalo [{campo.minimo:g}, {campo.maximo:g}]")
+        numeros[fora] = np.nan
+        relatorio.valores_corrigidos += int(invalidos.sum() + fora.sum())
+
+        validos = ~np.isnan(numeros)
+        coluna.faltas += int((~validos).sum())
+        # Bloco todo em inteiros (dtype int do to_numeric) dispensa olhar para o texto
+        if coluna.inteiros and validos.any() and not pd.api.types.is_integer_dtype(convertidos.dtype):
+            coluna.inteiros = bool(np.all(numeros[validos] == np.floor(numeros[validos]))) and (
+                not textual or _sem_decimais(valores[validos])
+            )
+        return numeros
+
+
+# ==================== DESTINOS ====================
+
+def ler_validado(
+    origem: Path, tamanho_bloco: int = TAMANHO_BLOCO, nomes_originais: bool = False,
+) -> Tuple[pd.DataFrame, RelatorioIngestao]:
+    """
+    DataFrame validado de um CSV/Excel e o relatório da ingestão.
+
+    Com `nomes_originais` as colunas mantêm os cabeçalhos do ficheiro
+    (car_filter.py); por omissão ficam com os nomes do motor.
+    """
+    ingestao = Ingestao(abrir_fonte(Path(origem), tamanho_bloco), Path(origem), nomes_originais)
+    partes: List[List[np.ndarray]] = [[] for _ in ingestao.colunas]
+    for arrays in ingestao.blocos():
+        for parte, valores in zip(partes, arrays):
+            parte.append(valores)
+
+    dados = {}
+    for nome, coluna, parte in zip(ingestao.nomes, ingestao.colunas, partes):
+        valores = np.concatenate(parte) if parte else np.empty(0, dtype=coluna.dtype)
+        descricao, converter = coluna.finalizar(ingestao.fonte.textual)
+        valores = converter(valores)
+        if descricao["tipo"] == "categorica":
+            valores = descodificar(valores, descricao["categorias"])
+        dados[nome] = valores
+    return pd.DataFrame(dados, columns=ingestao.nomes), ingestao.relatorio
+
+
+def ingerir_snapshot(
+    origem: Path, destino: Path, tamanho_bloco: int = TAMANHO_BLOCO,
+) -> RelatorioIngestao:
+    """
+    Escreve o snapshot de `origem` em `destino` sem carregar o ficheiro inteiro.
+
+    Cada bloco validado é acrescentado a um ficheiro parcial por coluna;
+    no fim os parciais são copiados (aos blocos) para os .npy com o tipo
+    final e o manifest é escrito por último, com o resumo da ingestão.
+    """
+    origem = Path(origem)
+    ingestao = Ingestao(abrir_fonte(origem, tamanho_bloco), origem)
+    destino.mkdir(parents=True, exist_ok=True)
+    # Sem manifest, um snapshot a meio de ser escrito nunca é carregado
+    (destino / MANIFEST).unlink(missing_ok=True)
+
+    parciais = [destino / f"col_{i:03d}.parcial" for i in range(len(ingestao.colunas))]
+    with open(destino / PROBLEMAS, "w", newline="", encoding="utf-8") as problemas:
+        ingestao.relatorio.escritor = csv.writer(problemas)
+        ingestao.relatorio.escritor.writerow(("linha", "coluna", "valor", "motivo"))
+        ficheiros = [open(caminho, "wb") for caminho in parciais]
+        try:
+            for arrays in ingestao.blocos():
+                for ficheiro, valores in zip(ficheiros, arrays):
+                    valores.tofile(ficheiro)
+        finally:
+            for ficheiro in ficheiros:
+                ficheiro.close()
+            ingestao.relatorio.escritor = None
+
+    linhas = ingestao.relatorio.linhas_aceites
+    colunas: List[Dict[str, Any]] = []
+    for i, (nome, coluna, parcial) in enumerate(zip(ingestao.nomes, ingestao.colunas, parciais)):
+        descricao, converter = coluna.finalizar(ingestao.fonte.textual)
+        ficheiro = f"col_{i:03d}.npy"
+        dtype = np.int32 if descricao["tipo"] == "categorica" else np.dtype(descricao["dtype"])
+        if linhas == 0:
+            np.save(destino / ficheiro, np.empty(0, dtype=dtype))
+        else:
+            final = np.lib.format.open_memmap(destino / ficheiro, mode="w+", dtype=dtype, shape=(linhas,))
+            with open(parcial, "rb") as f:
+                for inicio in range(0, linhas, BLOCO_COPIA):
+                    valores = np.fromfile(f, dtype=coluna.dtype, count=min(BLOCO_COPIA, linhas - inicio))
+                    final[inicio:inicio + len(valores)] = converter(valores)
+            final.flush()
+            del final
+        parcial.unlink()
+        colunas.append({"nome": nome, "ficheiro": ficheiro, **descricao})
+
+    escrever_manifest(destino, origem, linhas, colunas, ingestao=ingestao.relatorio.resumo())
+    return ingestao.relatorio
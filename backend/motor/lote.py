@@ -0,0 +1,118 @@
+"""
+Recomendação em lote (POST /recomendar/batch).
+
+Os pedidos são processados em blocos. Dentro de cada bloco, os que
+partilham filtros partilham a máscara (um AND de bitsets por conjunto de
+filtros distinto) e:
+  - os de perfil fixo leem o ranking pré-calculado do perfil uma vez por
+    perfil distinto, com os mesmos resultados de POST /recomendar;
+  - os de pesos (estilo car_filter) são pontuados todos de uma vez como
+    produto de matrizes: componentes normalizadas (carros x 4) por pesos
+    (4 x pedidos), limitado a MAXIMO_CELULAS valores de cada vez.
+Cada bloco é devolvido antes de o seguinte ser calculado, pelo que a
+memória não depende do tamanho do lote.
+"""
+
+import warnings
+from collections import defaultdict
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .filtros import Filtros
+from .metricas import etapa
+from .scoring import componentes_minmax, ordenar_por_score, pesos_componentes
+
+# Valores da matriz de scores ponderados calculados de uma vez (~64 MB)
+MAXIMO_CELULAS = 8_000_000
+
+
+class PedidoLote(NamedTuple):
+    filtros: Filtros
+    perfil: Optional[str] = None
+    # (consumo, desempenho, espaço): scoring ponderado em vez do perfil
+    pesos: Optional[Tuple[float, float, float]] = None
+
+
+class ResultadoLote(NamedTuple):
+    indice: int
+    total: int
+    posicoes: np.ndarray
+    scores: np.ndarray
+
+
+_VAZIO = (0, np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64))
+
+
+def _top_ponderados(catalogo, posicoes: np.ndarray, pesos: List[Tuple[float, float, float]], k: int):
+    """Top k de cada vetor de pesos, com os scores (0-100) numa única matriz."""
+    with etapa("scoring"):
+        componentes = componentes_minmax(catalogo.colunas_minmax, posicoes)
+    matriz_pesos = np.array([pesos_componentes(p) for p in pesos]).T
+    por_bloco = max(1, MAXIMO_CELULAS // max(1, len(posicoes)))
+
+    resultados = []
+    for inicio in range(0, matriz_pesos.shape[1], por_bloco):
+        with etapa("scoring"):
+            scores = componentes @ matriz_pesos[:, inicio:inicio + por_bloco]
+            # Normalizar cada coluna (pedido) para 0-100
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                minimo = np.nanmin(scores, axis=0)
+                maximo = np.nanmax(scores, axis=0)
+            escala = maximo > minimo
+            scores[:, escala] = (
+                (scores[:, escala] - minimo[escala]) / (maximo[escala] - minimo[escala]) * 100
+            )
+        with etapa("ordenacao"):
+            for j in range(scores.shape[1]):
+                ordem = ordenar_por_score(scores[:, j], k)
+                resultados.append((posicoes[ordem], scores[ordem, j]))
+    return resultados
+
+
+def recomendar_lote(
+    catalogo, pedidos: Sequence[PedidoLote], k: int = 10, bloco: int = 256,
+) -> Iterator[ResultadoLote]:
+    """Top k de cada pedido, pela ordem dos pedidos, calculado bloco a bloco."""
+    for inicio in range(0, len(pedidos), bloco):
+        parte = pedidos[inicio:inicio + bloco]
+        resultados: List[Optional[tuple]] = [None] * len(parte)
+
+        grupos: Dict[Filtros, List[int]] = defaultdict(list)
+        for i, pedido in enumerate(parte):
+            grupos[pedido.filtros].append(i)
+
+        for filtros, indices in grupos.items():
+            selecionados = catalogo.filtrar(filtros)
+            total = selecionados.contar()
+            if total == 0:
+                for i in indices:
+                    resultados[i] = _VAZIO
+                continue
+
+            por_perfil: Dict[Optional[str], List[int]] = defaultdict(list)
+            ponderados: List[int] = []
+            for i in indices:
+                if parte[i].pesos is not None:
+                    ponderados.append(i)
+                else:
+                    por_perfil[parte[i].perfil].append(i)
+
+            for perfil, mesmos in por_perfil.items():
+                top = catalogo.top_perfil(selecionados, perfil, k)
+                for i in mesmos:
+                    resultados[i] = (total, *top)
+
+            if ponderados:
+                tops = _top_ponderados(catalogo, selecionados.posicoes(), [parte[i].pesos for i in ponderados], k)
+                for i, top in zip(ponderados, tops):
+                    resultados[i] = (total, *top)
+
+        for i, resultado in enumerate(resultados):
+            yield ResultadoLote(inicio + i, *resultado)
+
+
+def recomendacoes_json(catalogo, resultado: ResultadoLote, campos: Optional[Sequence[str]] = None) -> bytes:
+    """Array "recomendacoes" de um resultado, só com `campos` se dados (None = todos)."""
+    return b"[" + b",".join(catalogo.carros_com_score(resultado.posicoes, resultado.scores, campos)) + b"]"
@@ -0,0 +1,192 @@
+"""
+Cronómetros por pedido e métricas agregadas (formato Prometheus).
+
+Só usa a biblioteca padrão. O Cronometro do pedido em curso vive numa
+ContextVar, pelo que o código do motor marca etapas com `etapa("nome")`
+sem receber o cronómetro por argumento; fora de um pedido medido (uso
+do motor como biblioteca) as marcações não fazem nada.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Set, Tuple
+
+LIMITES_SEGUNDOS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+_cronometro: ContextVar[Optional["Cronometro"]] = ContextVar("cronometro", default=None)
+
+
+class Cronometro:
+    """Tempos por etapa, filtros aplicados e threads de um pedido."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.total: Optional[float] = None
+        self.etapas: Dict[str, float] = {}
+        self.descricoes: Dict[str, str] = {}
+        # (filtro, linhas analisadas, linhas selecionadas)
+        self.filtros: List[Tuple[str, int, int]] = []
+        # Threads que trabalharam no pedido (para o amostrador de perfil)
+        self.threads: Set[int] = {threading.get_ident()}
+        # Versão do catálogo com que o pedido foi servido
+        self.versao_dados: Optional[str] = None
+
+    def somar(self, nome: str, duracao: float) -> None:
+        self.etapas[nome] = self.etapas.get(nome, 0.0) + duracao
+
+    def descrever(self, nome: str, descricao: str) -> None:
+        self.descricoes[nome] = descricao
+
+    def filtro(self, nome: str, analisadas: int, selecionadas: int) -> None:
+        self.filtros.append((nome, analisadas, selecionadas))
+
+    def terminar(self) -> float:
+        self.total = time.perf_counter() - self.inicio
+        return self.total
+
+    def server_timing(self) -> str:
+        """Valor do cabeçalho Server-Timing (durações em ms)."""
+        partes = [f"{nome};dur={duracao * 1000:.3f}" for nome, duracao in self.etapas.items()]
+        partes += [f'{nome};desc="{descricao}"' for nome, descricao in self.descricoes.items()]
+        if self.total is not None:
+            partes.append(f"total;dur={self.total * 1000:.3f}")
+        return ", ".join(partes)
+
+
+def ativar_cronometro(cronometro: Cronometro):
+    """Torna `cronometro` o do contexto atual; devolve o token para desativar."""
+    return _cronometro.set(cronometro)
+
+
+def desativar_cronometro(token) -> None:
+    _cronometro.reset(token)
+
+
+def cronometro_atual() -> Optional[Cronometro]:
+    return _cronometro.get()
+
+
+def descrever_etapa(nome: str, descricao: str) -> None:
+    """Descrição (sem duração) no Server-Timing do pedido em curso, ex. cache=hit."""
+    cronometro = _cronometro.get()
+    if cronometro is not None:
+        cronometro.descrever(nome, descricao)
+
+
+@contextmanager
+def etapa(nome: str):
+    """Soma a duração do bloco à etapa `nome` do pedido em curso (se houver)."""
+    cronometro = _cronometro.get()
+    if cronometro is None:
+        yield
+        return
+    cronometro.threads.add(threading.get_ident())
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        cronometro.somar(nome, time.perf_counter() - inicio)
+
+
+class Histograma:
+    """Histograma cumulativo com limites fixos (como os do Prometheus)."""
+
+    __slots__ = ("limites", "contagens", "soma", "total")
+
+    def __init__(self, limites=LIMITES_SEGUNDOS):
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float) -> None:
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+    def linhas(self, nome: str, etiquetas: str) -> List[str]:
+        linhas = []
+        acumulado = 0
+        for limite, contagem in zip(self.limites, self.contagens):
+            acumulado += contagem
+            linhas.append(f'{nome}_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+        linhas.append(f'{nome}_bucket{{{etiquetas},le="+Inf"}} {self.total}')
+        linhas.append(f"{nome}_sum{{{etiquetas}}} {self.soma}")
+        linhas.append(f"{nome}_count{{{etiquetas}}} {self.total}")
+        return linhas
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _etiquetas(**valores) -> str:
+    return ",".join(f'{nome}="{_escapar(valor)}"' for nome, valor in valores.items())
+
+
+class RegistoMetricas:
+    """Agregação thread-safe dos cronómetros de todos os pedidos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pedidos: Dict[Tuple[str, str, int], Histograma] = {}
+        self._etapas: Dict[Tuple[str, str], Histograma] = {}
+        self._filtros: Dict[str, List[int]] = {}
+
+    def observar(self, metodo: str, endpoint: str, estado: int, cronometro: Cronometro) -> None:
+        with self._lock:
+            chave = (metodo, endpoint, estado)
+            if chave not in self._pedidos:
+                self._pedidos[chave] = Histograma()
+            self._pedidos[chave].observar(cronometro.total or 0.0)
+
+            for nome, duracao in cronometro.etapas.items():
+                if (endpoint, nome) not in self._etapas:
+                    self._etapas[(endpoint, nome)] = Histograma()
+                self._etapas[(endpoint, nome)].observar(duracao)
+
+            for nome, analisadas, selecionadas in cronometro.filtros:
+                contagem = self._filtros.setdefault(nome, [0, 0, 0])
+                contagem[0] += 1
+                contagem[1] += analisadas
+                contagem[2] += selecionadas
+
+    def exportar(self, extra: Optional[Dict[str, float]] = None) -> str:
+        """Texto no formato de exposição do Prometheus (0.0.4)."""
+        linhas = [
+            "# HELP carros_pedido_segundos Duração total dos pedidos HTTP",
+            "# TYPE carros_pedido_segundos histogram",
+        ]
+        with self._lock:
+            for (metodo, endpoint, estado), histograma in sorted(self._pedidos.items()):
+                linhas += histograma.linhas(
+                    "carros_pedido_segundos",
+                    _etiquetas(metodo=metodo, endpoint=endpoint, estado=estado),
+                )
+
+            linhas += [
+                "# HELP carros_etapa_segundos Duração de cada etapa dos pedidos",
+                "# TYPE carros_etapa_segundos histogram",
+            ]
+            for (endpoint, nome), histograma in sorted(self._etapas.items()):
+                linhas += histograma.linhas(
+                    "carros_etapa_segundos", _etiquetas(endpoint=endpoint, etapa=nome)
+                )
+
+            for indice, (metrica, ajuda) in enumerate((
+                ("carros_filtro_aplicacoes_total", "Vezes que cada filtro foi aplicado"),
+                ("carros_filtro_linhas_analisadas_total", "Linhas candidatas à entrada de cada filtro"),
+                ("carros_filtro_linhas_selecionadas_total", "Linhas que passaram cada filtro"),
+            )):
+                linhas += [f"# HELP {metrica} {ajuda}", f"# TYPE {metrica} counter"]
+                for nome, contagem in sorted(self._filtros.items()):
+                    linhas.append(f"{metrica}{{{_etiquetas(filtro=nome)}}} {contagem[indice]}")
+
+        for nome, valor in (extra or {}).items():
+            linhas += [f"# TYPE {nome} gauge", f"{nome} {valor}"]
+        return "\n".join(linhas) + "\n"
@@ -0,0 +1,37 @@
+"""
+Paginação por cursor de POST /recomendar.
+
+A ordem completa de uma consulta (todas as linhas filtradas por score,
+lidas do ranking do perfil) é guardada em cache; cada página é depois só
+uma fatia dessa ordem. O cursor é opaco para o cliente e guarda a versão do
+catálogo, a consulta e o deslocamento.
+"""
+
+import base64
+import binascii
+from typing import Tuple
+
+import numpy as np
+import orjson
+
+
+def ordem_completa(chave: np.ndarray) -> np.ndarray:
+    """Índices de `chave` por ordem decrescente, empates pela ordem original (= top_k)."""
+    return np.lexsort((np.arange(len(chave)), -chave))
+
+
+def codificar_cursor(versao: str, consulta: str, deslocamento: int) -> str:
+    dados = orjson.dumps({"v": versao, "q": consulta, "o": deslocamento})
+    return base64.urlsafe_b64encode(dados).decode().rstrip("=")
+
+
+def ler_cursor(cursor: str) -> Tuple[str, str, int]:
+    """(versão, consulta, deslocamento) de um cursor; ValueError se inválido."""
+    try:
+        dados = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        versao, consulta, deslocamento = dados["v"], dados["q"], dados["o"]
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError("Cursor inválido") from e
+    if not isinstance(deslocamento, int) or deslocamento < 0:
+        raise ValueError("Cursor inválido")
+    return str(versao), str(consulta), deslocamento
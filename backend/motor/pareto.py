@@ -0,0 +1,280 @@
+"""
+Frentes de Pareto (POST /recomendar/pareto).
+
+Em vez de juntar consumo, desempenho e espaço num score ponderado, a
+primeira frente são os carros não dominados: nenhum outro é pelo menos
+tão bom em todos os objetivos escolhidos e melhor num deles. A frente 2
+é a primeira depois de retirar a 1, e assim por diante.
+
+Todos os objetivos passam a minimização (os de "max" trocam de sinal;
+valores em falta contam como o pior possível). Os pontos são ordenados
+lexicograficamente e os repetidos agrupados, uma vez por conjunto de
+objetivos e por catálogo; nessa ordem um ponto só pode ser dominado por
+um anterior:
+
+- 2 objetivos: dominado se o mínimo do 2.º objetivo antes dele já é <=
+  (varrimento vetorizado com minimum.accumulate);
+- 3 objetivos: varrimento em blocos contra a "escada" 2D da frente
+  (searchsorted);
+- 4 ou mais: comparações de dominância vetorizadas contra a frente, bloco
+  a bloco, começando pelos pontos da frente mais fortes; só até
+  MAXIMO_LINHAS_MUITOS_OBJETIVOS linhas selecionadas.
+
+Sem filtros as frentes do catálogo inteiro ficam guardadas (até à maior
+k pedida); com filtros só se repete o varrimento sobre as linhas
+selecionadas, já ordenadas.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .indices import Bitset
+
+# Nome do objetivo -> (coluna, sentido)
+OBJETIVOS: Dict[str, Tuple[str, str]] = {
+    "consumo": ("Consumo", "min"),
+    "potencia": ("Potencia", "max"),
+    "aceleracao": ("0-100", "min"),
+    "velocidade": ("Velocidade", "max"),
+    "bagageira": ("Bagageira", "max"),
+    "preco": ("Preco", "min"),
+}
+OBJETIVOS_PADRAO = ("consumo", "potencia", "bagageira")
+MAXIMO_FRENTES = 10
+# Conjuntos de objetivos com a ordenação guardada em cada catálogo
+MAXIMO_CONJUNTOS = 8
+# Pontos varridos de cada vez (3+ objetivos)
+BLOCO = 1024
+# Pontos da frente comparados de cada vez com um bloco (4+ objetivos)
+PARTE_FRENTE = 64
+# Linhas selecionadas acima das quais só se aceitam até 3 objetivos: com 4
+# ou mais as frentes crescem com o catálogo e a dominância por blocos leva
+# segundos (~2 s a 100 mil linhas, dezenas de segundos a 1 milhão)
+MAXIMO_LINHAS_MUITOS_OBJETIVOS = 100_000
+
+
+def objetivos_canonicos(objetivos: Sequence[str]) -> Tuple[str, ...]:
+    """Objetivos sem repetições, pela ordem de OBJETIVOS (ValueError se desconhecidos)."""
+    desconhecidos = [nome for nome in objetivos if nome not in OBJETIVOS]
+    if desconhecidos:
+        raise ValueError(f"Objetivos desconhecidos: {desconhecidos} (disponíveis: {list(OBJETIVOS)})")
+    if not objetivos:
+        raise ValueError("Indique pelo menos um objetivo")
+    return tuple(nome for nome in OBJETIVOS if nome in objetivos)
+
+
+def _sem_dominados_2d(pontos: np.ndarray) -> np.ndarray:
+    """Pontos (únicos, ordenados) cujo 2.º valor é menor do que todos os anteriores."""
+    anteriores = np.concatenate(([np.inf], np.minimum.accumulate(pontos[:-1, 1])))
+    livres = pontos[:, 1] < anteriores
+    # O primeiro nunca é dominado, mesmo com o valor em falta (+inf)
+    livres[0] = True
+    return livres
+
+
+def _escada(pontos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pontos 2D não dominados, por x crescente (e y decrescente)."""
+    pontos = pontos[np.lexsort((pontos[:, 1], pontos[:, 0]))]
+    pontos = pontos[_sem_dominados_2d(pontos)]
+    return pontos[:, 0].copy(), pontos[:, 1].copy()
+
+
+def _dominados_pela_escada(escada: Tuple[np.ndarray, np.ndarray], pontos: np.ndarray) -> np.ndarray:
+    """Pontos (x, y) com algum ponto da escada <= em ambos."""
+    xs, ys = escada
+    if len(xs) == 0:
+        return np.zeros(len(pontos), dtype=bool)
+    # O último degrau com x <= ao do ponto tem o menor y desses degraus
+    degrau = np.searchsorted(xs, pontos[:, 0], side="right") - 1
+    return (degrau >= 0) & (ys[np.maximum(degrau, 0)] <= pontos[:, 1])
+
+
+def _dominados_por(frente: np.ndarray, pontos: np.ndarray) -> np.ndarray:
+    """
+    Pontos com algum ponto da frente <= em todos os objetivos.
+
+    A frente vem das linhas mais fortes para as mais fracas e é comparada
+    por partes: cada parte só olha para os pontos que as anteriores ainda
+    não dominaram, e quase todos caem nas primeiras.
+    """
+    vivos = np.arange(len(pontos))
+    for inicio in range(0, len(frente), PARTE_FRENTE):
+        parte = frente[inicio:inicio + PARTE_FRENTE]
+        # Objetivo a objetivo (matrizes parte x vivos), sem o eixo curto dos objetivos no fim
+        colunas = pontos[vivos].T
+        menores = parte[:, 0, None] <= colunas[0]
+        for j in range(1, pontos.shape[1]):
+            menores &= parte[:, j, None] <= colunas[j]
+        vivos = vivos[~menores.any(axis=0)]
+        if len(vivos) == 0:
+            break
+    resultado = np.ones(len(pontos), dtype=bool)
+    resultado[vivos] = False
+    return resultado
+
+
+def _forca(pontos: np.ndarray) -> np.ndarray:
+    """Soma das posições relativas (0 = melhor, 1 = pior) de cada ponto em cada objetivo."""
+    forca = np.zeros(len(pontos))
+    for j in range(pontos.shape[1]):
+        _, posicao = np.unique(pontos[:, j], return_inverse=True)
+        forca += posicao / max(1, posicao.max())
+    return forca
+
+
+def nao_dominados(pontos: np.ndarray) -> np.ndarray:
+    """
+    Máscara da primeira frente de `pontos` (a minimizar), que têm de ser
+    únicos e estar por ordem lexicográfica: assim um ponto <= noutro em
+    todos os objetivos, e anterior, domina-o.
+    """
+    n, m = pontos.shape
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    if m == 1:
+        return np.arange(n) == 0
+    if m == 2:
+        return _sem_dominados_2d(pontos)
+
+    mascara = np.zeros(n, dtype=bool)
+    frente = np.empty((0, m))
+    escada = (np.empty(0), np.empty(0))
+    forca = _forca(pontos) if m > 3 else None
+    forca_frente = np.empty(0)
+    for inicio in range(0, n, BLOCO):
+        bloco = pontos[inicio:inicio + BLOCO]
+        # Todos os pontos da frente são anteriores: com 3 objetivos basta a
+        # escada dos dois últimos (o primeiro já é <=)
+        if m == 3:
+            livres = np.flatnonzero(~_dominados_pela_escada(escada, bloco[:, 1:]))
+        else:
+            livres = np.flatnonzero(~_dominados_por(frente, bloco))
+        # Dentro do bloco, só entre os que a frente não domina (se um ponto
+        # dominado dominasse outro, o seu dominador também o dominaria)
+        candidatos = bloco[livres]
+        menores = np.all(candidatos[:, None, :] <= candidatos[None, :, :], axis=2)
+        livres = livres[~np.triu(menores, k=1).any(axis=0)]
+        if len(livres):
+            mascara[inicio + livres] = True
+            novos = bloco[livres]
+            if m == 3:
+                escada = _escada(np.concatenate((np.column_stack(escada), novos[:, 1:])))
+            else:
+                # Mais fortes primeiro: dominam mais pontos nas primeiras partes
+                forca_frente = np.concatenate((forca_frente, forca[inicio + livres]))
+                ordem = np.argsort(forca_frente, kind="stable")
+                frente, forca_frente = np.concatenate((frente, novos))[ordem], forca_frente[ordem]
+    return mascara
+
+
+def numerar_frentes(pontos: np.ndarray, k: int) -> np.ndarray:
+    """Frente (1..k) de cada ponto único e ordenado; 0 para os que ficam depois da k-ésima."""
+    frentes = np.zeros(len(pontos), dtype=np.int8)
+    restantes = np.arange(len(pontos))
+    for frente in range(1, k + 1):
+        if len(restantes) == 0:
+            break
+        primeira = nao_dominados(pontos[restantes])
+        frentes[restantes[primeira]] = frente
+        restantes = restantes[~primeira]
+    return frentes
+
+
+def matriz_objetivos(df: pd.DataFrame, objetivos: Sequence[str]) -> np.ndarray:
+    """Colunas dos objetivos a minimizar (n x m); em falta = +inf."""
+    colunas = []
+    for nome in objetivos:
+        coluna, sentido = OBJETIVOS[nome]
+        if coluna not in df.columns:
+            raise ValueError(f"Objetivo indisponível neste catálogo: {nome} (coluna {coluna})")
+        valores = pd.to_numeric(df[coluna], errors="coerce").to_numpy(dtype=np.float64, copy=True)
+        if sentido == "max":
+            valores = -valores
+        valores[np.isnan(valores)] = np.inf
+        colunas.append(valores)
+    return np.column_stack(colunas)
+
+
+class OrdenacaoPareto:
+    """Linhas do catálogo por ordem lexicográfica dos objetivos, com os pontos únicos."""
+
+    def __init__(self, matriz: np.ndarray):
+        n = len(matriz)
+        tipo_posicao = np.int32 if n < 2**31 else np.int64
+        # Empates pela posição, para uma ordem estável dentro de cada frente
+        chaves = [np.arange(n)] + [matriz[:, j] for j in reversed(range(matriz.shape[1]))]
+        self.ordem = np.lexsort(chaves).astype(tipo_posicao)
+        ordenada = matriz[self.ordem]
+        novo = np.ones(n, dtype=bool)
+        novo[1:] = np.any(ordenada[1:] != ordenada[:-1], axis=1)
+        # Índice do ponto único de cada linha (pela ordem acima)
+        self.grupo = (np.cumsum(novo) - 1).astype(tipo_posicao)
+        self.pontos = ordenada[novo]
+        # Frentes do catálogo inteiro, numeradas só até à maior k já pedida
+        self._frentes = np.zeros(len(self.pontos), dtype=np.int8)
+        self._numeradas = 0
+        self._lock = threading.Lock()
+
+    def frentes_catalogo(self, k: int) -> np.ndarray:
+        """Frente (1..k) de cada ponto único no catálogo inteiro; 0 depois da k-ésima."""
+        with self._lock:
+            if k > self._numeradas:
+                # Continua a retirar frentes a partir das que já estão guardadas
+                restantes = np.flatnonzero(self._frentes == 0)
+                novas = numerar_frentes(self.pontos[restantes], k - self._numeradas)
+                numerados = novas > 0
+                self._frentes[restantes[numerados]] = novas[numerados] + self._numeradas
+                self._numeradas = k
+        return self._frentes
+
+    def frentes(self, selecionados: Optional[Bitset], k: int) -> List[np.ndarray]:
+        """Posições de cada uma das k primeiras frentes de `selecionados` (None = todas)."""
+        if selecionados is None:
+            ordem, grupo = self.ordem, self.grupo
+            frentes = self.frentes_catalogo(k)[grupo]
+        else:
+            dentro = selecionados.contem(self.ordem)
+            ordem, grupo = self.ordem[dentro], self.grupo[dentro]
+            presentes, grupo = np.unique(grupo, return_inverse=True)
+            frentes = numerar_frentes(self.pontos[presentes], k)[grupo]
+        return [ordem[frentes == f] for f in range(1, k + 1) if (frentes == f).any()]
+
+    @property
+    def tamanho_bytes(self) -> int:
+        return self.ordem.nbytes + self.grupo.nbytes + self.pontos.nbytes + self._frentes.nbytes
+
+
+class IndicePareto:
+    """Ordenações por conjunto de objetivos, criadas no primeiro pedido (LRU)."""
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self._ordenacoes: "OrderedDict[Tuple[str, ...], OrdenacaoPareto]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ordenacao(self, objetivos: Tuple[str, ...]) -> OrdenacaoPareto:
+        with self._lock:
+            ordenacao = self._ordenacoes.get(objetivos)
+            if ordenacao is None:
+                ordenacao = OrdenacaoPareto(matriz_objetivos(self._df, objetivos))
+                self._ordenacoes[objetivos] = ordenacao
+                while len(self._ordenacoes) > MAXIMO_CONJUNTOS:
+                    self._ordenacoes.popitem(last=False)
+            else:
+                self._ordenacoes.move_to_end(objetivos)
+            return ordenacao
+
+    def frentes(
+        self, objetivos: Sequence[str], selecionados: Optional[Bitset], k: int = 1,
+    ) -> List[np.ndarray]:
+        """As k primeiras frentes (posições, por ordem dos objetivos) das linhas selecionadas."""
+        k = max(1, min(k, MAXIMO_FRENTES))
+        return self.ordenacao(objetivos_canonicos(objetivos)).frentes(selecionados, k)
+
+    @property
+    def tamanho_bytes(self) -> int:
+        return sum(o.tamanho_bytes for o in list(self._ordenacoes.values()))
@@ -0,0 +1,78 @@
+"""
+Amostrador de perfil opcional para pedidos lentos.
+
+Uma thread recolhe periodicamente a pilha de todas as outras threads
+(sys._current_frames) para um buffer circular. Quando um pedido passa
+o limiar, as amostras das threads que o serviram, entre o início e o
+fim do pedido, são gravadas em formato "collapsed" (uma pilha por
+linha, `a;b;c contagem`), que flamegraph.pl e speedscope leem.
+
+Só usa a biblioteca padrão e não corre a menos que seja ativado (ver
+PERFIL_LENTOS_MS em backend/api.py).
+"""
+
+import sys
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+def _pilha(frame) -> str:
+    """Pilha de `frame`, da base para o topo, separada por ';'."""
+    nomes = []
+    while frame is not None:
+        codigo = frame.f_code
+        nomes.append(f"{codigo.co_name} ({Path(codigo.co_filename).name}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(nomes))
+
+
+class AmostradorPerfil:
+    """Amostragem contínua das pilhas de todas as threads."""
+
+    def __init__(self, intervalo: float = 0.002, maximo_amostras: int = 200_000):
+        self.intervalo = intervalo
+        self._amostras: deque = deque(maxlen=maximo_amostras)
+        self._thread: Optional[threading.Thread] = None
+
+    def iniciar(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._amostrar, name="amostrador-perfil", daemon=True)
+            self._thread.start()
+
+    def _amostrar(self) -> None:
+        propria = threading.get_ident()
+        while True:
+            agora = time.perf_counter()
+            for ident, frame in sys._current_frames().items():
+                if ident != propria:
+                    self._amostras.append((agora, ident, _pilha(frame)))
+            time.sleep(self.intervalo)
+
+    def pilhas(self, threads: Iterable[int], inicio: float, fim: float) -> Counter:
+        """Contagem das pilhas das `threads` amostradas em [inicio, fim]."""
+        threads = set(threads)
+        return Counter(
+            pilha for instante, ident, pilha in list(self._amostras)
+            if ident in threads and inicio <= instante <= fim
+        )
+
+    @staticmethod
+    def gravar(contagem: Counter, caminho: Path, maximo: Optional[int] = None) -> Path:
+        """
+        Escreve as pilhas em formato collapsed (compatível com flamegraph).
+
+        Com `maximo`, só ficam os `maximo` perfis mais recentes da pasta
+        (os nomes começam pelo instante, em ms).
+        """
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        caminho.write_text(
+            "".join(f"{pilha} {n}\n" for pilha, n in contagem.most_common()), encoding="utf-8"
+        )
+        if maximo is not None:
+            perfis = sorted(caminho.parent.glob(f"*{caminho.suffix}"), key=lambda p: p.name)
+            for antigo in perfis[:-maximo]:
+                antigo.unlink(missing_ok=True)
+        return caminho
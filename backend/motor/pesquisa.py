@@ -0,0 +1,132 @@
+"""
+Índice de pesquisa para o autocomplete de GET /modelos.
+
+Os textos "Marca Modelo Ano" são normalizados (minúsculas, sem acentos)
+e agrupados por valor único; cada n-grama de 1 a 3 caracteres aponta
+para os textos únicos que o contêm, pela ordem da primeira linha de
+cada texto. Uma pesquisa interseta as listas dos trigramas do termo aos
+blocos, confirma os candidatos com `in` e para quando tem textos
+suficientes para as primeiras `limite` linhas, pelo que o custo depende
+do resultado e não da diversidade do catálogo.
+"""
+
+import sys
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+TAMANHO_NGRAMA = 3
+# Textos candidatos intersetados de cada vez (termos com mais de 3 caracteres)
+BLOCO_CANDIDATOS = 1024
+
+
+def normalizar_texto(texto: str) -> str:
+    """Minúsculas e sem acentos ("Série" -> "serie")."""
+    decomposto = unicodedata.normalize("NFKD", str(texto))
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).lower()
+
+
+def _ngramas(texto: str, tamanho: int) -> set:
+    return {texto[i:i + tamanho] for i in range(len(texto) - tamanho + 1)}
+
+
+class IndicePesquisa:
+    """N-gramas sobre os textos únicos do catálogo, com as linhas de cada um."""
+
+    def __init__(self, textos: Iterable[str]):
+        codigos_brutos, unicos_brutos = pd.factorize(
+            pd.Series(list(textos), dtype=object).fillna("")
+        )
+        self.n = len(codigos_brutos)
+
+        # Textos que só diferem em acentos/maiúsculas partilham a mesma entrada.
+        # factorize numera pela ordem de aparição, logo os textos únicos (e as
+        # listas de cada n-grama, crescentes) ficam pela ordem da primeira linha
+        self.textos: List[str] = []
+        posicao_texto: Dict[str, int] = {}
+        mapa = np.empty(len(unicos_brutos), dtype=np.int64)
+        for i, bruto in enumerate(unicos_brutos):
+            texto = normalizar_texto(bruto)
+            if texto not in posicao_texto:
+                posicao_texto[texto] = len(self.textos)
+                self.textos.append(texto)
+            mapa[i] = posicao_texto[texto]
+        codigos = mapa[codigos_brutos]
+
+        # Linhas de cada texto único, por ordem crescente
+        self._linhas = np.argsort(codigos, kind="stable").astype(np.int32 if self.n < 2**31 else np.int64)
+        self._inicio = np.concatenate(
+            ([0], np.cumsum(np.bincount(codigos, minlength=len(self.textos))))
+        )
+
+        listas: Dict[str, List[int]] = {}
+        for u, texto in enumerate(self.textos):
+            for tamanho in range(1, TAMANHO_NGRAMA + 1):
+                for ngrama in _ngramas(texto, tamanho):
+                    listas.setdefault(ngrama, []).append(u)
+        self._ngramas = {g: np.array(us, dtype=np.int64) for g, us in listas.items()}
+
+    @property
+    def tamanho_bytes(self) -> int:
+        """Arrays do índice e strings da tabela de textos únicos (aproximado)."""
+        return (
+            self._linhas.nbytes + self._inicio.nbytes
+            + sum(lista.nbytes for lista in self._ngramas.values())
+            + sum(sys.getsizeof(texto) for texto in self.textos)
+        )
+
+    def _textos_com(self, termo: str, limite: Optional[int] = None) -> np.ndarray:
+        """
+        Textos únicos que contêm `termo` (já normalizado), pela ordem da
+        primeira linha. Com `limite` para nos `limite` primeiros: as
+        `limite` primeiras linhas da pesquisa vêm todas deles (um texto
+        seguinte teria pelo menos `limite` linhas antes da sua primeira).
+        """
+        if len(termo) <= TAMANHO_NGRAMA:
+            textos = self._ngramas.get(termo, np.empty(0, dtype=np.int64))
+            return textos if limite is None else textos[:limite]
+
+        listas = []
+        for ngrama in _ngramas(termo, TAMANHO_NGRAMA):
+            lista = self._ngramas.get(ngrama)
+            if lista is None:
+                return np.empty(0, dtype=np.int64)
+            listas.append(lista)
+        listas.sort(key=len)
+        menor, outras = listas[0], listas[1:]
+
+        # Interseção aos blocos (searchsorted nas listas ordenadas), confirmada
+        # com `in`, até ter `limite` textos
+        encontrados: List[int] = []
+        for inicio in range(0, len(menor), BLOCO_CANDIDATOS):
+            bloco = menor[inicio:inicio + BLOCO_CANDIDATOS]
+            for lista in outras:
+                indices = np.minimum(np.searchsorted(lista, bloco), len(lista) - 1)
+                bloco = bloco[lista[indices] == bloco]
+            for u in bloco:
+                if termo in self.textos[u]:
+                    encontrados.append(u)
+                    if len(encontrados) == limite:
+                        return np.array(encontrados, dtype=np.int64)
+        return np.array(encontrados, dtype=np.int64)
+
+    def pesquisar(self, termo: str, limite: Optional[int] = 15) -> np.ndarray:
+        """
+        Posições das linhas cujo texto contém `termo`, por ordem do catálogo.
+
+        Termo vazio devolve as primeiras linhas. `limite=None` devolve todas.
+        """
+        termo = normalizar_texto(termo)
+        if not termo:
+            return np.arange(self.n if limite is None else min(limite, self.n))
+
+        blocos = []
+        for u in self._textos_com(termo, limite):
+            linhas = self._linhas[self._inicio[u]:self._inicio[u + 1]]
+            blocos.append(linhas if limite is None else linhas[:limite])
+        if not blocos:
+            return np.empty(0, dtype=np.int64)
+        posicoes = np.sort(np.concatenate(blocos))
+        return posicoes if limite is None else posicoes[:limite]
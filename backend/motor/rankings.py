@@ -0,0 +1,96 @@
+"""
+Rankings por perfil calculados no carregamento do catálogo.
+
+O score de /recomendar só depende da linha e do perfil, não dos filtros.
+Por isso cada perfil guarda, uma vez, todas as linhas por score
+decrescente (empates pela posição, como top_k) e os scores por essa
+ordem. Uma recomendação percorre o ranking e testa cada linha no bitset
+dos filtros até ter k: sem filtros são as k primeiras, com filtros pouco
+seletivos (ex. só preço) alguns blocos, e no pior caso uma passagem O(n)
+sem sort.
+"""
+
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .indices import Bitset
+from .paginacao import ordem_completa
+from .scoring import PERFIS, arredondar_scores, calcular_scores
+
+# Linhas testadas no primeiro bloco do percurso (o bloco seguinte tem o dobro)
+BLOCO_INICIAL = 1024
+
+
+class RankingPerfil:
+    """Linhas de um perfil por score decrescente, com os scores pela mesma ordem."""
+
+    def __init__(self, colunas: Dict[str, np.ndarray], perfil: Optional[str]):
+        scores = calcular_scores(colunas, perfil)
+        tipo_posicao = np.int32 if len(scores) < 2**31 else np.int64
+        self.ordem = ordem_completa(arredondar_scores(scores)).astype(tipo_posicao)
+        self.scores = scores[self.ordem]
+
+    def __len__(self) -> int:
+        return len(self.ordem)
+
+    def em_blocos(self, selecionados: Optional[Bitset], primeiro: int = BLOCO_INICIAL) -> Iterator[np.ndarray]:
+        """
+        Índices do ranking que estão em `selecionados` (None = todos), em
+        blocos crescentes; parar de iterar termina o percurso.
+        """
+        inicio, bloco = 0, primeiro
+        while inicio < len(self.ordem):
+            fim = inicio + bloco
+            if selecionados is None:
+                yield np.arange(inicio, min(fim, len(self.ordem)))
+            else:
+                yield inicio + np.flatnonzero(selecionados.contem(self.ordem[inicio:fim]))
+            inicio, bloco = fim, bloco * 2
+
+    def primeiros(self, selecionados: Optional[Bitset], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Posições e scores das k melhores linhas de `selecionados`."""
+        encontrados = []
+        falta = k
+        for indices in self.em_blocos(selecionados, max(BLOCO_INICIAL, 4 * k)):
+            indices = indices[:falta]
+            encontrados.append(indices)
+            falta -= len(indices)
+            if falta <= 0:
+                break
+        indices = np.concatenate(encontrados) if encontrados else np.empty(0, dtype=np.intp)
+        return self.ordem[indices], self.scores[indices]
+
+    def filtrado(self, selecionados: Optional[Bitset]) -> Tuple[np.ndarray, np.ndarray]:
+        """Todas as posições de `selecionados` pela ordem do ranking, com os scores."""
+        if selecionados is None:
+            return self.ordem, self.scores
+        dentro = selecionados.contem(self.ordem)
+        return self.ordem[dentro], self.scores[dentro]
+
+    @property
+    def tamanho_bytes(self) -> int:
+        return self.ordem.nbytes + self.scores.nbytes
+
+
+class RankingsPerfis:
+    """Um RankingPerfil por perfil; os restantes (None, desconhecidos) partilham um."""
+
+    def __init__(self, colunas: Dict[str, np.ndarray]):
+        self._colunas = colunas
+        self._rankings: Dict[Optional[str], RankingPerfil] = {
+            perfil: RankingPerfil(colunas, perfil) for perfil in PERFIS
+        }
+
+    def de(self, perfil: Optional[str]) -> RankingPerfil:
+        """Ranking do perfil; sem perfil conhecido todas as linhas valem 100."""
+        chave = perfil if perfil in PERFIS else None
+        ranking = self._rankings.get(chave)
+        if ranking is None:
+            # Ordem das posições, criado só se for pedido
+            ranking = self._rankings.setdefault(None, RankingPerfil(self._colunas, None))
+        return ranking
+
+    @property
+    def tamanho_bytes(self) -> int:
+        return sum(r.tamanho_bytes for r in self._rankings.values())
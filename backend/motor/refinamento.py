@@ -0,0 +1,152 @@
+"""
+Candidatos de estados de filtros recentes, para refinar sem voltar ao catálogo.
+
+O frontend reenvia o estado completo dos filtros a /recomendar sempre
+que um slider aperta (preço máximo mais baixo, bagageira mínima mais
+alta, mais um extra). Cada estado normalizado fica numa LRU limitada
+(em estados e em bytes) com as linhas que o satisfazem e, por perfil,
+essas linhas pela ordem do ranking, com os scores. Um pedido que seja
+um refinamento de um estado guardado (todos os critérios iguais ou mais
+apertados) só testa os candidatos desse estado, que já vêm ordenados:
+custa O(candidatos anteriores) em vez de O(catálogo).
+
+Estados que ainda deixam passar mais de FRACAO_REFINAR do catálogo não
+são refinados: aí os bitsets do IndiceFiltros e o percurso do ranking
+com saída antecipada são mais baratos do que testar candidato a candidato.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .filtros import Filtros
+from .indices import Bitset, IndiceFiltros
+from .rankings import RankingPerfil
+
+MAXIMO_ESTADOS = 64
+MAXIMO_BYTES = 64 * 2**20
+FRACAO_REFINAR = 0.5
+
+
+class Candidatos:
+    """
+    Linhas de um estado de filtros; a ordem de cada perfil é criada quando é pedida.
+
+    Cada entrada de `ordens` tem exatamente as linhas do estado (só muda a
+    ordem), por isso qualquer uma serve para criar a de outro perfil. Um
+    estado refinado é publicado na cache já com a primeira ordem. As
+    ordens são criadas por threads do executor: `ordens` só é lido e
+    alterado com `_lock`.
+    """
+
+    __slots__ = ("total", "n", "bits", "ordens", "_lock")
+
+    def __init__(self, total: int, n: int, bits: Optional[Bitset] = None):
+        self.total = total
+        self.n = n
+        # Bitset do catálogo (estado filtrado de raiz) ou None (estado refinado)
+        self.bits = bits
+        self.ordens: Dict[RankingPerfil, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def ordem(self, ranking: RankingPerfil) -> Tuple[np.ndarray, np.ndarray]:
+        """Posições dos candidatos pela ordem de `ranking`, com os scores."""
+        with self._lock:
+            ordem = self.ordens.get(ranking)
+            if ordem is None:
+                if self.bits is not None:
+                    selecionados = None if self.total == self.n else self.bits
+                else:
+                    # Outro perfil sobre um estado refinado: uma passagem pelo ranking
+                    posicoes, _ = next(iter(self.ordens.values()))
+                    selecionados = Bitset.de_posicoes(posicoes, self.n)
+                ordem = self.ordens[ranking] = ranking.filtrado(selecionados)
+            return ordem
+
+    def primeiros(self, ranking: RankingPerfil, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Posições e scores dos k melhores candidatos pelo ranking."""
+        with self._lock:
+            ordenado = ranking in self.ordens
+        if not ordenado and self.bits is not None:
+            # Estado de raiz: o percurso com saída antecipada evita ordenar tudo
+            return ranking.primeiros(None if self.total == self.n else self.bits, k)
+        posicoes, scores = self.ordem(ranking)
+        return posicoes[:k], scores[:k]
+
+    @property
+    def tamanho_bytes(self) -> int:
+        # O bitset e a ordem sem filtros são partilhados com os índices
+        bits = 0 if self.bits is None or self.total == self.n else self.bits.palavras.nbytes
+        with self._lock:
+            ordens = list(self.ordens.items())
+        return bits + sum(
+            posicoes.nbytes + scores.nbytes
+            for ranking, (posicoes, scores) in ordens
+            if posicoes is not ranking.ordem
+        )
+
+
+class CacheRefinamento:
+    """LRU de estados de filtros normalizados -> Candidatos, de um catálogo."""
+
+    def __init__(
+        self, indice: IndiceFiltros, maximo: int = MAXIMO_ESTADOS, maximo_bytes: int = MAXIMO_BYTES,
+    ):
+        self._indice = indice
+        self._maximo = maximo
+        self._maximo_bytes = maximo_bytes
+        self._estados: "OrderedDict[Filtros, Candidatos]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._estados)
+
+    def candidatos(self, filtros: Filtros, ranking: RankingPerfil) -> Tuple[Candidatos, bool]:
+        """
+        Candidatos de `filtros` e se vieram de um estado guardado (True) ou
+        dos bitsets do catálogo inteiro (False).
+        """
+        filtros = filtros.normalizado()
+        with self._lock:
+            guardado = self._estados.get(filtros)
+            if guardado is not None:
+                self._estados.move_to_end(filtros)
+                return guardado, True
+            # O estado refinável com menos candidatos
+            estado, anterior = min(
+                ((f, c) for f, c in self._estados.items()
+                 if c.total <= FRACAO_REFINAR * self._indice.n and filtros.refina(f)),
+                key=lambda item: item[1].total, default=(None, None),
+            )
+
+        if anterior is not None:
+            # Os candidatos já cumprem `estado`: só se testam os critérios que mudaram
+            posicoes, scores = anterior.ordem(ranking)
+            dentro = filtros.aplicar_em(self._indice, posicoes, estado)
+            candidatos = Candidatos(len(dentro), self._indice.n)
+            candidatos.ordens[ranking] = (posicoes[dentro], scores[dentro])
+        else:
+            bits = filtros.aplicar(self._indice)
+            candidatos = Candidatos(bits.contar(), self._indice.n, bits)
+        if filtros == Filtros():
+            # Sem filtros não há o que refinar (e a resposta não depende dos pedidos anteriores)
+            return candidatos, False
+
+        with self._lock:
+            self._estados[filtros] = candidatos
+            self._estados.move_to_end(filtros)
+            while len(self._estados) > self._maximo or (
+                len(self._estados) > 1 and self._bytes() > self._maximo_bytes
+            ):
+                self._estados.popitem(last=False)
+        return candidatos, anterior is not None
+
+    def _bytes(self) -> int:
+        return sum(c.tamanho_bytes for c in self._estados.values())
+
+    @property
+    def tamanho_bytes(self) -> int:
+        with self._lock:
+            return self._bytes()
@@ -0,0 +1,340 @@
+"""
+Scoring vetorizado para POST /recomendar.
+
+As fórmulas de cada perfil são avaliadas sobre colunas inteiras, com a
+mesma ordem de operações do antigo ciclo iterrows(), para que os scores
+(e o arredondamento a 2 casas) sejam idênticos aos de antes.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .metricas import etapa
+
+PERFIS = ("economico", "desportivo", "familia", "cidade", "estrada")
+
+# Valores usados por row.get(coluna, default) quando a coluna não existe
+DEFAULTS_NUMERICOS = {
+    "Consumo": 10,
+    "Preco": 50000,
+    "Potencia": 0,
+    "0-100": 20,
+    "Bagageira": 0,
+    "Velocidade": 0,
+}
+EXTRAS_SCORING = ("Airbag", "ABS", "ESP", "AC", "GPS")
+TIPOS_COMPACTOS = ["Hatchback", "Compacto"]
+
+
+def _numerica(df: pd.DataFrame, coluna: str, default: float) -> np.ndarray:
+    """Coluna como array float64 (ou constante se a coluna não existir)."""
+    if coluna not in df.columns:
+        return np.full(len(df), float(default))
+    return pd.to_numeric(df[coluna], errors="coerce").to_numpy(dtype=np.float64)
+
+
+def _verdadeira(df: pd.DataFrame, coluna: str) -> np.ndarray:
+    """Valor de verdade Python (`if valor`) de cada célula da coluna."""
+    if coluna not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    serie = df[coluna]
+    if pd.api.types.is_bool_dtype(serie):
+        return serie.to_numpy(dtype=bool)
+    if pd.api.types.is_numeric_dtype(serie):
+        # NaN é verdadeiro em Python, tal como (NaN != 0)
+        return serie.to_numpy(dtype=np.float64) != 0
+    return np.fromiter((bool(v) for v in serie), dtype=bool, count=len(serie))
+
+
+def preparar_colunas(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Pré-calcula, uma vez por catálogo, os arrays usados pelo scoring."""
+    colunas = {
+        nome: _numerica(df, nome, default)
+        for nome, default in DEFAULTS_NUMERICOS.items()
+    }
+    for extra in EXTRAS_SCORING:
+        colunas[extra] = _verdadeira(df, extra).astype(np.int8)
+    if "Tipo" in df.columns:
+        colunas["compacto"] = df["Tipo"].isin(TIPOS_COMPACTOS).to_numpy(dtype=bool)
+    else:
+        colunas["compacto"] = np.zeros(len(df), dtype=bool)
+    return colunas
+
+
+def calcular_scores(
+    colunas: Dict[str, np.ndarray],
+    perfil: Optional[str],
+    posicoes: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Score 0-100 de cada linha (ou só das `posicoes` indicadas).
+
+    Os valores fora de ]0, 100[ ficam exatamente em 0.0 ou 100.0, como o
+    antigo max(0, min(100, score)) — incluindo NaN, que dava 100.
+    """
+    def col(nome):
+        valores = colunas[nome]
+        return valores if posicoes is None else valores[posicoes]
+
+    n = len(colunas["Preco"]) if posicoes is None else len(posicoes)
+
+    if perfil == "economico":
+        consumo_norm = 1 - (col("Consumo") / 20)
+        preco_norm = 1 - (col("Preco") / 100000)
+        score = 100.0 * ((0.6 * consumo_norm + 0.4 * preco_norm) * 2)
+    elif perfil == "desportivo":
+        potencia_norm = np.minimum(col("Potencia") / 300, 1)
+        aceleracao_norm = 1 - (col("0-100") / 30)
+        score = 100.0 * ((0.5 * potencia_norm + 0.5 * aceleracao_norm) * 2)
+    elif perfil == "familia":
+        bagageira_norm = np.minimum(col("Bagageira") / 1000, 1)
+        extras_score = (col("Airbag") + col("ABS") + col("ESP")) / 3
+        score = 100.0 * ((0.6 * bagageira_norm + 0.4 * extras_score) * 2)
+    elif perfil == "cidade":
+        consumo_norm = 1 - (col("Consumo") / 15)
+        tamanho_score = np.where(col("compacto"), 1.0, 0.5)
+        score = 100.0 * ((0.7 * consumo_norm + 0.3 * tamanho_score) * 2)
+    elif perfil == "estrada":
+        velocidade_norm = np.minimum(col("Velocidade") / 250, 1)
+        extras_score = (col("AC") + col("GPS")) / 2
+        score = 100.0 * ((0.5 * velocidade_norm + 0.5 * extras_score) * 2)
+    else:
+        return np.full(n, 100.0)
+
+    # Garantir que score está entre 0-100
+    score = np.where(np.isnan(score) | (score >= 100), 100.0, score)
+    return np.where(score > 0, score, 0.0)
+
+
+def arredondar_scores(scores: np.ndarray) -> np.ndarray:
+    """
+    Equivalente vetorizado de round(score, 2).
+
+    rint(x * 100) / 100 coincide com o round() do Python exceto quando
+    x * 100 fica (quase) a meio de dois inteiros; esses casos raros são
+    arredondados um a um com round().
+    """
+    y = scores * 100
+    arredondados = np.rint(y) / 100
+    ambiguos = np.flatnonzero(np.abs(y - np.floor(y) - 0.5) < 1e-6)
+    for i in ambiguos:
+        arredondados[i] = round(float(scores[i]), 2)
+    return arredondados
+
+
+def top_k(chave: np.ndarray, k: int) -> np.ndarray:
+    """
+    Índices dos k maiores valores de `chave`, por ordem decrescente.
+
+    Empates ficam pela ordem original (como o sort estável de antes). Só
+    os candidatos acima do k-ésimo valor são ordenados.
+    """
+    n = len(chave)
+    if n == 0 or k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if n > k:
+        limite = chave[np.argpartition(-chave, k - 1)[k - 1]]
+        candidatos = np.flatnonzero(chave >= limite)
+    else:
+        candidatos = np.arange(n)
+    ordem = np.lexsort((candidatos, -chave[candidatos]))
+    return candidatos[ordem[:k]]
+
+
+def registo_nativo(linha: pd.Series) -> Dict[str, Any]:
+    """Converte uma linha do DataFrame num dict com tipos nativos do Python."""
+    registo = linha.to_dict()
+    for key, value in registo.items():
+        if pd.isna(value):
+            registo[key] = None
+        elif hasattr(value, "item"):
+            registo[key] = value.item()
+    return registo
+
+
+def _score_json(score: float):
+    """Score tal como o ciclo antigo o devolvia (int nos limites 0 e 100)."""
+    if score >= 100:
+        return 100
+    if score <= 0:
+        return 0
+    return round(score, 2)
+
+
+def recomendar_top(
+    df: pd.DataFrame,
+    colunas: Dict[str, np.ndarray],
+    posicoes: np.ndarray,
+    perfil: Optional[str],
+    k: int = 10,
+) -> List[Dict[str, Any]]:
+    """Pontua as `posicoes` filtradas e devolve os k melhores carros como dicts."""
+    with etapa("scoring"):
+        scores = calcular_scores(colunas, perfil, posicoes)
+        arredondados = arredondar_scores(scores)
+    with etapa("ordenacao"):
+        vencedores = top_k(arredondados, k)
+
+    with etapa("serializacao"):
+        return registos_recomendados(df, posicoes[vencedores], scores[vencedores])
+
+
+def registos_recomendados(
+    df: pd.DataFrame, posicoes: np.ndarray, scores: np.ndarray, campos: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Dicts de /recomendar das `posicoes` (já ordenadas), com "id" e "score".
+
+    Com `campos` só essas chaves, por essa ordem (só as colunas pedidas
+    são convertidas).
+    """
+    colunas = None
+    if campos is not None:
+        colunas = [df.columns.get_loc(c) for c in campos if c in df.columns]
+    resultados = []
+    for pos, score in zip(posicoes, scores):
+        carro_dict = registo_nativo(df.iloc[pos] if colunas is None else df.iloc[pos, colunas])
+        carro_dict["id"] = str(df.index[pos])
+        carro_dict["score"] = _score_json(float(score))
+        if campos is not None:
+            carro_dict = {campo: carro_dict[campo] for campo in campos if campo in carro_dict}
+        resultados.append(carro_dict)
+    return resultados
+
+
+# ==================== SCORING PONDERADO (MIN-MAX) ====================
+# Pesos (consumo, desempenho, espaço) pré-definidos por perfil
+PESOS_PERFIS = {
+    "economico": {"consumo": 0.6, "desempenho": 0.2, "espaco": 0.2},
+    "desportivo": {"consumo": 0.2, "desempenho": 0.6, "espaco": 0.2},
+    "familia": {"consumo": 0.3, "desempenho": 0.2, "espaco": 0.5},
+    "cidade": {"consumo": 0.5, "desempenho": 0.2, "espaco": 0.3},
+    "estrada": {"consumo": 0.4, "desempenho": 0.4, "espaco": 0.2},
+    "equilibrado": {"consumo": 0.33, "desempenho": 0.33, "espaco": 0.34}
+}
+COLUNAS_MINMAX = ("Consumo", "Potencia", "0-100", "Bagageira")
+
+
+def pesos_perfil(
+    perfil: str,
+    prioridade_consumo: float = 1.0,
+    prioridade_desempenho: float = 1.0,
+    prioridade_espaco: float = 1.0,
+) -> Tuple[float, float, float]:
+    """Pesos (consumo, desempenho, espaço); "personalizado" usa as prioridades."""
+    if perfil == "personalizado":
+        return prioridade_consumo, prioridade_desempenho, prioridade_espaco
+    pesos = PESOS_PERFIS.get(perfil, PESOS_PERFIS["equilibrado"])
+    return pesos["consumo"], pesos["desempenho"], pesos["espaco"]
+
+
+def preparar_colunas_minmax(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Colunas (existentes) usadas pelo scoring ponderado, em float64."""
+    return {
+        nome: pd.to_numeric(df[nome], errors="coerce").to_numpy(dtype=np.float64)
+        for nome in COLUNAS_MINMAX
+        if nome in df.columns
+    }
+
+
+def _normalizar(valores: Optional[np.ndarray], n: int, invertido: bool = False) -> np.ndarray:
+    """Min-max para 0-1 (NaN -> mediana; coluna constante -> 0.5; sem coluna -> 0)."""
+    if valores is None or n == 0:
+        return np.zeros(n)
+    faltam = np.isnan(valores)
+    if faltam.any() and not faltam.all():
+        valores = np.where(faltam, np.nanmedian(valores), valores)
+
+    min_val = valores.min()
+    max_val = valores.max()
+    if max_val == min_val:
+        return np.full(n, 0.5)
+    if invertido:
+        return (max_val - valores) / (max_val - min_val)
+    return (valores - min_val) / (max_val - min_val)
+
+
+def componentes_minmax(
+    colunas: Dict[str, np.ndarray], posicoes: np.ndarray,
+) -> np.ndarray:
+    """
+    Matriz (linhas x 4) das componentes normalizadas do scoring ponderado:
+    consumo (invertido), potência, aceleração (invertida) e bagageira.
+    """
+    n = len(posicoes)
+
+    def col(nome):
+        valores = colunas.get(nome)
+        return None if valores is None else valores[posicoes]
+
+    return np.column_stack([
+        _normalizar(col("Consumo"), n, invertido=True),
+        _normalizar(col("Potencia"), n),
+        _normalizar(col("0-100"), n, invertido=True),
+        _normalizar(col("Bagageira"), n),
+    ])
+
+
+def pesos_componentes(pesos: Tuple[float, float, float]) -> Tuple[float, float, float, float]:
+    """Pesos (consumo, desempenho, espaço) aplicados às colunas de componentes_minmax."""
+    peso_consumo, peso_desempenho, peso_espaco = pesos
+    return peso_consumo, peso_desempenho * 0.6, peso_desempenho * 0.4, peso_espaco
+
+
+def scores_ponderados(
+    colunas: Dict[str, np.ndarray],
+    pesos: Tuple[float, float, float],
+    posicoes: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Scores min-max ponderados (score_consumo/desempenho/espaco/total).
+
+    A normalização usa o mínimo/máximo das linhas pontuadas (as `posicoes`
+    filtradas), como o antigo CarroFilterAPI._calcular_scores.
+    """
+    peso_consumo, peso_desempenho, peso_espaco = pesos
+    if posicoes is not None:
+        n = len(posicoes)
+    else:
+        n = len(next(iter(colunas.values()))) if colunas else 0
+
+    def col(nome):
+        valores = colunas.get(nome)
+        if valores is None or posicoes is None:
+            return valores
+        return valores[posicoes]
+
+    score_consumo = _normalizar(col("Consumo"), n, invertido=True) * peso_consumo
+
+    # Desempenho: média de potência e aceleração
+    score_potencia = _normalizar(col("Potencia"), n) * (peso_desempenho * 0.6)
+    score_aceleracao = _normalizar(col("0-100"), n, invertido=True) * (peso_desempenho * 0.4)
+    score_desempenho = score_potencia + score_aceleracao
+
+    # Espaço: bagageira
+    score_espaco = _normalizar(col("Bagageira"), n) * peso_espaco
+
+    score_total = score_consumo + score_desempenho + score_espaco
+
+    # Normalizar score total para 0-100
+    validos = score_total[~np.isnan(score_total)]
+    if len(validos) and validos.max() > validos.min():
+        minimo, maximo = validos.min(), validos.max()
+        score_total = (score_total - minimo) / (maximo - minimo) * 100
+
+    return {
+        "score_consumo": score_consumo,
+        "score_desempenho": score_desempenho,
+        "score_espaco": score_espaco,
+        "score_total": score_total,
+    }
+
+
+def ordenar_por_score(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """Índices por score decrescente (NaN no fim, empates pela ordem original)."""
+    chave = np.where(np.isnan(scores), -np.inf, scores)
+    if k is None:
+        return np.lexsort((np.arange(len(chave)), -chave))
+    return top_k(chave, k)
@@ -0,0 +1,102 @@
+"""
+JSON pré-serializado de cada carro, para GET /carro/{id} e POST /comparar.
+
+Cada linha é convertida uma vez, no carregamento, num fragmento JSON sem
+a chaveta final (`{"Marca":"BMW",...,"Sensor":true`). Os fragmentos ficam
+concatenados num único bloco de bytes com um array de offsets, e os
+endpoints só juntam bytes: fecham o objeto com `}` ou acrescentam o
+campo "id" pedido antes de o fechar. Com uma projeção (`fields=`) só as
+colunas pedidas são serializadas, no momento, para as linhas da resposta.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+import pandas as pd
+
+
+def serializar_linhas(df: pd.DataFrame) -> Tuple[bytes, np.ndarray]:
+    """Bloco de fragmentos JSON das linhas e offsets (n + 1) de cada um."""
+    registos = df.astype(object).where(df.notna(), None).to_dict("records")
+    fragmentos = [orjson.dumps(r, option=orjson.OPT_SERIALIZE_NUMPY)[:-1] for r in registos]
+    offsets = np.zeros(len(fragmentos) + 1, dtype=np.int64)
+    np.cumsum([len(f) for f in fragmentos], out=offsets[1:])
+    return b"".join(fragmentos), offsets
+
+
+def projetar(registo: Dict[str, Any], campos: Sequence[str]) -> Dict[str, Any]:
+    """Só os `campos` de `registo` que existem, pela ordem de `campos`."""
+    return {campo: registo[campo] for campo in campos if campo in registo}
+
+
+class CarrosJSON:
+    """Fragmentos JSON de todas as linhas de um catálogo, indexados por posição."""
+
+    def __init__(self, df: pd.DataFrame):
+        self._bloco, self._offsets = serializar_linhas(df)
+        self._df = df
+        self._colunas = {str(c): i for i, c in enumerate(df.columns)}
+        self.n = len(df)
+        # Campos de cada carro em /comparar: colunas + "id"
+        self.campos_comparados = orjson.dumps([str(c) for c in df.columns] + ["id"])
+
+    def fragmento(self, pos: int) -> bytes:
+        return self._bloco[self._offsets[pos]:self._offsets[pos + 1]]
+
+    def carro(self, pos: int) -> bytes:
+        """Objeto JSON completo da linha `pos`."""
+        return self.fragmento(pos) + b"}"
+
+    def carro_com_id(self, pos: int, carro_id: str) -> bytes:
+        """Objeto JSON da linha `pos` com o campo "id" no fim."""
+        return self.fragmento(pos) + b',"id":' + orjson.dumps(carro_id) + b"}"
+
+    def carro_com_extras(self, pos: int, extras: Dict[str, Any]) -> bytes:
+        """Objeto JSON da linha `pos` com os campos de `extras` no fim."""
+        return self.fragmento(pos) + b"," + orjson.dumps(extras)[1:]
+
+    def projetados(
+        self, posicoes: Sequence[int], campos: Sequence[str], extras: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> List[bytes]:
+        """
+        Objetos JSON das linhas `posicoes` só com os `campos` (colunas ou
+        chaves dos `extras` de cada linha), pela ordem de `campos`.
+        """
+        colunas = [c for c in campos if c in self._colunas]
+        linhas = self._df.iloc[np.asarray(posicoes, dtype=np.intp), [self._colunas[c] for c in colunas]]
+        registos = linhas.astype(object).where(linhas.notna(), None).to_dict("records")
+        if not colunas:
+            # Sem colunas (p.ex. fields=id,score) o to_dict não devolve uma linha por posição
+            registos = [{} for _ in range(len(linhas))]
+        carros = []
+        for i, registo in enumerate(registos):
+            if extras:
+                registo.update(extras[i])
+            carros.append(orjson.dumps(projetar(registo, campos), option=orjson.OPT_SERIALIZE_NUMPY))
+        return carros
+
+    def comparacao(self, itens: Sequence[Tuple[int, str]], campos: Optional[Sequence[str]] = None) -> bytes:
+        """Corpo de POST /comparar para os pares (posição, id pedido); `campos` limita os de cada carro."""
+        if campos is None:
+            carros: List[bytes] = [self.carro_com_id(pos, carro_id) for pos, carro_id in itens]
+            campos_comparados = self.campos_comparados
+        else:
+            carros = self.projetados([pos for pos, _ in itens], campos, [{"id": carro_id} for _, carro_id in itens])
+            campos_comparados = orjson.dumps(list(campos))
+        return b"".join((
+            b'{"comparacao":[', b",".join(carros),
+            b'],"total":', str(len(carros)).encode(),
+            b',"campos_comparados":', campos_comparados, b"}",
+        ))
+
+    def hash_conteudo(self) -> str:
+        """Hash (16 hex) das colunas e de todas as linhas serializadas."""
+        h = hashlib.sha256(self.campos_comparados)
+        h.update(self._bloco)
+        return h.hexdigest()[:16]
+
+    @property
+    def tamanho_bytes(self) -> int:
+        return len(self._bloco) + self._offsets.nbytes
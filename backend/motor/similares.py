@@ -0,0 +1,81 @@
+"""
+Carros semelhantes (GET /carro/{id}/similares).
+
+Cada carro é um vetor com Potencia, Consumo, 0-100, Velocidade,
+Bagageira e Preco normalizados para 0-1 (o mesmo min-max do scoring
+ponderado de car_filter) e os extras a 0/1. Os extras são escalados por
+1/sqrt(número de extras), para que todos juntos pesem no máximo o mesmo
+que uma coluna numérica.
+
+Os vetores ficam numa matriz float32 contígua, construída no carregamento,
+com as normas ao quadrado. A distância de uma consulta a todas as linhas
+é um produto matriz-vetor (BLAS): |a - b|² = |a|² - 2 a·b + |b|². Os k
+mais próximos saem de um argpartition; várias consultas fazem um só
+produto de matrizes.
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .indices import EXTRAS
+from .scoring import _normalizar, _numerica, _verdadeira
+
+COLUNAS_SIMILARES = ("Potencia", "Consumo", "0-100", "Velocidade", "Bagageira", "Preco")
+
+
+class IndiceSimilares:
+    """Matriz de características normalizadas (float32) de todas as linhas."""
+
+    def __init__(self, df: pd.DataFrame):
+        n = len(df)
+        colunas = [
+            _normalizar(_numerica(df, nome, np.nan), n) for nome in COLUNAS_SIMILARES
+        ]
+        extras = [c for c in EXTRAS if c in df.columns]
+        peso_extras = 1 / np.sqrt(len(extras)) if extras else 0.0
+        colunas += [_verdadeira(df, c) * peso_extras for c in extras]
+
+        matriz = np.column_stack(colunas) if colunas else np.zeros((n, 0))
+        # Coluna só com NaN: sem informação, fica a meio
+        self.matriz = np.ascontiguousarray(np.nan_to_num(matriz, nan=0.5), dtype=np.float32)
+        self.normas = np.einsum("ij,ij->i", self.matriz, self.matriz)
+
+    def __len__(self) -> int:
+        return len(self.matriz)
+
+    def vizinhos_lote(self, posicoes: Sequence[int], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Para cada linha em `posicoes`, as k mais próximas (sem ela própria)
+        e as distâncias, por distância crescente (empates pela posição).
+        """
+        posicoes = np.asarray(posicoes, dtype=np.int64)
+        k = max(0, min(k, len(self) - 1))
+        consultas = self.matriz[posicoes]
+        # (q x d) @ (d x n): uma chamada BLAS para todas as consultas
+        d2 = self.normas[None, :] - 2 * (consultas @ self.matriz.T) + self.normas[posicoes][:, None]
+        np.maximum(d2, 0, out=d2)
+        d2[np.arange(len(posicoes)), posicoes] = np.inf
+
+        vizinhos = np.empty((len(posicoes), k), dtype=np.int64)
+        distancias = np.empty((len(posicoes), k), dtype=np.float32)
+        for j, linha in enumerate(d2):
+            if k < len(linha):
+                limite = linha[np.argpartition(linha, k - 1)[k - 1]] if k else -np.inf
+                candidatos = np.flatnonzero(linha <= limite)
+            else:
+                candidatos = np.arange(len(linha))
+            ordem = np.lexsort((candidatos, linha[candidatos]))[:k]
+            vizinhos[j] = candidatos[ordem]
+            distancias[j] = np.sqrt(linha[candidatos[ordem]])
+        return vizinhos, distancias
+
+    def vizinhos(self, pos: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """As k linhas mais próximas de `pos` e as distâncias."""
+        vizinhos, distancias = self.vizinhos_lote([pos], k)
+        return vizinhos[0], distancias[0]
+
+    @property
+    def tamanho_bytes(self) -> int:
+        return self.matriz.nbytes + self.normas.nbytes
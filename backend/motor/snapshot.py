@@ -0,0 +1,129 @@
+"""
+Snapshot binário do catálogo (colunas .npy + manifest.json).
+
+Gerado no build a partir da folha de cálculo/CSV e aberto com mmap no
+arranque, evitando o read_excel em cada cold start:
+
+    python -m motor snapshot ["Carros pt 50.xlsx"] [--destino snapshot]
+
+Colunas numéricas/booleanas são guardadas tal como estão; as de texto
+como códigos int32 com as categorias no manifest. O snapshot só é usado
+enquanto o ficheiro de origem mantiver o tamanho e a data de modificação
+registados.
+
+Para ficheiros grandes o snapshot é escrito aos blocos por ingestao.py,
+sem carregar o ficheiro inteiro; o manifest é sempre o último ficheiro
+escrito.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+VERSAO_FORMATO = 2
+# Regras de leitura da origem (esquema, nomes canónicos, CSV colado numa
+# coluna do xlsx): um snapshot escrito com outras regras não é usado
+VERSAO_INGESTAO = 2
+MANIFEST = "manifest.json"
+PASTA_PADRAO = Path(__file__).resolve().parent.parent / "snapshot"
+
+
+def _assinatura(origem: Path) -> Dict[str, Any]:
+    estado = origem.stat()
+    return {
+        "nome": origem.name,
+        "tamanho": estado.st_size,
+        "mtime_ns": estado.st_mtime_ns,
+    }
+
+
+def _valor_json(valor):
+    """Categoria serializável em JSON (numpy -> nativo, resto -> str)."""
+    if hasattr(valor, "item"):
+        valor = valor.item()
+    if isinstance(valor, (str, bool, int, float)):
+        return valor
+    return str(valor)
+
+
+def guardar_snapshot(df: pd.DataFrame, destino: Path, origem: Path) -> Path:
+    """Escreve `df` em `destino` e devolve o caminho do manifest."""
+    destino.mkdir(parents=True, exist_ok=True)
+    colunas: List[Dict[str, Any]] = []
+
+    for i, nome in enumerate(df.columns):
+        serie = df[nome]
+        ficheiro = f"col_{i:03d}.npy"
+        if pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+            valores = serie.to_numpy()
+            colunas.append({"nome": nome, "ficheiro": ficheiro, "tipo": "numerica",
+                            "dtype": str(valores.dtype)})
+        else:
+            codigos, categorias = pd.factorize(serie)
+            valores = codigos.astype(np.int32)
+            colunas.append({"nome": nome, "ficheiro": ficheiro, "tipo": "categorica",
+                            "categorias": [_valor_json(c) for c in categorias]})
+        np.save(destino / ficheiro, np.ascontiguousarray(valores))
+
+    return escrever_manifest(destino, origem, len(df), colunas)
+
+
+def escrever_manifest(
+    destino: Path, origem: Path, linhas: int, colunas: List[Dict[str, Any]], **extra: Any,
+) -> Path:
+    """Escreve o manifest (depois de todas as colunas) e devolve o caminho."""
+    manifest = {
+        "versao_formato": VERSAO_FORMATO,
+        "versao_ingestao": VERSAO_INGESTAO,
+        "origem": _assinatura(origem),
+        "linhas": linhas,
+        "colunas": colunas,
+        **extra,
+    }
+    caminho = destino / MANIFEST
+    temporario = caminho.with_suffix(".tmp")
+    temporario.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    temporario.replace(caminho)
+    return caminho
+
+
+def ler_manifest(pasta: Path) -> Optional[Dict[str, Any]]:
+    caminho = pasta / MANIFEST
+    if not caminho.exists():
+        return None
+    manifest = json.loads(caminho.read_text(encoding="utf-8"))
+    versoes = (manifest.get("versao_formato"), manifest.get("versao_ingestao"))
+    if versoes != (VERSAO_FORMATO, VERSAO_INGESTAO):
+        print(f"⚠️ Snapshot de outra versão {versoes}, a ler o ficheiro de origem "
+              f"(regenere com `python -m motor snapshot`)")
+        return None
+    return manifest
+
+
+def origem_atualizada(manifest: Dict[str, Any], data_files: List[Path]) -> Optional[Path]:
+    """Ficheiro de origem do snapshot, se ainda existir sem alterações."""
+    for data_file in data_files:
+        if data_file.name == manifest["origem"]["nome"]:
+            return data_file if _assinatura(data_file) == manifest["origem"] else None
+    return None
+
+
+def descodificar(codigos: np.ndarray, categorias: List[Any]) -> np.ndarray:
+    """Valores (object) de uma coluna de texto guardada como códigos."""
+    # Código -1 (valor em falta) aponta para o NaN acrescentado no fim
+    return np.array(list(categorias) + [np.nan], dtype=object)[codigos]
+
+
+def carregar_snapshot(pasta: Path, manifest: Dict[str, Any]) -> pd.DataFrame:
+    """Abre as colunas do snapshot com mmap (só leitura)."""
+    dados = {}
+    for coluna in manifest["colunas"]:
+        valores = np.load(pasta / coluna["ficheiro"], mmap_mode="r")
+        if coluna["tipo"] == "categorica":
+            valores = descodificar(valores, coluna["categorias"])
+        dados[coluna["nome"]] = valores
+    return pd.DataFrame(dados, copy=False)
+
@@ -0,0 +1,63 @@
+"""
+Fixtures dos testes (executar a partir da raiz ou de backend/):
+
+    python -m pytest -q backend/tests
+
+Precisam de pytest e httpx (TestClient), que não estão em requirements.txt.
+Os catálogos são os sintéticos e reprodutíveis de benchmarks.sintetico.
+A API é importada uma vez, com DATA_DIR a apontar para um CSV sintético
+numa pasta temporária (sem snapshot), antes de qualquer teste a usar.
+"""
+
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.sintetico import gerar_catalogo  # noqa: E402
+
+import motor  # noqa: E402
+
+# Catálogo servido pela API nos testes: definido antes de `import api`
+PASTA_API = Path(tempfile.mkdtemp(prefix="carros-testes-"))
+LINHAS_API = 2000
+gerar_catalogo(LINHAS_API, seed=1, fracao_nan=0.02).to_csv(PASTA_API / "carros.csv", index=False)
+os.environ.update({
+    "DATA_DIR": str(PASTA_API),
+    "SNAPSHOT_DIR": str(PASTA_API / "snapshot"),
+    "ADMIN_TOKEN": "segredo",
+    "RECARREGAR_INTERVALO": "0",
+    "PERFIL_LENTOS_MS": "0",
+})
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(PASTA_API, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def catalogo():
+    """Catálogo pequeno com alguns valores em falta."""
+    return motor.Catalogo(gerar_catalogo(3000, seed=2, fracao_nan=0.05), "testes")
+
+
+@pytest.fixture(scope="session")
+def api():
+    with contextlib.redirect_stdout(sys.stderr):
+        import api as modulo
+    return modulo
+
+
+@pytest.fixture(scope="session")
+def cliente(api):
+    from fastapi.testclient import TestClient
+
+    with TestClient(api.app) as cliente:
+        yield cliente
@@ -0,0 +1,202 @@
+"""
+Implementações anteriores do scoring e dos filtros, copiadas tal como
+eram, e os casos de teste com que o motor é comparado (test_scoring.py,
+test_car_filter.py).
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import motor
+from benchmarks.sintetico import COMBUSTIVEIS, TIPOS, gerar_catalogo
+
+# car_filter.py está na raiz do repositório
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from car_filter import CarroFilterAPI, FiltrosRequest  # noqa: E402,F401
+
+PERFIS_TESTE = list(motor.PERFIS) + [None, "desconhecido"]
+PARA_EXTENSO = {canonico: alternativos[0] for canonico, alternativos in motor.SINONIMOS.items()}
+PERFIS_CAR_FILTER = list(motor.PESOS_PERFIS) + ["personalizado", "desconhecido"]
+
+
+# /recomendar antes do motor (ciclo iterrows)
+def recomendar_legado(filtered_df: pd.DataFrame, perfil, k: int = 10):
+    """Cópia do ciclo de scoring original de recomendar_carros."""
+    carros_com_score = []
+
+    for idx, row in filtered_df.iterrows():
+        score = 100.0
+
+        if perfil:
+            if perfil == "economico":
+                consumo_norm = 1 - (row.get('Consumo', 10) / 20)
+                preco_norm = 1 - (row.get('Preco', 50000) / 100000)
+                score *= (0.6 * consumo_norm + 0.4 * preco_norm) * 2
+            elif perfil == "desportivo":
+                potencia_norm = min(row.get('Potencia', 0) / 300, 1)
+                aceleracao_norm = 1 - (row.get('0-100', 20) / 30)
+                score *= (0.5 * potencia_norm + 0.5 * aceleracao_norm) * 2
+            elif perfil == "familia":
+                bagageira_norm = min(row.get('Bagageira', 0) / 1000, 1)
+                extras_score = sum([
+                    1 if row.get('Airbag', False) else 0,
+                    1 if row.get('ABS', False) else 0,
+                    1 if row.get('ESP', False) else 0
+                ]) / 3
+                score *= (0.6 * bagageira_norm + 0.4 * extras_score) * 2
+            elif perfil == "cidade":
+                consumo_norm = 1 - (row.get('Consumo', 10) / 15)
+                tamanho_score = 1 if row.get('Tipo', '') in ['Hatchback', 'Compacto'] else 0.5
+                score *= (0.7 * consumo_norm + 0.3 * tamanho_score) * 2
+            elif perfil == "estrada":
+                velocidade_norm = min(row.get('Velocidade', 0) / 250, 1)
+                extras_score = sum([
+                    1 if row.get('AC', False) else 0,
+                    1 if row.get('GPS', False) else 0
+                ]) / 2
+                score *= (0.5 * velocidade_norm + 0.5 * extras_score) * 2
+
+        score = max(0, min(100, score))
+
+        carro_dict = row.to_dict()
+        for key, value in carro_dict.items():
+            if pd.isna(value):
+                carro_dict[key] = None
+            elif hasattr(value, 'item'):
+                carro_dict[key] = value.item()
+
+        carro_dict['id'] = str(idx)
+        carro_dict['score'] = round(score, 2)
+        carros_com_score.append(carro_dict)
+
+    carros_com_score.sort(key=lambda x: x['score'], reverse=True)
+    return carros_com_score[:k]
+
+
+def catalogos():
+    """Catálogos de teste: normal, com NaN, com muitos empates e sem colunas."""
+    yield "normal", gerar_catalogo(2000, seed=1)
+    yield "com_nan", gerar_catalogo(2000, seed=2, fracao_nan=0.1)
+
+    empates = gerar_catalogo(1000, seed=3)
+    empates["Consumo"] = 5.0
+    empates["Preco"] = 20000
+    empates["Bagageira"] = 400
+    yield "empates", empates
+
+    # Valores fora dos intervalos das fórmulas (scores < 0 e > 100)
+    extremos = gerar_catalogo(500, seed=4)
+    extremos["Consumo"] = np.linspace(-5, 40, 500)
+    extremos["Preco"] = np.linspace(-1000, 300000, 500)
+    yield "extremos", extremos
+
+    yield "sem_colunas", gerar_catalogo(300, seed=5).drop(
+        columns=["Consumo", "Potencia", "GPS", "Tipo"]
+    )
+
+
+def subconjuntos(df: pd.DataFrame, rng):
+    """Filtragens de teste: tudo, aleatória, poucas linhas e vazia."""
+    yield df
+    yield df[rng.random(len(df)) < 0.3]
+    yield df.iloc[:7]
+    yield df.iloc[:0]
+
+def filtros_teste(rng, colunas):
+    """Sem filtros, só preço, combinações aleatórias e filtros sem resultados."""
+    yield motor.Filtros()
+    yield motor.Filtros(preco_max=30000)
+    for _ in range(6):
+        yield motor.Filtros(
+            preco_max=float(rng.choice([20000, 40000, 80000])),
+            tipos=tuple(rng.choice(TIPOS, int(rng.integers(1, 3)), replace=False)) if "Tipo" in colunas else (),
+            combustiveis=tuple(rng.choice(COMBUSTIVEIS, int(rng.integers(0, 2)), replace=False)),
+            extras=("GPS",) if rng.random() < 0.5 else (),
+        )
+    yield motor.Filtros(preco_max=1)
+
+
+# car_filter.py antes do motor (filtros e scores em pandas)
+def calcular_scores_legado(df: pd.DataFrame, filtros: FiltrosRequest) -> pd.DataFrame:
+    """Cópia do CarroFilterAPI._calcular_scores original."""
+    df_scored = df.copy()
+
+    def normalizar(coluna, invertido=False):
+        if coluna not in df_scored.columns:
+            return pd.Series([0] * len(df_scored), index=df_scored.index)
+        valores = df_scored[coluna].fillna(df_scored[coluna].median())
+        min_val = valores.min()
+        max_val = valores.max()
+        if max_val == min_val:
+            return pd.Series([0.5] * len(df_scored), index=df_scored.index)
+        if invertido:
+            return (max_val - valores) / (max_val - min_val)
+        return (valores - min_val) / (max_val - min_val)
+
+    peso_consumo, peso_desempenho, peso_espaco = motor.pesos_perfil(
+        filtros.perfil, filtros.prioridade_consumo,
+        filtros.prioridade_desempenho, filtros.prioridade_espaco,
+    )
+    score_consumo = normalizar('Consumo (l/100km)', invertido=True) * peso_consumo
+    score_potencia = normalizar('Potência (cv)', invertido=False) * (peso_desempenho * 0.6)
+    score_aceleracao = normalizar('0-100 km/h (s)', invertido=True) * (peso_desempenho * 0.4)
+    score_desempenho = score_potencia + score_aceleracao
+    score_espaco = normalizar('Bagageira (l)', invertido=False) * peso_espaco
+
+    df_scored['score_consumo'] = score_consumo
+    df_scored['score_desempenho'] = score_desempenho
+    df_scored['score_espaco'] = score_espaco
+    df_scored['score_total'] = score_consumo + score_desempenho + score_espaco
+    if df_scored['score_total'].max() > df_scored['score_total'].min():
+        df_scored['score_total'] = (
+            (df_scored['score_total'] - df_scored['score_total'].min()) /
+            (df_scored['score_total'].max() - df_scored['score_total'].min()) * 100
+        )
+    return df_scored
+
+
+def filtrar_legado(df: pd.DataFrame, filtros: FiltrosRequest) -> pd.DataFrame:
+    """Cópia dos filtros pandas originais de recomendar_carros."""
+    if filtros.preco_max:
+        df = df[df['Preço Indicativo (€)'] <= filtros.preco_max]
+    if filtros.tipos:
+        df = df[df['Tipo'].isin(filtros.tipos)]
+    if filtros.combustiveis:
+        df = df[df['Combustível'].isin(filtros.combustiveis)]
+    if filtros.bagageira_min:
+        df = df[df['Bagageira (l)'] >= filtros.bagageira_min]
+    if filtros.consumo_max:
+        df = df[df['Consumo (l/100km)'] <= filtros.consumo_max]
+    for extra in filtros.extras_obrigatorios or []:
+        if extra in df.columns:
+            df = df[df[extra] == True]  # noqa: E712
+    return df
+
+
+def ler_legado(csv: Path) -> pd.DataFrame:
+    """DataFrame do _prepare_data original (tipos do read_csv, sem compactar)."""
+    df = pd.read_csv(csv)
+    for col in ['Ano', 'Potência (cv)', 'Consumo (l/100km)', '0-100 km/h (s)',
+                'Velocidade Max (km/h)', 'Bagageira (l)', 'Preço Indicativo (€)']:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    df['id'] = df['Marca'] + ' ' + df['Modelo'] + ' ' + df['Ano'].astype(str)
+    return df
+
+
+def pedidos(rng):
+    """Pedidos de teste: sem filtros, filtros aleatórios e um que não devolve nada."""
+    for perfil in PERFIS_CAR_FILTER:
+        yield FiltrosRequest(perfil=perfil, prioridade_consumo=float(rng.integers(1, 5)))
+        yield FiltrosRequest(
+            perfil=perfil,
+            preco_max=float(rng.integers(20000, 80000)),
+            tipos=["SUV", "Hatchback"],
+            bagageira_min=300,
+            extras_obrigatorios=["Navegador", "AC"],
+        )
+        yield FiltrosRequest(perfil=perfil, combustiveis=["Diesel"], consumo_max=6.0)
+    yield FiltrosRequest(preco_max=1)
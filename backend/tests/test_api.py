@@ -0,0 +1,164 @@
+"""Endpoints HTTP sobre o catálogo sintético de conftest.PASTA_API."""
+
+import time
+
+import orjson
+import pytest
+
+from conftest import LINHAS_API, PASTA_API
+
+PEDIDO = {"preco_max": 40000, "tipo": "SUV", "perfil": "familia"}
+
+
+def test_health_e_versao(cliente):
+    limite = time.monotonic() + 30
+    while (saude := cliente.get("/health").json())["status"] == "a carregar":
+        assert time.monotonic() < limite
+        time.sleep(0.05)
+    assert saude["status"] == "healthy" and saude["carros"] == LINHAS_API
+    assert cliente.get("/tipos").headers["X-Dataset-Version"] == saude["dataset_version"]
+
+
+def test_etag_e_304(cliente):
+    resposta = cliente.post("/recomendar", json=PEDIDO)
+    assert resposta.status_code == 200
+    etag = resposta.headers["ETag"]
+    assert etag.startswith('W/"') and resposta.json()["dataset_version"] in etag
+
+    repetida = cliente.post("/recomendar", json=PEDIDO, headers={"If-None-Match": etag})
+    assert repetida.status_code == 304 and repetida.content == b""
+    assert repetida.headers["ETag"] == etag
+    # A mesma consulta com as chaves por outra ordem tem o mesmo ETag
+    assert cliente.post("/recomendar", json=dict(reversed(PEDIDO.items()))).headers["ETag"] == etag
+    assert cliente.post("/recomendar", json={**PEDIDO, "preco_max": 30000},
+                        headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_recomendar_campos(cliente, api):
+    carros = cliente.post("/recomendar", json=PEDIDO).json()["recomendacoes"]
+    assert carros and set(carros[0]) <= set(api.CAMPOS_RECOMENDAR)
+    assert "incremental" not in cliente.post("/recomendar", json=PEDIDO).json()
+    projetados = cliente.post("/recomendar?fields=id,Preco", json=PEDIDO).json()["recomendacoes"]
+    assert [list(c) for c in projetados] == [["id", "Preco"]] * len(carros)
+    assert cliente.post("/recomendar?fields=Cor", json=PEDIDO).status_code == 400
+
+
+def test_paginas_por_cursor(cliente):
+    linhas = cliente.post("/recomendar?stream=true", json=PEDIDO).content.splitlines()
+    completo = [orjson.loads(linha)["id"] for linha in linhas[1:]]
+    ids, cursor = [], None
+    while True:
+        url = "/recomendar?limit=7" + (f"&cursor={cursor}" if cursor else "")
+        pagina = cliente.post(url, json=PEDIDO).json()
+        assert pagina["total_encontrados"] == len(completo)
+        ids += [c["id"] for c in pagina["recomendacoes"]]
+        cursor = pagina["proximo_cursor"]
+        if cursor is None:
+            break
+    assert ids == completo and len(ids) > 7
+    # Os 10 primeiros são os de /recomendar
+    assert ids[:10] == [c["id"] for c in cliente.post("/recomendar", json=PEDIDO).json()["recomendacoes"]]
+
+    primeiro = cliente.post("/recomendar?limit=7", json=PEDIDO).json()["proximo_cursor"]
+    assert cliente.post(f"/recomendar?limit=7&cursor={primeiro}", json={**PEDIDO, "tipo": "Sedan"}).status_code == 400
+    assert cliente.post("/recomendar?limit=7&cursor=lixo", json=PEDIDO).status_code == 400
+    assert cliente.post(f"/recomendar?stream=true&cursor={primeiro}", json=PEDIDO).status_code == 400
+
+
+def test_stream_ndjson(cliente):
+    resposta = cliente.post("/recomendar?stream=true&limit=25&fields=id,score", json={})
+    assert resposta.headers["content-type"].startswith("application/x-ndjson")
+    cabeca, *carros = [orjson.loads(linha) for linha in resposta.content.splitlines()]
+    assert cabeca["total_encontrados"] == LINHAS_API and len(carros) == 25
+    scores = [c["score"] for c in carros]
+    assert scores == sorted(scores, reverse=True) and set(carros[0]) == {"id", "score"}
+
+
+def test_lote(cliente):
+    pedidos = [{"id": "a", **PEDIDO}, {"preco_max": 1}, {"id": "c", "ponderado": True, "perfil": "economico"}]
+    linhas = [orjson.loads(l) for l in cliente.post("/recomendar/batch", json={"pedidos": pedidos}).content.splitlines()]
+    assert [(l["indice"], l["id"]) for l in linhas] == [(0, "a"), (1, None), (2, "c")]
+    isolado = cliente.post("/recomendar", json=PEDIDO).json()
+    assert linhas[0]["recomendacoes"] == isolado["recomendacoes"]
+    assert linhas[1]["total"] == 0 and len(linhas[2]["recomendacoes"]) == 10
+
+    projetado = orjson.loads(cliente.post("/recomendar/batch?fields=id", json={"pedidos": pedidos[:1]}).content)
+    assert [list(c) for c in projetado["recomendacoes"]] == [["id"]] * 10
+    assert cliente.post("/recomendar/batch?fields=Cor", json={"pedidos": pedidos}).status_code == 400
+
+
+def test_facetas(cliente):
+    facetas = cliente.post("/facetas", json={"tipo": "SUV"}).json()
+    suv = next(f for f in facetas["tipos"] if f["valor"] == "SUV")
+    assert facetas["total"] == suv["total"] > 0
+    # A dimensão do próprio filtro ignora-o: os outros tipos continuam contados
+    assert sum(f["total"] for f in facetas["tipos"]) > facetas["total"]
+
+
+def test_pareto(cliente, monkeypatch):
+    resposta = cliente.post("/recomendar/pareto", json={"objetivos": ["consumo", "potencia"], "frentes": 2})
+    assert resposta.status_code == 200
+    frentes = resposta.json()["frentes"]
+    assert [f["frente"] for f in frentes] == [1, 2] and all(c["frente"] == 1 for c in frentes[0]["carros"])
+
+    assert cliente.post("/recomendar/pareto", json={"objetivos": ["cor"]}).status_code == 400
+    monkeypatch.setattr("motor.catalogo.MAXIMO_LINHAS_MUITOS_OBJETIVOS", 100)
+    muitos = {"objetivos": ["consumo", "potencia", "bagageira", "preco"], "frentes": 3}
+    assert cliente.post("/recomendar/pareto", json=muitos).status_code == 400
+
+
+def test_custo(cliente):
+    pedido = {"km_ano": 20000, "anos": 4, "intervalo_km_ano": [10000, 30000], "cenarios": 200, "semente": 1, "k": 5}
+    custo = cliente.post("/custo", json=pedido).json()
+    medios = [c["custo_medio"] for c in custo["ranking"]]
+    assert len(medios) == 5 and medios == sorted(medios) and custo["cenarios"] == 200
+    assert cliente.post("/custo", json=pedido).json() == custo
+    assert cliente.post("/custo", json={**pedido, "semente": -1}).status_code == 422
+    assert cliente.post("/custo", json={**pedido, "precos_combustivel": {"Vapor": 1}}).status_code == 400
+
+
+def test_carro_similares_e_comparar(cliente):
+    carro = cliente.get("/carro/5").json()
+    assert carro["Marca"]
+    assert cliente.get("/carro/abc").status_code == 400
+    assert cliente.get(f"/carro/{LINHAS_API}").status_code == 404
+
+    similares = cliente.get("/carro/5/similares?k=4").json()["similares"]
+    distancias = [c["distancia"] for c in similares]
+    assert len(similares) == 4 and "5" not in [c["id"] for c in similares] and distancias == sorted(distancias)
+
+    comparacao = cliente.post("/comparar?fields=id,Marca", json={"modelos_ids": ["5", "x", "7"]}).json()
+    marca_7 = cliente.get("/carro/7").json()["Marca"]
+    assert comparacao["comparacao"] == [{"id": "5", "Marca": carro["Marca"]}, {"id": "7", "Marca": marca_7}]
+    assert comparacao["campos_comparados"] == ["id", "Marca"]
+    assert cliente.post("/comparar", json={"modelos_ids": ["x"]}).status_code == 404
+
+
+def test_modelos(cliente, api):
+    todos = cliente.get("/modelos").json()
+    assert todos["total"] == len(todos["modelos"]) > 0 and list(todos["modelos"][0]) == list(api.CAMPOS_MODELOS)
+    marca = todos["modelos"][0]["marca"]
+    filtrados = cliente.get("/modelos", params={"q": marca.lower()}).json()["modelos"]
+    assert filtrados and all(m["marca"] == marca or marca in m["nome"] for m in filtrados)
+
+
+def test_compressao(cliente):
+    resposta = cliente.post("/recomendar?stream=false&limit=500", json={}, headers={"Accept-Encoding": "gzip"})
+    assert resposta.headers["content-encoding"] == "gzip" and len(resposta.json()["recomendacoes"]) == 500
+
+
+def test_metrics(cliente):
+    cliente.get("/health")
+    texto = cliente.get("/metrics").text
+    assert f"carros_catalogo_linhas {LINHAS_API}" in texto and 'endpoint="/health"' in texto
+
+
+@pytest.mark.parametrize("token, estado", [("", 403), ("errado", 403)])
+def test_admin_reload_recusado(cliente, token, estado):
+    assert cliente.post("/admin/reload", headers={"X-Admin-Token": token}).status_code == estado
+
+
+def test_admin_reload_escreve_a_marca(cliente):
+    resposta = cliente.post("/admin/reload", headers={"X-Admin-Token": "segredo"})
+    assert resposta.status_code == 202
+    assert (PASTA_API / ".recarregar").read_text(encoding="utf-8") == resposta.json()["recarga_pedida"]
@@ -0,0 +1,32 @@
+"""Chaves canónicas e LRU de respostas."""
+
+import time
+
+import motor
+
+
+def test_canonicalizar_independente_da_ordem_e_das_omissoes():
+    a = motor.canonicalizar({"perfil": "familia", "preco_max": 30000.0, "tipo": None, "extras": []})
+    b = motor.canonicalizar({"preco_max": 30000.0, "perfil": "familia"})
+    assert a == b
+
+
+def test_canonicalizar_mantem_zero_e_negativos():
+    sem = motor.canonicalizar({})
+    assert motor.canonicalizar({"semente": 0}) != sem
+    assert motor.canonicalizar({"preco_max": -1}) != motor.canonicalizar({"preco_max": 1})
+    assert motor.canonicalizar({"ponderado": False}) != sem
+
+
+def test_cache_respostas_lru_e_expiracao():
+    cache = motor.CacheRespostas(maximo=2, ttl=60)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    assert cache.obter("a") == 1
+    cache.guardar("c", 3)  # "b" é o menos usado
+    assert cache.obter("b") is None and cache.obter("a") == 1 and cache.obter("c") == 3
+
+    curta = motor.CacheRespostas(maximo=2, ttl=0.01)
+    curta.guardar("a", 1)
+    time.sleep(0.02)
+    assert curta.obter("a") is None
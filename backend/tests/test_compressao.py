@@ -0,0 +1,29 @@
+"""Negociação e compressão de respostas."""
+
+import gzip
+
+import pytest
+
+import motor
+
+
+def test_escolher_codificacao():
+    preferida = motor.codificacoes_disponiveis()[0]
+    assert motor.escolher_codificacao("gzip, br", 10_000) == preferida
+    assert motor.escolher_codificacao("gzip", 10_000) == "gzip"
+    assert motor.escolher_codificacao("gzip;q=0, identity", 10_000) is None
+    assert motor.escolher_codificacao("*", 10_000) == preferida
+    assert motor.escolher_codificacao("gzip", 10) is None
+    assert motor.escolher_codificacao("", 10_000) is None
+
+
+@pytest.mark.parametrize("codificacao", motor.codificacoes_disponiveis())
+def test_comprimir_e_deterministico(codificacao):
+    corpo = b'{"carros": [' + b'{"Marca": "Fiat"},' * 500 + b"{}]}"
+    comprimido = motor.comprimir(corpo, codificacao)
+    assert comprimido == motor.comprimir(corpo, codificacao) and len(comprimido) < len(corpo)
+    if codificacao == "gzip":
+        assert gzip.decompress(comprimido) == corpo
+    else:
+        import brotli
+        assert brotli.decompress(comprimido) == corpo
@@ -0,0 +1,47 @@
+"""Custo total de posse contra a matriz carros × cenários completa."""
+
+import numpy as np
+import pytest
+
+import motor
+from benchmarks.custo import catalogo_escada, cenarios_aleatorios, forca_bruta
+from benchmarks.sintetico import TIPOS, gerar_catalogo
+
+
+@pytest.mark.parametrize("caso", range(30))
+def test_simular_igual_a_forca_bruta(caso):
+    rng = np.random.default_rng(caso)
+    catalogo = (
+        catalogo_escada(int(rng.integers(50, 300))) if caso % 10 == 0
+        else motor.Catalogo(gerar_catalogo(int(rng.integers(50, 1500)), seed=caso, fracao_nan=0.05), "custo")
+    )
+    cenarios = cenarios_aleatorios(catalogo.indice_custo, rng, int(rng.integers(1, 300)))
+    criterios = {}
+    if rng.random() < 0.5:
+        criterios["preco_max"] = float(rng.integers(15, 60) * 1000)
+    if rng.random() < 0.3:
+        criterios["tipos"] = (str(rng.choice(TIPOS)),)
+    filtros = motor.Filtros(**criterios)
+    k = int(rng.integers(1, 20))
+
+    total, resultado = catalogo.custo(filtros, cenarios, k)
+    if total == 0:
+        assert resultado is None
+        return
+    esperado = forca_bruta(catalogo.indice_custo, catalogo.filtrar(filtros).mascara(), cenarios, k)
+    assert np.array_equal(resultado.ranking, esperado["ranking"])
+    np.testing.assert_allclose(resultado.custo_medio, esperado["custo_medio"], rtol=1e-9)
+    np.testing.assert_allclose(resultado.percentis, esperado["percentis"], rtol=1e-9)
+    assert np.array_equal(resultado.vencedores, esperado["vencedores"])
+    assert np.array_equal(resultado.frequencia, esperado["frequencia"])
+
+
+def test_cenarios_validados():
+    indice = motor.Catalogo(gerar_catalogo(50, seed=1), "custo").indice_custo
+    with pytest.raises(ValueError):
+        indice.cenarios(15000, 5, intervalos={"Diesel": [2.0, 1.0]})
+    with pytest.raises(ValueError):
+        indice.cenarios(15000, 5, precos={"Hidrogénio": 10.0})
+    assert indice.cenarios(15000, 5).n == 1
+    semente = indice.cenarios(15000, 5, intervalo_km=[5000, 30000], n=10, semente=3).unitario
+    assert np.array_equal(semente, indice.cenarios(15000, 5, intervalo_km=[5000, 30000], n=10, semente=3).unitario)
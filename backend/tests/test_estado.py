@@ -0,0 +1,77 @@
+"""Ciclo de vida do catálogo: carregamento, recarga e vigia de ficheiros."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import motor
+
+
+def esperar(condicao, timeout=5.0):
+    limite = time.monotonic() + timeout
+    while not condicao():
+        assert time.monotonic() < limite
+        time.sleep(0.01)
+
+
+def test_erro_e_descartar():
+    versoes = iter([RuntimeError("sem dados"), "v1"])
+
+    def carregar():
+        proximo = next(versoes)
+        if isinstance(proximo, Exception):
+            raise proximo
+        return SimpleNamespace(versao=proximo)
+
+    estado = motor.EstadoCatalogo(carregar)
+    with pytest.raises(motor.CatalogoIndisponivel):
+        estado.obter(timeout=5)
+    # Sem descartar, o erro fica
+    with pytest.raises(motor.CatalogoIndisponivel):
+        estado.obter(timeout=5)
+    estado.descartar()
+    assert estado.obter(timeout=5).versao == "v1"
+
+
+def test_recarregar_so_publica_versoes_novas():
+    versoes = iter(["v1", "v1", "v2"])
+    publicados = []
+    estado = motor.EstadoCatalogo(lambda: SimpleNamespace(versao=next(versoes)), publicados.append)
+    assert not estado.recarregar()  # antes do carregamento inicial
+    assert estado.obter(timeout=5).versao == "v1"
+
+    assert estado.recarregar()
+    esperar(lambda: not estado.recarga_em_curso)
+    assert estado.recargas == 0
+    assert estado.recarregar()
+    esperar(lambda: not estado.recarga_em_curso)
+    assert (estado.recargas, estado.catalogo.versao) == (1, "v2")
+    assert [c.versao for c in publicados] == ["v1", "v2"]
+
+
+def test_recarga_falhada_mantem_a_versao_atual():
+    resultados = iter(["v1", None])
+
+    def carregar():
+        versao = next(resultados)
+        if versao is None:
+            raise OSError("ficheiro a meio")
+        return SimpleNamespace(versao=versao)
+
+    estado = motor.EstadoCatalogo(carregar)
+    estado.obter(timeout=5)
+    estado.recarregar()
+    esperar(lambda: not estado.recarga_em_curso)
+    assert isinstance(estado.erro_recarga, OSError) and estado.obter().versao == "v1"
+
+
+def test_vigia_espera_que_a_assinatura_estabilize():
+    assinatura = ["a"]
+    mudancas = threading.Event()
+    motor.VigiaFicheiros(lambda: assinatura[0], lambda: mudancas.set() or True, 0.01).iniciar()
+    time.sleep(0.05)
+    assert not mudancas.is_set()
+    assinatura[0] = "b"
+    assert mudancas.wait(5)
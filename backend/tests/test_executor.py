@@ -0,0 +1,51 @@
+"""ExecutorLimitado: limite de pendentes, coalescência e continuação."""
+
+import asyncio
+import threading
+
+import pytest
+
+import motor
+
+
+def test_fila_cheia_e_coalescencia():
+    async def cenario():
+        executor = motor.ExecutorLimitado(trabalhadores=1, fila_maxima=1, retry_after=3)
+        libertar = threading.Event()
+        chamadas = []
+
+        def lenta():
+            chamadas.append(1)
+            libertar.wait(5)
+            return len(chamadas)
+
+        primeira = asyncio.ensure_future(executor.executar(lenta, chave="a"))
+        igual = asyncio.ensure_future(executor.executar(lenta, chave="a"))
+        segunda = asyncio.ensure_future(executor.executar(lenta))
+        await asyncio.sleep(0.05)
+        with pytest.raises(motor.Sobrecarregado) as erro:
+            await executor.executar(lenta)
+        assert erro.value.retry_after == 3
+        # Continuação de um pedido já aceite passa o limite
+        continuacao = asyncio.ensure_future(executor.executar(lenta, admitida=True))
+        libertar.set()
+        resultados = await asyncio.gather(primeira, igual, segunda, continuacao)
+        return executor, resultados
+
+    executor, resultados = asyncio.run(cenario())
+    assert resultados[0] == resultados[1]
+    assert (executor.coalescidas, executor.rejeitadas, executor.executadas, executor.pendentes) == (1, 1, 3, 0)
+
+
+def test_erros_chegam_ao_chamador():
+    def falha():
+        raise KeyError("x")
+
+    async def cenario():
+        executor = motor.ExecutorLimitado(trabalhadores=2, fila_maxima=0)
+        with pytest.raises(KeyError):
+            await executor.executar(falha, chave="f")
+        # A chave falhada não fica presa em voo
+        assert await executor.executar(lambda: 1, chave="f") == 1
+
+    asyncio.run(cenario())
@@ -0,0 +1,25 @@
+"""Exportação estática das respostas GET."""
+
+import motor
+from motor import exportacao
+
+
+def test_exportar_e_limpar_ficheiros_antigos(tmp_path):
+    grande = b"[" + b'"Fiat Punto",' * 400 + b'""]'
+    paginas = [("GET /marcas", b'["Fiat"]'), ("GET /modelos?q=pu", grande), ("GET /modelos?q=pun", grande)]
+    manifest = exportacao.exportar(paginas, tmp_path, "v1")
+
+    assert manifest["dataset_version"] == "v1"
+    assert manifest["rotas"]["GET /modelos?q=pu"] == manifest["rotas"]["GET /modelos?q=pun"]
+    ficheiro = manifest["rotas"]["GET /modelos?q=pu"]
+    assert (tmp_path / ficheiro).read_bytes() == grande
+    assert manifest["ficheiros"][ficheiro]["codificacoes"] == list(motor.codificacoes_disponiveis())
+    assert (tmp_path / (ficheiro + ".gz")).exists()
+    assert exportacao.ler_manifest(tmp_path) == manifest
+
+    # Segunda exportação: ficam os ficheiros das duas últimas, o resto é apagado
+    exportacao.exportar([("GET /marcas", b'["Seat"]'), ("GET /modelos?q=pu", b"[]")], tmp_path, "v2")
+    assert (tmp_path / manifest["rotas"]["GET /marcas"]).exists()
+    exportacao.exportar([("GET /marcas", b'["Opel"]'), ("GET /modelos?q=pu", b"[]")], tmp_path, "v3")
+    assert not (tmp_path / manifest["rotas"]["GET /marcas"]).exists()
+    assert not (tmp_path / ficheiro).exists()
@@ -0,0 +1,35 @@
+"""Contagens de /facetas por bitsets contra groupby/cut do pandas."""
+
+import pytest
+
+import motor
+from benchmarks.facetas import PEDIDOS, facetas_pandas
+from benchmarks.sintetico import gerar_catalogo
+
+
+@pytest.fixture(scope="module")
+def df():
+    return gerar_catalogo(3000, seed=5, fracao_nan=0.02)
+
+
+@pytest.mark.parametrize("pedido", PEDIDOS)
+def test_contagens_iguais_ao_pandas(api, df, pedido):
+    catalogo = motor.Catalogo(df, "facetas")
+    limites = {c: h[0] for c, h in catalogo.indice_facetas.histogramas.items()}
+    esperado = facetas_pandas(df, pedido, limites)
+    obtido = api.calcular_facetas(catalogo, pedido)
+
+    assert obtido["total"] == esperado["total"]
+    assert {f["valor"]: f["total"] for f in obtido["tipos"] if f["total"]} == esperado["tipos"]
+    assert {f["valor"]: f["total"] for f in obtido["combustiveis"] if f["total"]} == esperado["combustiveis"]
+    assert {f["valor"]: f["total"] for f in obtido["extras"]} == esperado["extras"]
+    for coluna, contagens in esperado["histogramas"].items():
+        assert [f["total"] for f in obtido["histogramas"][coluna]] == contagens
+
+
+def test_extras_nao_dependem_dos_pedidos_anteriores(api, df):
+    catalogo = motor.Catalogo(df, "facetas")
+    antes = [f["valor"] for f in api.calcular_facetas(catalogo, api.FacetasRequest())["extras"]]
+    catalogo.filtrar(motor.Filtros(extras=("Camera", "ABS")))
+    depois = [f["valor"] for f in api.calcular_facetas(catalogo, api.FacetasRequest())["extras"]]
+    assert antes == depois
@@ -0,0 +1,49 @@
+"""Bitsets do IndiceFiltros contra máscaras pandas."""
+
+import numpy as np
+import pytest
+
+import motor
+
+
+def mascara_pandas(df, filtros: motor.Filtros) -> np.ndarray:
+    mascara = np.ones(len(df), dtype=bool)
+    if filtros.preco_max is not None:
+        mascara &= (df["Preco"] <= filtros.preco_max).to_numpy()
+    if filtros.tipos:
+        mascara &= df["Tipo"].isin(filtros.tipos).to_numpy()
+    if filtros.combustiveis:
+        mascara &= df["Combustivel"].isin(filtros.combustiveis).to_numpy()
+    if filtros.bagageira_min is not None:
+        mascara &= (df["Bagageira"] >= filtros.bagageira_min).to_numpy()
+    if filtros.consumo_max is not None:
+        mascara &= (df["Consumo"] <= filtros.consumo_max).to_numpy()
+    for extra in filtros.extras:
+        mascara &= (df[extra] == True).to_numpy()  # noqa: E712
+    return mascara
+
+
+@pytest.mark.parametrize("filtros", [
+    motor.Filtros(),
+    motor.Filtros(preco_max=30000),
+    motor.Filtros(preco_max=0),
+    motor.Filtros(tipos=("SUV", "Sedan"), combustiveis=("Diesel",)),
+    motor.Filtros(bagageira_min=500, consumo_max=6.5, extras=("GPS", "AC")),
+    motor.Filtros(preco_max=45000, tipos=("Hatchback",), bagageira_min=300, extras=("Camera",)),
+    motor.Filtros(tipos=("Inexistente",)),
+])
+def test_filtrar_igual_a_mascara_pandas(catalogo, filtros):
+    esperado = np.flatnonzero(mascara_pandas(catalogo.df, filtros))
+    bits = catalogo.filtrar(filtros)
+    assert bits.posicoes().tolist() == esperado.tolist()
+    assert bits.contar() == len(esperado)
+
+
+def test_bitset_operacoes():
+    rng = np.random.default_rng(0)
+    a, b = rng.random(1000) < 0.4, rng.random(1000) < 0.6
+    bits_a, bits_b = motor.Bitset.de_mascara(a), motor.Bitset.de_mascara(b)
+    assert np.array_equal((bits_a & bits_b).mascara(), a & b)
+    assert np.array_equal((bits_a | bits_b).mascara(), a | b)
+    assert motor.Bitset.de_posicoes(np.flatnonzero(a), 1000).posicoes().tolist() == np.flatnonzero(a).tolist()
+    assert motor.Bitset.cheio(1000).contar() == 1000 and motor.Bitset.vazio(1000).contar() == 0
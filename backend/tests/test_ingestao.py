@@ -0,0 +1,49 @@
+"""Ingestão aos blocos validada contra o esquema."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import motor
+from benchmarks.ingestao import PARA_EXTENSO
+from benchmarks.sintetico import gerar_catalogo
+
+
+def test_dados_limpos_iguais_a_leitura_completa(tmp_path):
+    origem = tmp_path / "limpo.csv"
+    gerar_catalogo(3000, seed=7, fracao_nan=0.05).rename(columns=PARA_EXTENSO).to_csv(origem, index=False)
+
+    antiga = motor.Catalogo(motor.para_canonico(pd.read_csv(origem)), "antigo").versao
+    relatorio = motor.ingerir_snapshot(origem, tmp_path / "snapshot", 700)
+    snapshot = motor.carregar_snapshot(tmp_path / "snapshot", motor.ler_manifest(tmp_path / "snapshot"))
+    memoria, _ = motor.ler_validado(origem, 700)
+
+    assert relatorio.linhas_aceites == 3000 and relatorio.valores_corrigidos == 0
+    assert motor.Catalogo(snapshot, "snapshot").versao == antiga
+    assert motor.Catalogo(memoria, "memoria").versao == antiga
+
+
+def test_linhas_e_valores_invalidos(tmp_path):
+    df = gerar_catalogo(100, seed=8).astype({"Consumo": object, "Preco": object, "GPS": object})
+    df.loc[3, "Marca"] = np.nan
+    df.loc[5, "Consumo"] = "n.d."
+    df.loc[7, "Preco"] = -1
+    df.loc[9, "GPS"] = "talvez"
+    origem = tmp_path / "feed.csv"
+    df.to_csv(origem, index=False)
+
+    validado, relatorio = motor.ler_validado(origem, 30)
+    assert relatorio.linhas_lidas == 100 and relatorio.linhas_rejeitadas == 1
+    assert len(validado) == 99
+    assert relatorio.valores_corrigidos == 3
+    # Sem a linha 3, a linha 5 do DataFrame passa a ser a 4.ª do resultado
+    assert np.isnan(validado.loc[4, "Consumo"]) and np.isnan(validado.loc[6, "Preco"])
+    assert not validado.loc[8, "GPS"]
+    assert {p["motivo"] for p in relatorio.exemplos} and len(relatorio.problemas) == 4
+
+
+def test_coluna_obrigatoria_em_falta(tmp_path):
+    origem = tmp_path / "sem_marca.csv"
+    gerar_catalogo(10, seed=1).drop(columns=["Marca"]).to_csv(origem, index=False)
+    with pytest.raises(motor.ErroEsquema):
+        motor.ler_validado(origem)
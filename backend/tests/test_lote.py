@@ -0,0 +1,35 @@
+"""POST /recomendar/batch: cada linha igual ao pedido isolado."""
+
+import numpy as np
+import orjson
+
+import motor
+from benchmarks.lote import esperado_ponderado, pedidos_aleatorios
+from benchmarks.sintetico import gerar_catalogo
+
+
+def test_linhas_iguais_aos_pedidos_isolados(api):
+    catalogo = motor.Catalogo(gerar_catalogo(3000, seed=7, fracao_nan=0.02), "lote")
+    lote = api.RecomendarLoteRequest(pedidos=pedidos_aleatorios(200, np.random.default_rng(0)), k=10)
+    linhas = list(api.linhas_lote(catalogo, lote))
+    assert len(linhas) == len(lote.pedidos)
+
+    for indice, (linha, pedido) in enumerate(zip(linhas, lote.pedidos)):
+        obtido = orjson.loads(linha)
+        assert (obtido["id"], obtido["indice"]) == (pedido.id, indice)
+        if pedido.ponderado:
+            esperado = esperado_ponderado(catalogo, pedido, lote.k)
+            scores = [c["score"] for c in obtido["recomendacoes"]]
+            assert obtido.get("total_encontrados", obtido.get("total")) == esperado["total"]
+            # Empates podem sair por outra ordem; os scores não
+            np.testing.assert_allclose(scores, np.round(esperado["scores"], 2), atol=0.011)
+        else:
+            del obtido["indice"], obtido["id"]
+            assert obtido == orjson.loads(orjson.dumps(api.calcular_recomendacao(catalogo, pedido)))
+
+
+def test_campos_projetados(api):
+    catalogo = motor.Catalogo(gerar_catalogo(500, seed=1), "lote")
+    lote = api.RecomendarLoteRequest(pedidos=[api.PedidoLoteRequest(id="a")], k=3)
+    carro = orjson.loads(next(iter(api.linhas_lote(catalogo, lote, ("id", "Preco")))))["recomendacoes"][0]
+    assert list(carro) == ["id", "Preco"]
@@ -0,0 +1,31 @@
+"""Server-Timing e /metrics."""
+
+import motor
+
+
+def test_server_timing_por_etapa():
+    cronometro = motor.Cronometro()
+    token = motor.ativar_cronometro(cronometro)
+    try:
+        with motor.etapa("filtros"):
+            pass
+        motor.descrever_etapa("cache", "miss")
+    finally:
+        motor.desativar_cronometro(token)
+    cronometro.terminar()
+    cabecalho = cronometro.server_timing()
+    assert "filtros;dur=" in cabecalho and 'cache;desc="miss"' in cabecalho and "total;dur=" in cabecalho
+    # Fora de um pedido as etapas não fazem nada
+    with motor.etapa("filtros"):
+        pass
+
+
+def test_exportar_formato_prometheus():
+    registo = motor.RegistoMetricas()
+    cronometro = motor.Cronometro()
+    cronometro.terminar()
+    registo.observar("GET", "/recomendar", 200, cronometro)
+    registo.observar("GET", "/recomendar", 200, cronometro)
+    texto = registo.exportar({"catalogo_linhas": 5})
+    assert 'endpoint="/recomendar"' in texto and "catalogo_linhas 5" in texto
+    assert any(linha.endswith(" 2") and "_count" in linha for linha in texto.splitlines())
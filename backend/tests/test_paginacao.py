@@ -0,0 +1,22 @@
+"""Cursores opacos de /recomendar."""
+
+import numpy as np
+import pytest
+
+import motor
+
+
+def test_cursor_ida_e_volta():
+    cursor = motor.codificar_cursor("abc123", "consulta", 40)
+    assert motor.ler_cursor(cursor) == ("abc123", "consulta", 40)
+
+
+@pytest.mark.parametrize("cursor", ["", "!!!", "eyJ2IjoxfQ", motor.codificar_cursor("v", "q", 0)[:-3]])
+def test_cursor_invalido(cursor):
+    with pytest.raises(ValueError):
+        motor.ler_cursor(cursor)
+
+
+def test_ordem_completa_estavel():
+    chave = np.array([3.0, 5.0, 3.0, 5.0, 1.0])
+    assert motor.ordem_completa(chave).tolist() == [1, 3, 0, 2, 4]
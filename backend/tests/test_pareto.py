@@ -0,0 +1,49 @@
+"""Frentes de Pareto contra a definição direta."""
+
+import numpy as np
+import pytest
+
+import motor
+from benchmarks.pareto import frentes_forca_bruta
+from benchmarks.sintetico import gerar_catalogo
+from motor.pareto import OBJETIVOS, matriz_objetivos, objetivos_canonicos
+
+
+@pytest.mark.parametrize("caso", range(40))
+def test_frentes_iguais_a_forca_bruta(caso):
+    rng = np.random.default_rng(caso)
+    df = gerar_catalogo(int(rng.integers(1, 300)), seed=caso, fracao_nan=0.1 if caso % 3 == 0 else 0.0)
+    if caso % 2:
+        # Poucos valores distintos: muitos pontos repetidos e empates
+        for coluna in ("Consumo", "Potencia", "Bagageira", "Preco"):
+            df[coluna] = df[coluna] // 50 if coluna != "Consumo" else df[coluna].round(0)
+    catalogo = motor.Catalogo(df, "pareto")
+    objetivos = list(rng.choice(list(OBJETIVOS), size=int(rng.integers(1, len(OBJETIVOS) + 1)), replace=False))
+    filtros = motor.Filtros(preco_max=float(rng.integers(10, 60)) * 1000) if caso % 4 == 0 else motor.Filtros()
+    k = int(rng.integers(1, 5))
+
+    posicoes = catalogo.filtrar(filtros).posicoes()
+    matriz = matriz_objetivos(catalogo.df, objetivos_canonicos(objetivos))[posicoes]
+    esperadas = [{int(posicoes[i]) for i in frente} for frente in frentes_forca_bruta(matriz, k)]
+    if caso % 5 == 0:
+        # Frentes do catálogo guardadas só até 1 e depois continuadas até k
+        catalogo.pareto(motor.Filtros(), objetivos, 1)
+    total, frentes = catalogo.pareto(filtros, objetivos, k)
+    assert total == len(posicoes)
+    assert [set(frente.tolist()) for frente in frentes] == esperadas
+
+
+def test_objetivos_desconhecidos():
+    with pytest.raises(ValueError):
+        motor.objetivos_canonicos(["consumo", "cor"])
+
+
+def test_muitos_objetivos_recusados_em_catalogos_grandes(monkeypatch):
+    catalogo = motor.Catalogo(gerar_catalogo(200, seed=1), "pareto")
+    monkeypatch.setattr("motor.catalogo.MAXIMO_LINHAS_MUITOS_OBJETIVOS", 100)
+    quatro = ["consumo", "potencia", "bagageira", "preco"]
+    with pytest.raises(ValueError):
+        catalogo.pareto(motor.Filtros(), quatro, 1)
+    # Até 3 objetivos, ou com filtros que deixem poucas linhas, continua a responder
+    assert catalogo.pareto(motor.Filtros(), quatro[:3], 1)[0] == 200
+    assert catalogo.pareto(motor.Filtros(preco_max=15000), quatro, 1)[0] <= 100
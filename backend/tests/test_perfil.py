@@ -0,0 +1,31 @@
+"""Perfis de pedidos lentos em formato collapsed."""
+
+import threading
+import time
+from collections import Counter
+
+import motor
+
+
+def test_gravar_mantem_so_os_mais_recentes(tmp_path):
+    for instante in range(5):
+        motor.AmostradorPerfil.gravar(Counter({"a;b": 2, "a;c": 5}), tmp_path / f"{instante:013d}.txt", maximo=3)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"{i:013d}.txt" for i in (2, 3, 4)]
+    assert (tmp_path / f"{4:013d}.txt").read_text(encoding="utf-8") == "a;c 5\na;b 2\n"
+
+
+def test_amostrar_thread_ocupada():
+    amostrador = motor.AmostradorPerfil(intervalo=0.001)
+    amostrador.iniciar()
+    fim = time.perf_counter() + 0.2
+
+    def ocupada():
+        while time.perf_counter() < fim:
+            pass
+
+    thread = threading.Thread(target=ocupada)
+    inicio = time.perf_counter()
+    thread.start()
+    thread.join()
+    pilhas = amostrador.pilhas([thread.ident], inicio, time.perf_counter())
+    assert pilhas and all("ocupada" in pilha for pilha in pilhas)
@@ -0,0 +1,34 @@
+"""Índice de n-gramas de /modelos contra uma pesquisa linha a linha."""
+
+import numpy as np
+import pytest
+
+import motor
+from benchmarks.sintetico import gerar_catalogo
+
+
+def pesquisa_direta(textos, termo, limite):
+    termo = motor.normalizar_texto(termo).strip()
+    linhas = [i for i, texto in enumerate(textos) if termo in motor.normalizar_texto(texto)]
+    return linhas if limite is None else linhas[:limite]
+
+
+@pytest.fixture(scope="module")
+def textos():
+    df = gerar_catalogo(3000, seed=4)
+    textos = (df["Marca"] + " " + df["Modelo"] + " " + df["Ano"].astype(str)).tolist()
+    # Repetidos que só diferem em acentos/maiúsculas e um texto em falta
+    return textos + ["SKODA FABIA 2020", "Škoda Fabia 2020", None]
+
+
+@pytest.mark.parametrize("termo", ["", "s", "go", "sko", "skoda", "Škoda Fa", "serie 1", "c5 air", "2024", "zzz"])
+@pytest.mark.parametrize("limite", [1, 15, None])
+def test_pesquisar_igual_a_pesquisa_direta(textos, termo, limite):
+    indice = motor.IndicePesquisa(textos)
+    textos_validos = ["" if t is None else t for t in textos]
+    esperado = pesquisa_direta(textos_validos, termo, limite)
+    assert indice.pesquisar(termo, limite=limite).tolist() == esperado
+
+
+def test_normalizar_texto():
+    assert motor.normalizar_texto("Série Citroën") == "serie citroen"
@@ -0,0 +1,60 @@
+"""Cache de refinamento: refinar() igual a recomendar()."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import motor
+from benchmarks.refinamento import PERFIS_SESSAO, sessao
+from benchmarks.sintetico import gerar_catalogo
+
+
+def test_sessoes_iguais_a_recomendar():
+    catalogo = motor.Catalogo(gerar_catalogo(5000, seed=4), "refinamento")
+    rng = np.random.default_rng(0)
+    incrementais = 0
+    for _ in range(10):
+        perfil = PERFIS_SESSAO[int(rng.integers(0, len(PERFIS_SESSAO)))]
+        for filtros in sessao(rng):
+            total, carros, incremental = catalogo.refinar(filtros, perfil, k=10)
+            assert (total, carros) == catalogo.recomendar(filtros, perfil, k=10)
+            incrementais += incremental
+    assert incrementais > 0
+
+
+def test_so_refinamentos_sao_incrementais():
+    catalogo = motor.Catalogo(gerar_catalogo(2000, seed=4), "refinamento")
+    assert not catalogo.refinar(motor.Filtros(preco_max=20000.0), None)[2]
+    assert catalogo.refinar(motor.Filtros(preco_max=15000.0), None)[2]
+    assert catalogo.refinar(motor.Filtros(preco_max=15000.0, tipos=("SUV",)), None)[2]
+    # Alargar um critério não parte dos candidatos anteriores
+    assert not catalogo.refinar(motor.Filtros(preco_max=25000.0), None)[2]
+    # Estados com mais de FRACAO_REFINAR do catálogo não servem de ponto de partida
+    catalogo.refinar(motor.Filtros(preco_max=90000.0), None)
+    assert not catalogo.refinar(motor.Filtros(preco_max=80000.0), None)[2]
+    # Sem filtros não se guarda estado
+    assert not catalogo.refinar(motor.Filtros(), None)[2]
+    assert not catalogo.refinar(motor.Filtros(), None)[2]
+
+
+def test_limite_de_estados():
+    catalogo = motor.Catalogo(gerar_catalogo(500, seed=4), "refinamento")
+    cache = motor.refinamento.CacheRefinamento(catalogo.indice_filtros, maximo=3)
+    ranking = catalogo.rankings.de(None)
+    for preco in range(10):
+        cache.candidatos(motor.Filtros(preco_max=20000.0 + preco * 1000), ranking)
+    assert len(cache) == 3
+
+
+def test_threads_no_mesmo_estado():
+    catalogo = motor.Catalogo(gerar_catalogo(5000, seed=5), "refinamento")
+    casos = [
+        (motor.Filtros(preco_max=float(preco)), perfil)
+        for preco in (60000, 50000, 40000, 30000)
+        for perfil in ("economico", "familia", "desportivo", "eletrico", None)
+    ]
+    esperado = [catalogo.recomendar(f, p, k=10) for f, p in casos]
+    with ThreadPoolExecutor(8) as pool:
+        for _ in range(5):
+            obtido = list(pool.map(lambda caso: catalogo.refinar(*caso, k=10)[:2], casos))
+            assert obtido == esperado
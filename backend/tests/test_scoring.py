@@ -0,0 +1,44 @@
+"""Scoring vetorizado e rankings pré-calculados contra o ciclo iterrows() original."""
+
+import json
+
+import numpy as np
+import pytest
+
+import motor
+from legado import PERFIS_TESTE, catalogos, filtros_teste, recomendar_legado, subconjuntos
+
+CATALOGOS = dict(catalogos())
+
+
+@pytest.mark.parametrize("nome", list(CATALOGOS))
+@pytest.mark.parametrize("perfil", PERFIS_TESTE)
+def test_recomendar_top_igual_ao_ciclo_legado(nome, perfil):
+    df = CATALOGOS[nome]
+    colunas = motor.preparar_colunas(df)
+    for filtrado in subconjuntos(df, np.random.default_rng(0)):
+        posicoes = df.index.get_indexer(filtrado.index)
+        esperado = recomendar_legado(filtrado, perfil)
+        assert json.dumps(motor.recomendar_top(df, colunas, posicoes, perfil)) == json.dumps(esperado)
+
+
+@pytest.mark.parametrize("nome", list(CATALOGOS))
+def test_rankings_iguais_ao_scoring_filtrado(nome):
+    catalogo = motor.Catalogo(CATALOGOS[nome], nome)
+    for filtros in filtros_teste(np.random.default_rng(0), catalogo.df.columns):
+        posicoes = catalogo.filtrar(filtros).posicoes()
+        for perfil in PERFIS_TESTE:
+            # Ordem completa do scoring filtrado; recomendar(k) tem de ser o seu início
+            esperado = motor.recomendar_top(catalogo.df, catalogo.colunas_scoring, posicoes, perfil, k=len(posicoes))
+            for k in (1, 10, 100):
+                total, obtido = catalogo.recomendar(filtros, perfil, k=k)
+                assert total == len(posicoes)
+                assert json.dumps(obtido) == json.dumps(esperado[:k])
+
+            # Ordem completa (paginação) e em blocos (streaming)
+            ids = [int(c["id"]) for c in esperado]
+            ordem, _ = catalogo.ordem_recomendacao(filtros, perfil)
+            _, blocos = catalogo.recomendacoes_em_ordem(filtros, perfil)
+            em_blocos = np.concatenate([p for p, _ in blocos] or [np.empty(0, dtype=np.int64)])
+            assert ordem.tolist() == ids
+            assert em_blocos.tolist() == ids
@@ -0,0 +1,37 @@
+"""Catálogo compacto e JSON pré-serializado."""
+
+import numpy as np
+import orjson
+import pandas as pd
+
+import motor
+from benchmarks.sintetico import gerar_catalogo
+
+
+def test_compactar_nao_muda_valores():
+    df = gerar_catalogo(1000, seed=9, fracao_nan=0.1)
+    compacto = motor.compactar(df)
+    assert motor.bytes_dataframe(compacto) < motor.bytes_dataframe(df)
+    pd.testing.assert_frame_equal(compacto.astype(object), df.astype(object), check_dtype=False)
+
+
+def test_carro_igual_ao_registo_do_dataframe(catalogo):
+    df = catalogo.df
+    for pos in (0, 17, len(df) - 1):
+        registo = df.iloc[pos].astype(object).where(df.iloc[pos].notna(), None).to_dict()
+        assert orjson.loads(catalogo.json.carro(pos)) == orjson.loads(orjson.dumps(registo, option=orjson.OPT_SERIALIZE_NUMPY))
+        assert orjson.loads(catalogo.json.carro_com_id(pos, "x"))["id"] == "x"
+
+
+def test_projetados_so_com_os_campos_pedidos(catalogo):
+    posicoes = np.array([3, 1, 2])
+    extras = [{"id": str(p), "score": 1} for p in posicoes]
+    carros = [orjson.loads(c) for c in catalogo.json.projetados(posicoes, ("id", "Marca", "Preco", "Inexistente"), extras)]
+    assert [list(c) for c in carros] == [["id", "Marca", "Preco"]] * 3
+    assert [c["Marca"] for c in carros] == catalogo.df["Marca"].iloc[posicoes].tolist()
+
+
+def test_projetados_so_com_extras(catalogo):
+    extras = [{"id": "a", "score": 2.5}, {"id": "b", "score": 1.0}]
+    carros = catalogo.json.projetados([4, 9], ("id", "score"), extras)
+    assert [orjson.loads(c) for c in carros] == extras
@@ -0,0 +1,24 @@
+"""Vizinhos de /carro/{id}/similares contra a pesquisa exaustiva."""
+
+import numpy as np
+
+import motor
+from benchmarks.sintetico import gerar_catalogo
+
+
+def test_vizinhos_iguais_a_pesquisa_exaustiva():
+    catalogo = motor.Catalogo(gerar_catalogo(2000, seed=11, fracao_nan=0.02), "similares")
+    indice = catalogo.indice_similares
+    matriz = indice.matriz.astype(np.float64)
+    k = 10
+    for pos in np.random.default_rng(0).integers(0, len(catalogo), 50):
+        exatas = np.sqrt(((matriz - matriz[pos]) ** 2).sum(axis=1))
+        exatas[pos] = np.inf
+        limite = np.sort(exatas)[k - 1]
+        vizinhos, distancias = indice.vizinhos(int(pos), k)
+        assert pos not in vizinhos and len(vizinhos) == k
+        assert (exatas[vizinhos] <= limite + 1e-4).all()
+        assert (np.diff(distancias) >= 0).all()
+
+    lote, _ = indice.vizinhos_lote([3, 4], k)
+    assert lote[0].tolist() == indice.vizinhos(3, k)[0].tolist()
@@ -0,0 +1,39 @@
+"""Snapshot binário: ida e volta, e snapshots de outra versão ignorados."""
+
+import json
+
+import motor
+from benchmarks.sintetico import gerar_catalogo
+
+
+def test_snapshot_da_o_mesmo_catalogo(tmp_path):
+    origem = tmp_path / "carros.csv"
+    gerar_catalogo(500, seed=3, fracao_nan=0.05).to_csv(origem, index=False)
+    df = motor.ler_ficheiro_dados(origem)
+    motor.guardar_snapshot(df, tmp_path / "snapshot", origem)
+
+    manifest = motor.ler_manifest(tmp_path / "snapshot")
+    assert motor.origem_atualizada(manifest, [origem]) == origem
+    carregado = motor.carregar_snapshot(tmp_path / "snapshot", manifest)
+    assert motor.Catalogo(carregado, "snapshot").versao == motor.Catalogo(df, "origem").versao
+
+
+def test_snapshot_de_outra_versao_e_ignorado(tmp_path):
+    origem = tmp_path / "carros.csv"
+    gerar_catalogo(50, seed=3).to_csv(origem, index=False)
+    motor.guardar_snapshot(motor.ler_ficheiro_dados(origem), tmp_path / "snapshot", origem)
+
+    caminho = tmp_path / "snapshot" / motor.MANIFEST
+    manifest = json.loads(caminho.read_text(encoding="utf-8"))
+    manifest["versao_ingestao"] -= 1
+    caminho.write_text(json.dumps(manifest), encoding="utf-8")
+    assert motor.ler_manifest(tmp_path / "snapshot") is None
+
+
+def test_snapshot_desatualizado_pela_origem(tmp_path):
+    origem = tmp_path / "carros.csv"
+    gerar_catalogo(50, seed=3).to_csv(origem, index=False)
+    motor.guardar_snapshot(motor.ler_ficheiro_dados(origem), tmp_path / "snapshot", origem)
+    with open(origem, "a", encoding="utf-8") as f:
+        f.write(open(origem, encoding="utf-8").read().splitlines()[1] + "\n")
+    assert motor.origem_atualizada(motor.ler_manifest(tmp_path / "snapshot"), [origem]) is None
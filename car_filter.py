@@ -1,8 +1,11 @@
 import pandas as pd
 import numpy as np
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 
+from backend.motor import Catalogo, Filtros, compactar, ler_validado, para_canonico, pesos_perfil, preparar_colunas_minmax, scores_ponderados
+
 # Modelos Pydantic para validação
 class FiltrosRequest(BaseModel):
     preco_max: Optional[float] = None
@@ -22,28 +25,27 @@ class CompararRequest(BaseModel):
 class CarroFilterAPI:
     def __init__(self, csv_path: str = "carros.csv"):
         """Inicializa o sistema de recomendação."""
-        self.df = pd.read_csv(csv_path)
+        # CSV lido aos blocos e validado contra o esquema do motor (números
+        # inválidos ficam NaN), mantendo os cabeçalhos por extenso
+        self.df, self.relatorio_ingestao = ler_validado(Path(csv_path), nomes_originais=True)
         self._prepare_data()
         
     def _prepare_data(self):
         """Prepara os dados."""
-        # Converter tipos
-        numeric_cols = ['Ano', 'Potência (cv)', 'Consumo (l/100km)', 
-                       '0-100 km/h (s)', 'Velocidade Max (km/h)', 
-                       'Bagageira (l)', 'Preço Indicativo (€)']
-        
-        for col in numeric_cols:
-            if col in self.df.columns:
-                self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
-        
         # Criar coluna ID única
         self.df['id'] = self.df['Marca'] + ' ' + self.df['Modelo'] + ' ' + self.df['Ano'].astype(str)
+        
+        # Textos como categorias e inteiros pequenos (mesmos valores, menos memória)
+        self.df = compactar(self.df)
+        
+        # Motor partilhado com backend/api.py (colunas mapeadas para o esquema do motor,
+        # pela mesma ordem de self.df, pelo que as posições coincidem)
+        self.catalogo = Catalogo(self.df, origem="car_filter")
     
     def buscar_modelos(self, busca: str = "") -> List[Dict]:
         """Busca modelos para autocomplete."""
         if busca:
-            mask = self.df['id'].str.contains(busca, case=False, na=False)
-            resultados = self.df[mask]
+            resultados = self.df.iloc[self.catalogo.indice_pesquisa.pesquisar(busca, limite=None)]
         else:
             resultados = self.df.head(20)
         
@@ -61,41 +63,19 @@ class CarroFilterAPI:
     
     def recomendar_carros(self, filtros: FiltrosRequest) -> Dict[str, Any]:
         """Recomenda carros baseado nos filtros."""
-        df_filtrado = self.df.copy()
-        
-        # Aplicar filtros
-        if filtros.preco_max:
-            df_filtrado = df_filtrado[df_filtrado['Preço Indicativo (€)'] <= filtros.preco_max]
-        
-        if filtros.tipos:
-            mask = df_filtrado['Tipo'].isin(filtros.tipos)
-            df_filtrado = df_filtrado[mask]
-        
-        if filtros.combustiveis:
-            mask = df_filtrado['Combustível'].isin(filtros.combustiveis)
-            df_filtrado = df_filtrado[mask]
-        
-        if filtros.bagageira_min:
-            df_filtrado = df_filtrado[df_filtrado['Bagageira (l)'] >= filtros.bagageira_min]
-        
-        if filtros.consumo_max:
-            df_filtrado = df_filtrado[df_filtrado['Consumo (l/100km)'] <= filtros.consumo_max]
-        
-        if filtros.extras_obrigatorios:
-            for extra in filtros.extras_obrigatorios:
-                if extra in df_filtrado.columns:
-                    df_filtrado = df_filtrado[df_filtrado[extra] == True]
-        
-        # Calcular scores
-        if len(df_filtrado) > 0:
-            df_com_scores = self._calcular_scores(df_filtrado, filtros)
-            
-            # Ordenar por score
-            df_com_scores = df_com_scores.sort_values('score_total', ascending=False)
+        posicoes, scores, total = self.catalogo.ranking_ponderado(
+            self._filtros_motor(filtros), self._pesos(filtros), k=20
+        )
+        
+        # Scores calculados sobre os carros filtrados; só os 20 melhores viram dicts
+        if total > 0:
+            df_com_scores = self.df.iloc[posicoes].copy()
+            for nome, valores in scores.items():
+                df_com_scores[nome] = valores
             
             return {
-                "total": len(df_com_scores),
-                "resultados": df_com_scores.head(20).to_dict('records'),
+                "total": total,
+                "resultados": df_com_scores.to_dict('records'),
                 "filtros_aplicados": filtros.dict()
             }
         else:
@@ -105,69 +85,34 @@ class CarroFilterAPI:
                 "filtros_aplicados": filtros.dict()
             }
     
+    @staticmethod
+    def _filtros_motor(filtros: FiltrosRequest) -> Filtros:
+        """Converte o pedido nos filtros do motor."""
+        return Filtros(
+            preco_max=filtros.preco_max or None,
+            tipos=filtros.tipos or (),
+            combustiveis=filtros.combustiveis or (),
+            bagageira_min=filtros.bagageira_min or None,
+            consumo_max=filtros.consumo_max or None,
+            extras=filtros.extras_obrigatorios or (),
+        )
+    
+    @staticmethod
+    def _pesos(filtros: FiltrosRequest):
+        """Pesos (consumo, desempenho, espaço) do perfil pedido."""
+        return pesos_perfil(
+            filtros.perfil,
+            filtros.prioridade_consumo,
+            filtros.prioridade_desempenho,
+            filtros.prioridade_espaco,
+        )
+    
     def _calcular_scores(self, df: pd.DataFrame, filtros: FiltrosRequest) -> pd.DataFrame:
         """Calcula scores personalizados."""
         df_scored = df.copy()
         
-        # Normalizar atributos
-        def normalizar(coluna, invertido=False):
-            if coluna not in df_scored.columns:
-                return pd.Series([0] * len(df_scored), index=df_scored.index)
-            
-            valores = df_scored[coluna].fillna(df_scored[coluna].median())
-            min_val = valores.min()
-            max_val = valores.max()
-            
-            if max_val == min_val:
-                return pd.Series([0.5] * len(df_scored), index=df_scored.index)
-            
-            if invertido:
-                return (max_val - valores) / (max_val - min_val)
-            else:
-                return (valores - min_val) / (max_val - min_val)
-        
-        # Aplicar pesos baseados no perfil e prioridades
-        if filtros.perfil == "personalizado":
-            peso_consumo = filtros.prioridade_consumo
-            peso_desempenho = filtros.prioridade_desempenho
-            peso_espaco = filtros.prioridade_espaco
-        else:
-            # Pesos pré-definidos por perfil
-            perfis = {
-                "economico": {"consumo": 0.6, "desempenho": 0.2, "espaco": 0.2},
-                "desportivo": {"consumo": 0.2, "desempenho": 0.6, "espaco": 0.2},
-                "familia": {"consumo": 0.3, "desempenho": 0.2, "espaco": 0.5},
-                "cidade": {"consumo": 0.5, "desempenho": 0.2, "espaco": 0.3},
-                "estrada": {"consumo": 0.4, "desempenho": 0.4, "espaco": 0.2},
-                "equilibrado": {"consumo": 0.33, "desempenho": 0.33, "espaco": 0.34}
-            }
-            pesos = perfis.get(filtros.perfil, perfis["equilibrado"])
-            peso_consumo = pesos["consumo"]
-            peso_desempenho = pesos["desempenho"]
-            peso_espaco = pesos["espaco"]
-        
-        # Calcular componentes
-        score_consumo = normalizar('Consumo (l/100km)', invertido=True) * peso_consumo
-        
-        # Desempenho: média de potência e aceleração
-        score_potencia = normalizar('Potência (cv)', invertido=False) * (peso_desempenho * 0.6)
-        score_aceleracao = normalizar('0-100 km/h (s)', invertido=True) * (peso_desempenho * 0.4)
-        score_desempenho = score_potencia + score_aceleracao
-        
-        # Espaço: bagageira
-        score_espaco = normalizar('Bagageira (l)', invertido=False) * peso_espaco
-        
-        # Score total
-        df_scored['score_consumo'] = score_consumo
-        df_scored['score_desempenho'] = score_desempenho
-        df_scored['score_espaco'] = score_espaco
-        df_scored['score_total'] = score_consumo + score_desempenho + score_espaco
-        
-        # Normalizar score total para 0-100
-        if df_scored['score_total'].max() > df_scored['score_total'].min():
-            df_scored['score_total'] = (
-                (df_scored['score_total'] - df_scored['score_total'].min()) / 
-                (df_scored['score_total'].max() - df_scored['score_total'].min()) * 100
-            )
+        scores = scores_ponderados(preparar_colunas_minmax(para_canonico(df)), self._pesos(filtros))
+        for nome, valores in scores.items():
+            df_scored[nome] = valores
         
-        return df_scored
\ No newline at end of file
+        return df_scored